@@ -0,0 +1,161 @@
+"""
+Benchmarks the bronze pandas and Arrow engines against synthetic WordPress API JSON, without touching AWS.
+Each engine runs in its own process so peak memory is measured separately.
+
+Usage: python benchmark_bronze_engines.py --posts 5000 --statistics-rows 1000000 --repeat 3
+"""
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+from datetime import datetime, timedelta
+
+# The bronze module creates boto3 clients on import, which need a region but make no calls
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-west-1')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+#################
+### FUNCTIONS ###
+#################
+
+
+def generate_records(object_name: str, rows: int, seed: int = 42) -> list:
+    """
+    Generates synthetic rows shaped like the WordPress API output, with every value as a string like wpdb returns.
+    RETURNS: List of dicts
+    """
+    rng = random.Random(seed)
+    start = datetime(2022, 1, 1)
+
+    if object_name == 'statistics_pages':
+        return [
+            {
+                'page_id': str(index + 1),
+                'uri': f'/post-{index % 500}/',
+                'type': rng.choice(['post', 'page', 'home']),
+                'date': (start + timedelta(days = index // 500)).strftime('%Y-%m-%d'),
+                'count': str(rng.randint(1, 200)),
+                'id': str(index % 500 + 1)
+            }
+            for index in range(rows)
+            ]
+
+    return [
+        {
+            'ID': str(index + 1), 'post_author': '1',
+            'post_date': (start + timedelta(hours = index)).strftime('%Y-%m-%d %H:%M:%S'),
+            'post_date_gmt': (start + timedelta(hours = index)).strftime('%Y-%m-%d %H:%M:%S'),
+            'post_content': 'Lorem ipsum dolor sit amet. ' * rng.randint(20, 200),
+            'post_title': f'Post {index}', 'post_excerpt': '', 'post_status': 'publish',
+            'comment_status': 'open', 'ping_status': 'open', 'post_password': '', 'post_name': f'post-{index}',
+            'to_ping': '', 'pinged': '',
+            'post_modified': (start + timedelta(hours = index + 1)).strftime('%Y-%m-%d %H:%M:%S'),
+            'post_modified_gmt': (start + timedelta(hours = index + 1)).strftime('%Y-%m-%d %H:%M:%S'),
+            'post_content_filtered': '', 'post_parent': '0', 'guid': f'https://example.com/?p={index}',
+            'menu_order': '0', 'post_type': rng.choice(['post', 'page', 'revision']), 'post_mime_type': '',
+            'comment_count': str(rng.randint(0, 5))
+        }
+        for index in range(rows)
+        ]
+
+
+def convert_pandas(body: bytes, object_name: str) -> bytes:
+    """
+    Converts JSON to Parquet the way the pandas engine does, minus the S3 calls.
+    RETURNS: Parquet file bytes
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    import lambda_function_bronze as bronze
+
+    df = pd.read_json(io.BytesIO(body))
+    return bronze.write_parquet_bytes(pa.Table.from_pandas(df, preserve_index = False))
+
+
+def convert_arrow(body: bytes, object_name: str) -> bytes:
+    """
+    Converts JSON to Parquet the way the Arrow engine does, minus the S3 calls.
+    RETURNS: Parquet file bytes
+    """
+    import lambda_function_bronze as bronze
+
+    return bronze.write_parquet_bytes(bronze.build_arrow_table(json.loads(body), object_name))
+
+
+def run_engine(engine: str, object_name: str, rows: int) -> dict:
+    """
+    Runs one engine once in the current process.
+    RETURNS: dict of wall seconds, CPU seconds, peak RSS growth in MiB and the Parquet output
+    """
+    body = json.dumps(generate_records(object_name, rows)).encode()
+
+    # Import libraries before timing, as a warm Lambda would have them loaded
+    import pandas, pyarrow.parquet  # noqa: F401, E401
+    import lambda_function_bronze  # noqa: F401
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+    parquet = (convert_arrow if engine == 'arrow' else convert_pandas)(body, object_name)
+
+    return {
+        'wall': time.perf_counter() - wall_start,
+        'cpu': time.process_time() - cpu_start,
+        'rss_mib': max(0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024,
+        'input_mib': len(body) / (1024 * 1024),
+        'parquet': parquet
+    }
+
+
+def outputs_match(parquet_pandas: bytes, parquet_arrow: bytes) -> bool:
+    """
+    Checks both engines wrote the same columns, types and values.  Schema metadata such as pandas' is ignored.
+    RETURNS: True or False
+    """
+    import pyarrow.parquet as pq
+
+    table_pandas = pq.read_table(io.BytesIO(parquet_pandas)).replace_schema_metadata()
+    table_arrow = pq.read_table(io.BytesIO(parquet_arrow)).replace_schema_metadata()
+    return table_pandas.equals(table_arrow)
+
+
+#############
+### START ###
+#############
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    parser.add_argument('--posts', type = int, default = 5000)
+    parser.add_argument('--statistics-rows', type = int, default = 1000000)
+    parser.add_argument('--repeat', type = int, default = 3)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+
+    for object_name, rows in (('posts', args.posts), ('statistics_pages', args.statistics_rows)):
+        results = {}
+
+        for engine in ('pandas', 'arrow'):
+            runs = []
+
+            # A fresh process per run keeps peak RSS readings independent
+            for _ in range(args.repeat):
+                with context.Pool(1) as pool:
+                    runs.append(pool.apply(run_engine, (engine, object_name, rows)))
+
+            results[engine] = min(runs, key = lambda run: run['wall'])
+            best = results[engine]
+            print(f"{object_name:<17} {engine:<7} rows {rows:>9} | input {best['input_mib']:8.1f} MiB | "
+                  f"wall {best['wall']:7.2f} s | cpu {best['cpu']:7.2f} s | peak RSS +{best['rss_mib']:7.1f} MiB")
+
+        speedup = results['pandas']['wall'] / results['arrow']['wall']
+        match = outputs_match(results['pandas']['parquet'], results['arrow']['parquet'])
+        print(f"{object_name:<17} arrow speedup {speedup:.2f}x | outputs match: {match}")
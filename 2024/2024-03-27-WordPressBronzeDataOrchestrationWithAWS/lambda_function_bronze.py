@@ -1,19 +1,178 @@
 """
 Function gets raw JSON objects from Raw S3 bucket and stores as bronze Parquet objects in Bronze S3 bucket.
 """
+from __future__ import annotations
+import time
+INIT_STARTED: float = time.perf_counter()
+
+import importlib
+import hashlib
 import logging
+import os
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+from urllib.parse import unquote_plus
 import boto3
 import botocore
-import awswrangler as wr
-import pandas as pd
 from botocore.client import BaseClient
 
+# Type hints only.  pandas and pyarrow themselves are imported lazily through import_heavy_module.
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# Cold start timings in milliseconds, reported once per container
+INIT_TIMINGS: dict = {'imports': (time.perf_counter() - INIT_STARTED) * 1000}
+
+# Heavy modules are imported one at a time, so no thread is handed a module another thread is still importing
+IMPORT_LOCK = threading.Lock()
+
+# Parameter Store values cached across warm invocations, keyed by name as (value, expiry) tuples
+PARAMETER_CACHE: dict = {}
+PARAMETER_CACHE_TTL: int = int(os.environ.get('PARAMETER_CACHE_TTL', 300))
+
+# Rough peak memory of a conversion as a multiple of its raw JSON size, covering the DataFrame and Parquet buffers
+BRONZE_MEMORY_FACTOR: int = 6
+
+# Heavy modules each conversion engine uses, imported on the handler thread before any workers start
+BRONZE_ENGINE_MODULES: dict = {
+    'pandas': ['pandas', 'awswrangler'],
+    'arrow': ['pyarrow', 'pyarrow.parquet']
+    }
+
+# Declared bronze column types for the Arrow engine, in source column order.
+# These match what pandas infers from the raw JSON, so both engines write the same Parquet schema.
+BRONZE_SCHEMAS: dict = {
+    'posts': [
+        ('ID', 'int64'), ('post_author', 'int64'), ('post_date', 'string'), ('post_date_gmt', 'string'),
+        ('post_content', 'string'), ('post_title', 'string'), ('post_excerpt', 'string'), ('post_status', 'string'),
+        ('comment_status', 'string'), ('ping_status', 'string'), ('post_password', 'string'), ('post_name', 'string'),
+        ('to_ping', 'string'), ('pinged', 'string'), ('post_modified', 'string'), ('post_modified_gmt', 'string'),
+        ('post_content_filtered', 'string'), ('post_parent', 'int64'), ('guid', 'string'), ('menu_order', 'int64'),
+        ('post_type', 'string'), ('post_mime_type', 'string'), ('comment_count', 'int64')
+        ],
+    'statistics_pages': [
+        ('page_id', 'int64'), ('uri', 'string'), ('type', 'string'), ('date', 'timestamp[ns]'),
+        ('count', 'int64'), ('id', 'int64')
+        ],
+    'term_relationship': [
+        ('object_id', 'int64'), ('term_taxonomy_id', 'int64'), ('term_order', 'int64')
+        ],
+    'term_taxonomy': [
+        ('term_taxonomy_id', 'int64'), ('term_id', 'int64'), ('taxonomy', 'string'), ('description', 'string'),
+        ('parent', 'int64'), ('count', 'int64')
+        ],
+    'terms': [
+        ('term_id', 'int64'), ('name', 'string'), ('slug', 'string'), ('term_group', 'int64')
+        ]
+    }
+
+# CloudWatch embedded metric format (EMF) metrics, recorded with the shared lakehouse_metrics module.  It is deployed
+# alongside this file, and local runs import it from its folder in this repo.
+METRICS_FOLDER: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'InProgress', 'WordPressLakehouseMetrics')
+
+if os.path.isdir(METRICS_FOLDER):
+    sys.path.append(METRICS_FOLDER)
+
+from lakehouse_metrics import MetricsRecorder
+
+# Per-thread boto3 sessions for awswrangler calls made by worker threads
+THREAD_LOCAL = threading.local()
+
+
+###############
+### CLASSES ###
+###############
+
+
+class MemoryBudget:
+    """
+    Bounds how much memory concurrent conversions may use at once.
+    Each conversion reserves an estimate before it reads any data and releases it when done.
+    An estimate larger than the whole budget still runs, but only once nothing else is running.
+    """
+    def __init__(self, limit_bytes: int) -> None:
+        self.limit_bytes: int = limit_bytes
+        self.reserved_bytes: int = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def reserve(self, size_bytes: int):
+        """
+        Blocks until size_bytes fits in the budget, then holds it until the with block ends.
+        """
+        with self._condition:
+            while self.reserved_bytes and self.reserved_bytes + size_bytes > self.limit_bytes:
+                self._condition.wait()
+            self.reserved_bytes += size_bytes
+
+        try:
+            yield
+
+        finally:
+            with self._condition:
+                self.reserved_bytes -= size_bytes
+                self._condition.notify_all()
+
+
+# Metrics for the current run, recorded by any function and flushed by the handler
+METRICS: MetricsRecorder = MetricsRecorder()
+
 
 #################
 ### FUNCTIONS ###
 #################
 
 
+def log_init_report() -> None:
+    """
+    Logs how long module imports and client creation took, once per container.
+    Later invocations are logged as warm starts.
+    """
+    global COLD_START
+
+    if not COLD_START:
+        logging.info("Warm start.")
+        return
+
+    COLD_START = False
+    report = " | ".join(f"{name} {milliseconds:.0f} ms" for name, milliseconds in INIT_TIMINGS.items())
+    logging.info(f"Cold start init report: {report}")
+
+
+def import_heavy_module(name: str):
+    """
+    Imports a heavy module on first use, so invocations that exit early never pay for it.
+    The first import's duration is logged and added to the init report.
+    Safe to call from worker threads, as imports are made under IMPORT_LOCK.
+    RETURNS: Imported module
+    """
+    with IMPORT_LOCK:
+        if name in sys.modules:
+            return importlib.import_module(name)
+
+        import_started = time.perf_counter()
+        module = importlib.import_module(name)
+        INIT_TIMINGS[f'import {name}'] = (time.perf_counter() - import_started) * 1000
+
+    logging.info(f"Imported {name} in {INIT_TIMINGS[f'import {name}']:.0f} ms.")
+    return module
+
+
+def import_engine_modules(engine: str) -> None:
+    """
+    Imports a conversion engine's heavy modules up front, so parallel workers start with them fully loaded.
+    Engines other than 'arrow' use the pandas modules, as convert_object does.
+    """
+    for name in BRONZE_ENGINE_MODULES['arrow' if engine == 'arrow' else 'pandas']:
+        import_heavy_module(name)
+
+
 def send_sns_message(sns_client: BaseClient, topic_arn: str, subject:str, message: str) -> None:
     """
     Sends messages via AWS SNS.
@@ -31,29 +190,50 @@ def send_sns_message(sns_client: BaseClient, topic_arn: str, subject:str, messag
         logging.error(f"SNS message [{subject}] not sent: {ec}")
 
 
-def get_parameter_from_ssm(ssm_client: BaseClient, parameter_name: str) -> str:
+def get_parameters_from_ssm(ssm_client: BaseClient, parameter_names: list, cache_ttl: int = PARAMETER_CACHE_TTL) -> dict:
     """
-    Gets parameter from AWS Parameter Store.
-    RETURNS: Parameter, Value, or a blank string to allow graceful fail.
+    Gets parameters from AWS Parameter Store in batches of up to 10 per call.
+    Values are cached at module scope, so warm invocations within cache_ttl seconds make no calls.
+    RETURNS: dict of Parameter Names and Values, with a blank string for any parameter not found to allow graceful fail.
     """
-    try:
-        logging.info(f"Attempting to get parameter {parameter_name}...")
-        response = ssm_client.get_parameter(Name = parameter_name)
+    now = time.monotonic()
+    parameters = {
+        name: PARAMETER_CACHE[name][0]
+        for name in parameter_names
+        if name in PARAMETER_CACHE and PARAMETER_CACHE[name][1] > now
+        }
+    parameter_names_uncached = [name for name in parameter_names if name not in parameters]
 
-        logging.info("Parameter found.")
-        return response['Parameter']['Value']
+    if parameters:
+        logging.info(f"{len(parameters)} parameters found in cache.")
 
-    except ssm_client.exceptions.ParameterNotFound as pnf:
-        logging.warning(f"Parameter {parameter_name} not found: {pnf}")
-        return ""
+    for index in range(0, len(parameter_names_uncached), 10):
+        batch = parameter_names_uncached[index:index + 10]
 
-    except botocore.exceptions.ParamValidationError as epv:
-        logging.error(f"Error getting parameter {parameter_name}: {epv}")
-        return ""
+        try:
+            logging.info(f"Attempting to get parameters {batch}...")
+            response = ssm_client.get_parameters(Names = batch)
 
-    except botocore.exceptions.ClientError as ec:
-        logging.error(f"Error getting parameter {parameter_name}: {ec}")
-        return ""
+            for parameter in response['Parameters']:
+                parameters[parameter['Name']] = parameter['Value']
+                PARAMETER_CACHE[parameter['Name']] = (parameter['Value'], now + cache_ttl)
+
+            logging.info(f"{len(response['Parameters'])} parameters found.")
+
+            # Missing parameters are not cached, so they are picked up as soon as they are created
+            for name in response['InvalidParameters']:
+                logging.warning(f"Parameter {name} not found.")
+                parameters[name] = ""
+
+        except botocore.exceptions.ParamValidationError as epv:
+            logging.error(f"Error getting parameters {batch}: {epv}")
+            parameters.update({name: "" for name in batch})
+
+        except botocore.exceptions.ClientError as ec:
+            logging.error(f"Error getting parameters {batch}: {ec}")
+            parameters.update({name: "" for name in batch})
+
+    return parameters
 
 
 def get_objectname_from_s3_path(path: str) -> str:
@@ -65,11 +245,11 @@ def get_objectname_from_s3_path(path: str) -> str:
         # Get name from endpoint
         name_full = path.rsplit('/')[-1]
 
-        # Get final period instance
-        name_full_last_period_index = name_full.rfind('.')
+        # Get first period instance, so paginated part suffixes like .part-00001 are dropped too
+        name_full_first_period_index = name_full.find('.')
 
-        # Extract string before final underscore
-        name_partial = name_full[:name_full_last_period_index]
+        # Extract string before first period
+        name_partial = name_full[:name_full_first_period_index]
         return name_partial
 
     except Exception as e:
@@ -77,19 +257,149 @@ def get_objectname_from_s3_path(path: str) -> str:
         return ""
 
 
-def get_data_from_s3_object(boto3_session: BaseClient, s3_object: str, name: str) -> pd.DataFrame:
+def group_s3_paths_by_object_name(paths: list) -> dict:
+    """
+    Groups S3 paths by object name, so the part objects of a paginated endpoint are processed together.
+    RETURNS: dict of object names and sorted lists of their S3 paths
+    """
+    groups = {}
+
+    for path in sorted(paths):
+        groups.setdefault(get_objectname_from_s3_path(path), []).append(path)
+
+    return groups
+
+
+def list_s3_objects(s3_client: BaseClient, bucket: str, prefix: str, suffix: str) -> dict:
+    """
+    Lists S3 objects under a prefix with boto3, so listing never needs awswrangler.
+    RETURNS: dict of s3:// paths ending with the suffix, each with the object's size in bytes and ETag
+    """
+    paginator = s3_client.get_paginator('list_objects_v2')
+
+    return {
+        f"s3://{bucket}/{item['Key']}": {'size': item['Size'], 'etag': item['ETag'].strip('"')}
+        for page in paginator.paginate(Bucket = bucket, Prefix = prefix)
+        for item in page.get('Contents', [])
+        if item['Key'].endswith(suffix)
+        }
+
+
+def get_s3_keys_from_event(event: dict) -> list | None:
+    """
+    Gets the objects named in an S3 event notification, or in an EventBridge S3 'Object Created' event.
+    RETURNS: List of (bucket, key) tuples, or None if the event is not an S3 event so a full sweep should run
+    """
+    # S3 event notifications, with URL-encoded keys
+    if 'Records' in event:
+        return [
+            (record['s3']['bucket']['name'], unquote_plus(record['s3']['object']['key']))
+            for record in event['Records']
+            if 's3' in record
+            ]
+
+    # EventBridge events, with plain keys
+    if event.get('source') == 'aws.s3' and 'detail' in event:
+        return [(event['detail']['bucket']['name'], event['detail']['object']['key'])]
+
+    return None
+
+
+def get_object_names_from_s3_keys(s3_keys: list, bucket: str, data_source: str) -> list:
+    """
+    Gets the object names to convert from event S3 keys.
+    Raw data keys and raw manifest keys are both accepted.  Raw writes an endpoint's manifest after all of its
+    part objects, so triggering on manifests converts a paginated endpoint once its parts are complete.
+    RETURNS: Sorted list of unique object names, ignoring keys from other buckets or prefixes
+    """
+    object_names = set()
+
+    for key_bucket, key in s3_keys:
+        is_data_key = key.startswith(f'{data_source}/') and key.endswith('.json')
+        is_manifest_key = key.startswith(f'_manifest/{data_source}/') and key.endswith('.json')
+
+        if key_bucket != bucket or not (is_data_key or is_manifest_key):
+            logging.warning(f"Ignoring s3://{key_bucket}/{key}, which is not a {data_source} raw object.")
+            continue
+
+        object_names.add(get_objectname_from_s3_path(key))
+
+    return sorted(name for name in object_names if name)
+
+
+def get_source_version(s3_objects: dict, paths: list) -> str:
     """
-    Get data from S3 object
+    Creates a version string for a set of raw objects from their S3 ETags.
+    Any rewritten, added or removed part object gives a different version.
+    RETURNS: ETag of a single object, or a SHA-256 hex digest of every path and ETag for several
+    """
+    if len(paths) == 1:
+        return s3_objects[paths[0]]['etag']
+
+    return hashlib.sha256("|".join(f"{path}:{s3_objects[path]['etag']}" for path in sorted(paths)).encode()).hexdigest()
+
+
+def get_bronze_manifest(s3_client: BaseClient, bucket: str, data_source: str, name: str) -> dict:
+    """
+    Gets the manifest recording which raw source version a bronze object was built from.
+    RETURNS: Manifest dict, or an empty dict if there is no manifest or it cannot be read
+    """
+    key = f"_manifest/{data_source}/{name}.json"
+
+    try:
+        response = s3_client.get_object(Bucket = bucket, Key = key)
+        return json.loads(response['Body'].read())
+
+    except s3_client.exceptions.NoSuchKey:
+        logging.info(f"No {name} bronze manifest found.")
+        return {}
+
+    except (botocore.exceptions.ClientError, ValueError) as e:
+        logging.warning(f"{name} bronze manifest could not be read: {e}")
+        return {}
+
+
+def put_bronze_manifest(s3_client: BaseClient, bucket: str, data_source: str, name: str, manifest: dict) -> bool:
+    """
+    Uploads the manifest recording which raw source version a bronze object was built from.
+    Manifests sit outside the data prefix so they are never picked up as data objects.
+    RETURNS: True or False depending on outcome
+    """
+    key = f"_manifest/{data_source}/{name}.json"
+
+    try:
+        s3_client.put_object(
+            Body = json.dumps(manifest),
+            Bucket = bucket,
+            Key = key
+        )
+        logging.info(f"{name} bronze manifest updated.")
+        return True
+
+    except botocore.exceptions.ClientError as e:
+        logging.warning(f"{name} bronze manifest update failed: {e}")
+        return False
+
+
+def get_data_from_s3_object(boto3_session: BaseClient, s3_objects: list, name: str) -> pd.DataFrame:
+    """
+    Get data from one or more S3 objects, concatenating paginated part objects into one DataFrame
     RETURNS Dataframe (populated or empty)
     """
+    wr = import_heavy_module('awswrangler')
+    pd = import_heavy_module('pandas')
+
     try:
-        logging.info(f"Attempting to read {name} data at {s3_object}...")
-        df = wr.s3.read_json(path = s3_object,
-                            boto3_session = boto3_session)
+        logging.info(f"Attempting to read {name} data at {s3_objects}...")
+
+        with METRICS.timer('read', name):
+            df = wr.s3.read_json(path = s3_objects,
+                                boto3_session = boto3_session)
+
         return df
 
     except wr.exceptions.NoFilesFound as e:
-        logging.warning(f"No files found for {name} at {s3_object}: {e}")
+        logging.warning(f"No files found for {name} at {s3_objects}: {e}")
         return pd.DataFrame()
 
     except botocore.exceptions.ClientError as e:
@@ -103,9 +413,112 @@ def put_s3_parquet_object(df: pd.DataFrame, name: str, s3_object_bronze: str, se
     Uploads pandas DataFrame to S3 as Parquet.
     RETURNS True or False depending on outcome
     """
+    wr = import_heavy_module('awswrangler')
+
     try:
         logging.info(f"Attempting to put {name} data in {s3_object_bronze}...")
-        wr.s3.to_parquet(df = df, path = s3_object_bronze, boto3_session = session)
+
+        with METRICS.timer('write', name):
+            wr.s3.to_parquet(df = df, path = s3_object_bronze, boto3_session = session)
+
+        logging.info(f"{name} data S3 upload successful.")
+        return True
+
+    except botocore.exceptions.ClientError as e:
+        logging.error(f"{name} data S3 upload failed: {e}")
+        return False
+
+
+def get_bronze_schema(object_name: str) -> pa.Schema:
+    """
+    Builds the declared Arrow schema for an object from BRONZE_SCHEMAS.
+    RETURNS: pyarrow Schema, or None if the object has no declared schema
+    """
+    pa = import_heavy_module('pyarrow')
+    columns = BRONZE_SCHEMAS.get(object_name)
+
+    if not columns:
+        return None
+
+    return pa.schema([(column, pa.type_for_alias(type_alias)) for column, type_alias in columns])
+
+
+def build_arrow_table(records: list, name: str) -> pa.Table:
+    """
+    Builds an Arrow table from decoded JSON records, cast to the object's declared schema.
+    Objects with no declared schema keep Arrow's inferred types.
+    RETURNS: pyarrow Table, or None if the records do not match the declared schema
+    """
+    pa = import_heavy_module('pyarrow')
+    table = pa.Table.from_pylist(records)
+    schema = get_bronze_schema(name)
+
+    if schema is None:
+        logging.warning(f"{name} has no declared bronze schema.  Keeping inferred types...")
+        return table
+
+    try:
+        return table.select(schema.names).cast(schema)
+
+    except (KeyError, pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        logging.error(f"{name} data does not match its declared bronze schema: {e}")
+        return None
+
+
+def get_arrow_table_from_s3_objects(s3_client: BaseClient, s3_objects: list, name: str) -> pa.Table:
+    """
+    Get data from one or more S3 objects straight into an Arrow table, with no pandas DataFrame in between.
+    RETURNS: pyarrow Table, or None if the objects cannot be read or do not match the declared schema
+    """
+    records = []
+
+    try:
+        for s3_object in s3_objects:
+            logging.info(f"Attempting to read {name} data at {s3_object}...")
+            bucket, key = s3_object.split('s3://', 1)[-1].split('/', 1)
+
+            with METRICS.timer('read', name):
+                body = s3_client.get_object(Bucket = bucket, Key = key)['Body'].read()
+
+            records.extend(json.loads(body))
+
+    except botocore.exceptions.ClientError as e:
+        logging.error(f"{name} data S3 read failed: {e}")
+        return None
+
+    except ValueError as e:
+        logging.error(f"{name} data is not valid JSON: {e}")
+        return None
+
+    return build_arrow_table(records, name)
+
+
+def write_parquet_bytes(table: pa.Table) -> bytes:
+    """
+    Writes an Arrow table to Parquet in memory, using the same writer settings as awswrangler.
+    RETURNS: Parquet file bytes
+    """
+    pa = import_heavy_module('pyarrow')
+    pq = import_heavy_module('pyarrow.parquet')
+
+    buffer = pa.BufferOutputStream()
+    pq.write_table(table, buffer, compression = 'snappy', coerce_timestamps = 'ms', allow_truncated_timestamps = True)
+    return buffer.getvalue().to_pybytes()
+
+
+def put_s3_parquet_table(s3_client: BaseClient, table: pa.Table, name: str, bucket: str, key: str) -> bool:
+    """
+    Uploads an Arrow table to S3 as Parquet.
+    RETURNS True or False depending on outcome
+    """
+    try:
+        logging.info(f"Attempting to put {name} data in s3://{bucket}/{key}...")
+        body = write_parquet_bytes(table)
+
+        with METRICS.timer('write', name):
+            s3_client.put_object(Body = body, Bucket = bucket, Key = key)
+
+        METRICS.add('write', name, BytesOut = len(body))
         logging.info(f"{name} data S3 upload successful.")
         return True
 
@@ -114,6 +527,128 @@ def put_s3_parquet_object(df: pd.DataFrame, name: str, s3_object_bronze: str, se
         return False
 
 
+def get_thread_session() -> boto3.Session:
+    """
+    Gets a boto3 session for the current thread.
+    boto3 sessions are not thread-safe, and awswrangler creates clients from the session it is given.
+    RETURNS: boto3 Session
+    """
+    if not hasattr(THREAD_LOCAL, 'session'):
+        THREAD_LOCAL.session = boto3.Session()
+
+    return THREAD_LOCAL.session
+
+
+def convert_object_pandas(object_name: str, s3_object_raw: list, s3_bucket_bronze: str, s3_key_bronze: str) -> bool:
+    """
+    Converts raw JSON to bronze Parquet through a pandas DataFrame using awswrangler.
+    RETURNS: True or False depending on outcome
+    """
+    # Get data from S3 Raw object
+    logging.info(f"Attempting to read {object_name} data...")
+    df = get_data_from_s3_object(get_thread_session(), s3_object_raw, object_name)
+
+    # Check DataFrame is populated
+    if df.empty:
+        logging.warning(f"{object_name} DataFrame is empty!")
+        return False
+
+    logging.info(f'{object_name} DataFrame has {len(df.columns)} columns and {len(df)} rows.')
+    METRICS.add('convert', object_name, RowsOut = len(df))
+
+    # Create S3 Bronze object path
+    s3_object_bronze = f's3://{s3_bucket_bronze}/{s3_key_bronze}'
+
+    logging.info(f"Attempting {object_name} S3 Bronze upload...")
+    return put_s3_parquet_object(df, object_name, s3_object_bronze, get_thread_session())
+
+
+def convert_object_arrow(s3_client: BaseClient, object_name: str, s3_object_raw: list, s3_bucket_bronze: str, s3_key_bronze: str) -> bool:
+    """
+    Converts raw JSON to bronze Parquet through an Arrow table with the object's declared schema.
+    RETURNS: True or False depending on outcome
+    """
+    # Get data from S3 Raw object
+    logging.info(f"Attempting to read {object_name} data into Arrow...")
+    table = get_arrow_table_from_s3_objects(s3_client, s3_object_raw, object_name)
+
+    # Check table is populated
+    if table is None or table.num_rows == 0:
+        logging.warning(f"{object_name} Arrow table is empty!")
+        return False
+
+    logging.info(f'{object_name} Arrow table has {table.num_columns} columns and {table.num_rows} rows.')
+    METRICS.add('convert', object_name, RowsOut = table.num_rows)
+
+    logging.info(f"Attempting {object_name} S3 Bronze upload...")
+    return put_s3_parquet_table(s3_client, table, object_name, s3_bucket_bronze, s3_key_bronze)
+
+
+def convert_object(s3_client: BaseClient, object_name: str, s3_object_raw: list, source_version: str, s3_bucket_bronze: str,
+                   data_source: str, force_full_rebuild: bool, memory_budget: MemoryBudget, memory_estimate: int,
+                   engine: str = 'pandas') -> str:
+    """
+    Converts one raw JSON object, or the part objects of a paginated one, into a bronze Parquet object.
+    Objects whose raw source version matches the one recorded for the bronze object are skipped.
+    The 'pandas' engine uses awswrangler, the 'arrow' engine goes from JSON to Parquet through Arrow only.
+    Safe to run in a worker thread.
+    RETURNS: 'success', 'failure' or 'unchanged'
+    """
+    # If no name returned, record failure
+    if not object_name:
+        logging.warning(f"Unable to parse name from {s3_object_raw}.")
+        return 'failure'
+
+    # Create S3 Bronze object key
+    s3_key_bronze = f'{data_source}/{object_name}/{object_name}.parquet'
+
+    # Skip objects built from the same raw source version on a previous run
+    if not force_full_rebuild:
+        manifest = get_bronze_manifest(s3_client, s3_bucket_bronze, data_source, object_name)
+
+        if manifest.get('source_version') == source_version:
+            logging.info(f"{object_name} raw source version {source_version} already converted.  Skipping...")
+            return 'unchanged'
+
+    # Wait until there is room in the memory budget for this object
+    with memory_budget.reserve(memory_estimate), METRICS.timer('convert', object_name):
+
+        if engine == 'arrow':
+            ok = convert_object_arrow(s3_client, object_name, s3_object_raw, s3_bucket_bronze, s3_key_bronze)
+
+        else:
+            ok = convert_object_pandas(object_name, s3_object_raw, s3_bucket_bronze, s3_key_bronze)
+
+    if not ok:
+        logging.warning(f"{object_name} S3 Bronze upload failed!")
+        return 'failure'
+
+    # Record the source version only once the Parquet object is in place
+    put_bronze_manifest(s3_client, s3_bucket_bronze, data_source, object_name, {
+        'key': s3_key_bronze,
+        'source_keys': sorted(s3_object_raw),
+        'source_version': source_version,
+        'written_at': datetime.now(timezone.utc).isoformat()
+        })
+
+    logging.info(f"{object_name} S3 Bronze upload complete.")
+    return 'success'
+
+
+###############
+### CLIENTS ###
+###############
+
+# Created once per container and reused by warm invocations
+clients_started = time.perf_counter()
+session = boto3.Session()
+client_s3 = session.client('s3')
+client_ssm = session.client('ssm')
+client_sns = session.client('sns')
+INIT_TIMINGS['clients'] = (time.perf_counter() - clients_started) * 1000
+COLD_START: bool = True
+
+
 #############
 ### START ###
 #############
@@ -134,16 +669,13 @@ def lambda_handler(event, context):
         force = True
         )
 
+    log_init_report()
+
 
     #################
     ### VARIABLES ###
     #################
 
-    # AWS sessions and clients
-    session = boto3.Session()
-    client_ssm = session.client('ssm')
-    client_sns = session.client('sns')
-
     # AWS Parameter Store Names
     parametername_s3bucket_raw: str = '/s3/lakehouse/name/raw'
     parametername_s3bucket_bronze: str = '/s3/lakehouse/name/bronze'
@@ -153,19 +685,38 @@ def lambda_handler(event, context):
     data_source: str = 'wordpress_api'
     function_name: str = f'data_{data_source}_bronze'
 
+    # Event-driven mode - convert only the objects named in an S3 or EventBridge event.  Other payloads sweep every object.
+    s3_event_keys = get_s3_keys_from_event(event)
+
+    # Change detection - ignore recorded source versions and rebuild every object
+    force_full_rebuild: bool = bool(event.get('force_full_rebuild', False))
+
+    # Conversion engine - 'pandas' (awswrangler) or 'arrow' (declared schemas, no pandas)
+    bronze_engine: str = event.get('bronze_engine', 'pandas')
+
+    # Concurrency - objects converted at the same time, and the share of Lambda memory they may use
+    bronze_max_workers: int = max(1, int(event.get('bronze_max_workers', 4)))
+    bronze_memory_fraction: float = float(event.get('bronze_memory_fraction', 0.6))
+
     # Counters
     object_count_all: int = 0
     object_count_failure: int = 0
     object_count_success: int = 0
+    object_count_unchanged: int = 0
 
 
     ##################
     ### PARAMETERS ###
     ##################
 
-    # Get SNS topic from Parameter Store
-    logging.info("Getting SNS parameter...")
-    sns_topic = get_parameter_from_ssm(client_ssm, parametername_snstopic)
+    # Get every parameter from Parameter Store in one batch
+    logging.info("Getting Parameter Store parameters...")
+
+    with METRICS.timer('ssm'):
+        parameters = get_parameters_from_ssm(client_ssm, [parametername_snstopic, parametername_s3bucket_raw, parametername_s3bucket_bronze])
+
+    # Get SNS topic
+    sns_topic = parameters[parametername_snstopic]
 
     # Check an SNS topic has been returned.
     if not sns_topic:
@@ -173,9 +724,8 @@ def lambda_handler(event, context):
         logging.warning(message)
         raise ValueError(message)
 
-    # Get S3 bucket name from Parameter Store
-    logging.info("Getting S3 Raw parameter...")
-    s3_bucket_raw = get_parameter_from_ssm(client_ssm, parametername_s3bucket_raw)
+    # Get S3 Raw bucket name
+    s3_bucket_raw = parameters[parametername_s3bucket_raw]
 
     # Check an S3 bucket has been returned.
     if not s3_bucket_raw:
@@ -186,9 +736,8 @@ def lambda_handler(event, context):
         send_sns_message(client_sns, sns_topic, subject, message)
         return
 
-    # Get S3 bucket name from Parameter Store
-    logging.info("Getting S3 parametername_s3bucket_bronze parameter...")
-    s3_bucket_bronze = get_parameter_from_ssm(client_ssm, parametername_s3bucket_bronze)
+    # Get S3 Bronze bucket name
+    s3_bucket_bronze = parameters[parametername_s3bucket_bronze]
 
     # Check an S3 bucket has been returned.
     if not s3_bucket_bronze:
@@ -199,61 +748,88 @@ def lambda_handler(event, context):
         send_sns_message(client_sns, sns_topic, subject, message)
         return
 
-    # Capture all s3 paths in s3_objects and total them in endpoint_total
-    s3_objects_raw = wr.s3.list_objects(path = f's3://{s3_bucket_raw}/{data_source}',
-                                        suffix = 'json',
-                                        boto3_session = session
-                                        )
+    if s3_event_keys is None:
+        # Capture all s3 paths in s3_objects and total them in endpoint_total
+        with METRICS.timer('list'):
+            s3_objects_raw = list_s3_objects(client_s3, s3_bucket_raw, data_source, 'json')
+
+    else:
+        # Only list the folders of the objects in the event, so any paginated part objects are converted together
+        event_object_names = get_object_names_from_s3_keys(s3_event_keys, s3_bucket_raw, data_source)
+        logging.info(f"Event-driven run for objects {event_object_names}.")
+
+        if not event_object_names:
+            logging.info("No raw objects named in event.  Nothing to convert.")
+            return
+
+        s3_objects_raw = {}
+
+        for event_object_name in event_object_names:
+            s3_objects_raw.update(list_s3_objects(client_s3, s3_bucket_raw, f'{data_source}/{event_object_name}/', 'json'))
+
+    # Group paginated part objects under their object name
+    s3_objects_raw_grouped = group_s3_paths_by_object_name(s3_objects_raw)
 
-    # Count the endpoints and log the total
-    object_total = len(s3_objects_raw)
-    logging.info(f"{object_total} S3 objects returned.")
+    # Count the objects and log the total
+    object_total = len(s3_objects_raw_grouped)
+    logging.info(f"{len(s3_objects_raw)} S3 objects returned for {object_total} object names.")
 
     ###############
     ### OBJECTS ###
     ###############
 
-    for s3_object_raw in s3_objects_raw:
+    # Memory budget shared by the workers, leaving headroom for the runtime and imported libraries.
+    # The Lambda context gives memory as a string, and local runs have no context so assume 1024 MB.
+    lambda_memory_mb = int(getattr(context, 'memory_limit_in_mb', None) or 1024)
+    memory_budget = MemoryBudget(int(lambda_memory_mb * 1024 * 1024 * bronze_memory_fraction))
+    logging.info(f"Converting objects with {bronze_max_workers} workers and a {memory_budget.limit_bytes // (1024 * 1024)} MiB memory budget...")
 
-        # Increment & log counter
-        object_count_all += 1
-        logging.info(f"Processing object {object_count_all} of {object_total}.")
+    convert_start = time.perf_counter()
 
-        # Get filename from endpoint
-        object_name = get_objectname_from_s3_path(s3_object_raw)
+    # Workers must not be the first to import the engine's modules, as concurrent first imports can fail
+    if object_total:
+        import_engine_modules(bronze_engine)
 
-        # If no name returned, record failure & end current iteration
-        if not object_name:
-            logging.warning(f"Unable to parse name from {s3_object_raw}.")
-            endpoint_count_failure += 1
-            continue
+    with ThreadPoolExecutor(max_workers = bronze_max_workers) as executor:
 
-        # Get data from S3 Raw object
-        logging.info(f"Attempting to read {object_name} data...")
-        df = get_data_from_s3_object(session, s3_object_raw, object_name)
+        # Submit every object, keeping a lookup for failure messages
+        futures = {
+            executor.submit(convert_object, client_s3, object_name, s3_object_raw,
+                            get_source_version(s3_objects_raw, s3_object_raw), s3_bucket_bronze,
+                            data_source, force_full_rebuild, memory_budget,
+                            sum(s3_objects_raw[path]['size'] for path in s3_object_raw) * BRONZE_MEMORY_FACTOR,
+                            bronze_engine): object_name
+            for object_name, s3_object_raw in s3_objects_raw_grouped.items()
+            }
 
-        # Check DataFrame is populated
-        if df.empty:
-            logging.warning(f"{object_name} DataFrame is empty!")
-            endpoint_count_failure += 1
-            continue
+        # Counters are only updated here in the handler thread as each object completes
+        for future in as_completed(futures):
 
-        logging.info(f'{object_name} DataFrame has {len(df.columns)} columns and {len(df)} rows.')
+            # Increment & log counter
+            object_count_all += 1
+            logging.info(f"Finished object {object_count_all} of {object_total}: {futures[future]}")
 
-        # Create S3 Bronze object path
-        s3_object_bronze = f's3://{s3_bucket_bronze}/{data_source}/{object_name}/{object_name}.parquet'
+            try:
+                outcome = future.result()
 
-        logging.info(f"Attempting {object_name} S3 Bronze upload...")
-        ok = put_s3_parquet_object(df, object_name, s3_object_bronze, session)
+            except Exception as e:
+                logging.error(f"Object {futures[future]} raised an error: {e!r}")
+                outcome = 'failure'
 
-        # Iteration summaries
-        if not ok:
-            logging.warning("S3 Bronze upload failed!")
-            object_count_failure += 1
+            # Raw bytes read for every object that was converted or attempted
+            if outcome != 'unchanged':
+                METRICS.add('convert', futures[future],
+                            BytesIn = sum(s3_objects_raw[path]['size'] for path in s3_objects_raw_grouped[futures[future]]))
 
-        else:
-            logging.info("S3 Bronze upload complete.")
-            object_count_success += 1
+            # Iteration summaries
+            if outcome == 'unchanged':
+                object_count_unchanged += 1
+
+            elif outcome == 'success':
+                object_count_success += 1
+
+            else:
+                object_count_failure += 1
 
 
     ###############
@@ -261,7 +837,12 @@ def lambda_handler(event, context):
     ###############
 
     logging.info("WordPress API Bronze process complete: " \
-                f"{object_count_success} Successful | {object_count_failure} Failed.")
+                f"{object_count_success} Successful | {object_count_failure} Failed | {object_count_unchanged} Unchanged.")
+
+    # Emit this run's metrics as EMF records
+    METRICS.add('convert', Duration = (time.perf_counter() - convert_start) * 1000, ObjectsSucceeded = object_count_success,
+                ObjectsFailed = object_count_failure, ObjectsUnchanged = object_count_unchanged)
+    METRICS.flush(function_name)
 
     # Send SNS notification if any failures found
     if object_count_failure > 0:
@@ -1,19 +1,327 @@
 """
 Function gets data from WordPress API and stores as JSON in S3.
 """
+import time
+INIT_STARTED: float = time.perf_counter()
+
 import logging
+import os
+import hashlib
 import json
+import random
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import InvalidHeader, TimeoutError as Urllib3TimeoutError
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 import boto3
 import botocore
 from botocore.client import BaseClient
 
+# Cold start timings in milliseconds, reported once per container
+INIT_TIMINGS: dict = {'imports': (time.perf_counter() - INIT_STARTED) * 1000}
+
+# Parameter Store values cached across warm invocations, keyed by name as (value, expiry) tuples
+PARAMETER_CACHE: dict = {}
+PARAMETER_CACHE_TTL: int = int(os.environ.get('PARAMETER_CACHE_TTL', 300))
+
+# Streaming uploads are split into parts of this size.  S3 needs at least 5 MiB for every part except the last.
+S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024
+
+# CloudWatch embedded metric format (EMF) metrics, recorded with the shared lakehouse_metrics module.  It is deployed
+# alongside this file, and local runs import it from its folder in this repo.
+METRICS_FOLDER: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'InProgress', 'WordPressLakehouseMetrics')
+
+if os.path.isdir(METRICS_FOLDER):
+    sys.path.append(METRICS_FOLDER)
+
+from lakehouse_metrics import MetricsRecorder
+
+# WordPress API retries.  Connection errors, resets, read timeouts and these statuses are retried with capped
+# exponential backoff plus jitter, waiting for any Retry-After header the host sends for up to API_RATE_PAUSE_MAX.
+API_RETRY_TOTAL: int = int(os.environ.get('API_RETRY_TOTAL', 4))
+API_RETRY_BACKOFF_FACTOR: float = float(os.environ.get('API_RETRY_BACKOFF_FACTOR', 0.5))
+API_RETRY_BACKOFF_MAX: float = float(os.environ.get('API_RETRY_BACKOFF_MAX', 20))
+API_RETRY_BACKOFF_JITTER: float = float(os.environ.get('API_RETRY_BACKOFF_JITTER', 0.5))
+API_RETRY_STATUSES: tuple = (429, 500, 502, 503, 504)
+
+# Keep-alive connections kept per WordPress host.  The default covers 4 endpoint workers with 4 page workers each.
+API_POOL_MAXSIZE: int = int(os.environ.get('API_POOL_MAXSIZE', 16))
+
+# Adaptive timeouts.  An endpoint's read timeout is its recorded response latency times the multiplier, kept between
+# the min and max.  Latency is smoothed across runs so one slow response does not swing it.
+API_CONNECT_TIMEOUT: float = 5
+API_TIMEOUT_MULTIPLIER: float = 4
+API_TIMEOUT_MIN: float = 10
+API_TIMEOUT_MAX: float = 120
+API_LATENCY_SMOOTHING: float = 0.3
+
+# Adaptive request rate.  The limit on requests in flight starts at API_RATE_START and grows by about one per limit's
+# worth of fast responses.  Throttling statuses, connection errors and responses over API_RATE_LATENCY_TOLERANCE times
+# the endpoint's fastest response multiply it by API_RATE_DECREASE_FACTOR.  Retry-After pauses are capped at API_RATE_PAUSE_MAX.
+API_RATE_START: int = int(os.environ.get('API_RATE_START', 2))
+API_RATE_DECREASE_FACTOR: float = 0.5
+API_RATE_LATENCY_TOLERANCE: float = 3
+API_RATE_LATENCY_FLOOR: float = 0.25
+API_RATE_PAUSE_MAX: float = 60
+API_THROTTLE_STATUSES: tuple = (429, 503)
+
+
+###############
+### CLASSES ###
+###############
+
+
+class CappedRetry(Retry):
+    """
+    urllib3 Retry that waits for a throttled response's Retry-After header for at most API_RATE_PAUSE_MAX seconds.
+    The session sleeps for Retry-After inside the request, so an uncapped header could hold a worker, and its
+    rate controller slot, for longer than the Lambda timeout.
+    """
+    def get_retry_after(self, response) -> float | None:
+        """
+        Gets the response's Retry-After pause, capped at API_RATE_PAUSE_MAX.
+        RETURNS: Seconds to wait, or None if the header is missing
+        """
+        retry_after = super().get_retry_after(response)
+
+        if retry_after is not None and retry_after > API_RATE_PAUSE_MAX:
+            logging.warning(f"Capping Retry-After of {retry_after:.1f} seconds at {API_RATE_PAUSE_MAX} seconds.")
+            return API_RATE_PAUSE_MAX
+
+        return retry_after
+
+
+class JsonStructureValidator:
+    """
+    Incremental structural check for a JSON body that is streamed in chunks.
+    Tracks strings and bracket nesting without building any Python objects, so
+    truncated, unbalanced or non-container bodies are caught before they reach S3.
+    This is not a full JSON grammar check.
+    """
+    _tokens = re.compile(rb'["\\\[\]{}]')
+    _pairs = {ord(']'): ord('['), ord('}'): ord('{')}
+
+    def __init__(self) -> None:
+        self.stack: list = []
+        self.in_string: bool = False
+        self.escaped: bool = False
+        self.started: bool = False
+        self.complete: bool = False
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Checks the next chunk of the body.
+        RETURNS: None, or raises ValueError if the structure is invalid
+        """
+        if not self.started:
+            stripped = chunk.lstrip()
+            if not stripped:
+                return
+            if stripped[:1] not in (b'[', b'{'):
+                raise ValueError("JSON body is not an array or object.")
+            self.started = True
+
+        # A backslash at the end of the previous chunk escapes the first byte of this one
+        skip_position = 0 if self.escaped else -1
+        self.escaped = False
+
+        for match in self._tokens.finditer(chunk):
+            position = match.start()
+            if position == skip_position:
+                continue
+
+            token = chunk[position]
+
+            if self.in_string:
+                if token == ord('\\'):
+                    skip_position = position + 1
+                    self.escaped = skip_position == len(chunk)
+                elif token == ord('"'):
+                    self.in_string = False
+                continue
+
+            if self.complete:
+                raise ValueError("Unexpected content after the end of the JSON body.")
+
+            if token == ord('"'):
+                self.in_string = True
+            elif token in (ord('['), ord('{')):
+                self.stack.append(token)
+            elif token in self._pairs:
+                if not self.stack or self.stack.pop() != self._pairs[token]:
+                    raise ValueError("Unbalanced brackets in JSON body.")
+                self.complete = not self.stack
+            else:
+                raise ValueError("Backslash found outside a JSON string.")
+
+    def close(self) -> None:
+        """
+        Checks the body ended cleanly.
+        RETURNS: None, or raises ValueError if the body is empty or truncated
+        """
+        if not self.started:
+            raise ValueError("JSON body is empty.")
+        if self.stack or self.in_string:
+            raise ValueError("JSON body is truncated.")
+
+
+class WordPressApiError(Exception):
+    """
+    Raised when a WordPress API call fails once the session's retries are used up.
+    """
+
+
+class RequestRateController:
+    """
+    Limits the WordPress API requests in flight, adjusting the limit AIMD-style from how the host responds.
+    The limit grows additively while responses are fast and is cut multiplicatively on 429 or 503 responses and timeouts,
+    including those the session retried, and on responses much slower than the endpoint's fastest.
+    Other errors, such as DNS or refused connections, say nothing about load so free the slot without a cut.
+    Only requests sent after the last cut can cut it again, so one burst of slow responses counts once.
+    A Retry-After header on a throttled response holds every new request until it has passed.
+    Thread-safe, so every worker thread shares one controller.
+    """
+    def __init__(self, limit: int, max_limit: int, adaptive: bool = True) -> None:
+        self._condition = threading.Condition()
+        self.reset(limit, max_limit, adaptive)
+
+    def reset(self, limit: int, max_limit: int, adaptive: bool = True) -> None:
+        """
+        Starts a new run with the given limits, forgetting the previous run's latencies and pauses.
+        """
+        with self._condition:
+            self.max_limit: int = max(1, max_limit)
+            self.limit: float = float(min(max(1, limit), self.max_limit))
+            self.adaptive: bool = adaptive
+            self.in_flight: int = 0
+            self.paused_until: float = 0.0
+            self.decreased_at: float = 0.0
+            self.baselines: dict = {}
+            self._condition.notify_all()
+
+    def acquire(self) -> float:
+        """
+        Waits for a free request slot, and for any Retry-After pause to pass.
+        RETURNS: Monotonic time the slot was taken, to pass to release
+        """
+        with self._condition:
+            while True:
+                now = time.monotonic()
+
+                if now < self.paused_until:
+                    self._condition.wait(self.paused_until - now)
+
+                elif self.in_flight >= int(self.limit):
+                    self._condition.wait()
+
+                else:
+                    self.in_flight += 1
+                    return now
+
+    def release(self, name: str, started: float, response: requests.Response = None, timed_out: bool = False) -> None:
+        """
+        Frees a request slot and adjusts the limit from the response.  A missing response means the request errored,
+        which only cuts the limit when timed_out is set.
+        """
+        throttled = timed_out
+        retry_after = 0.0
+        latency = 0.0
+
+        if response is not None:
+            retries = getattr(response.raw, 'retries', None)
+            throttled = response.status_code in API_THROTTLE_STATUSES or any(
+                attempt.status in API_THROTTLE_STATUSES or isinstance(attempt.error, Urllib3TimeoutError)
+                for attempt in (retries.history if retries else ())
+                )
+
+            if response.status_code in API_THROTTLE_STATUSES:
+                retry_after = get_retry_after_seconds(response)
+
+            elif response.status_code in (200, 304):
+                latency = response.elapsed.total_seconds()
+
+        if throttled:
+            METRICS.add('api', name, Throttled = 1)
+
+        with self._condition:
+            self.in_flight -= 1
+            slow = False
+
+            if latency:
+                baseline = min(self.baselines.get(name, latency), latency)
+                self.baselines[name] = baseline
+                slow = latency > max(baseline, API_RATE_LATENCY_FLOOR) * API_RATE_LATENCY_TOLERANCE
+
+            if self.adaptive and (throttled or slow):
+                if started >= self.decreased_at:
+                    self.limit = max(1.0, self.limit * API_RATE_DECREASE_FACTOR)
+                    self.decreased_at = time.monotonic()
+                    logging.warning(f"WordPress host {'throttled' if throttled else 'slowed'} on {name}.  "
+                                    f"Requests in flight limited to {int(self.limit)}.")
+
+            elif self.adaptive and latency:
+                self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+
+            if retry_after:
+                logging.warning(f"WordPress host asked for a {retry_after:.1f} second pause on {name}.")
+                self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+            self._condition.notify_all()
+
+    def release_on_close(self, name: str, started: float, response: requests.Response) -> None:
+        """
+        Holds a streamed response's slot until the response is closed, so its body transfer counts as in flight.
+        The slot is released once, however many times the response is closed.
+        """
+        close = response.close
+        released = []
+
+        def close_and_release() -> None:
+            try:
+                close()
+
+            finally:
+                if not released:
+                    released.append(True)
+                    self.release(name, started, response)
+
+        response.close = close_and_release
+
+
+# Metrics for the current run, recorded by any function and flushed by the handler
+METRICS: MetricsRecorder = MetricsRecorder()
+
+# Requests in flight to the WordPress host, shared by every worker thread and reset by the handler
+API_RATE_CONTROLLER: RequestRateController = RequestRateController(API_RATE_START, API_POOL_MAXSIZE)
+
 
 #################
 ### FUNCTIONS ###
 #################
 
 
+def log_init_report() -> None:
+    """
+    Logs how long module imports and client creation took, once per container.
+    Later invocations are logged as warm starts.
+    """
+    global COLD_START
+
+    if not COLD_START:
+        logging.info("Warm start.")
+        return
+
+    COLD_START = False
+    report = " | ".join(f"{name} {milliseconds:.0f} ms" for name, milliseconds in INIT_TIMINGS.items())
+    logging.info(f"Cold start init report: {report}")
+
+
 def send_sns_message(sns_client: BaseClient, topic_arn: str, subject:str, message: str) -> None:
     """
     Sends messages via AWS SNS.
@@ -31,29 +339,50 @@ def send_sns_message(sns_client: BaseClient, topic_arn: str, subject:str, messag
         logging.error(f"SNS message [{subject}] not sent: {ec}")
 
 
-def get_parameter_from_ssm(ssm_client: BaseClient, parameter_name: str) -> str:
+def get_parameters_from_ssm(ssm_client: BaseClient, parameter_names: list, cache_ttl: int = PARAMETER_CACHE_TTL) -> dict:
     """
-    Gets parameter from AWS Parameter Store.
-    RETURNS: Parameter, Value, or a blank string to allow graceful fail.
+    Gets parameters from AWS Parameter Store in batches of up to 10 per call.
+    Values are cached at module scope, so warm invocations within cache_ttl seconds make no calls.
+    RETURNS: dict of Parameter Names and Values, with a blank string for any parameter not found to allow graceful fail.
     """
-    try:
-        logging.info(f"Attempting to get parameter {parameter_name}...")
-        response = ssm_client.get_parameter(Name = parameter_name)
+    now = time.monotonic()
+    parameters = {
+        name: PARAMETER_CACHE[name][0]
+        for name in parameter_names
+        if name in PARAMETER_CACHE and PARAMETER_CACHE[name][1] > now
+        }
+    parameter_names_uncached = [name for name in parameter_names if name not in parameters]
 
-        logging.info("Parameter found.")
-        return response['Parameter']['Value']
+    if parameters:
+        logging.info(f"{len(parameters)} parameters found in cache.")
 
-    except ssm_client.exceptions.ParameterNotFound as pnf:
-        logging.warning(f"Parameter {parameter_name} not found: {pnf}")
-        return ""
+    for index in range(0, len(parameter_names_uncached), 10):
+        batch = parameter_names_uncached[index:index + 10]
 
-    except botocore.exceptions.ParamValidationError as epv:
-        logging.error(f"Error getting parameter {parameter_name}: {epv}")
-        return ""
+        try:
+            logging.info(f"Attempting to get parameters {batch}...")
+            response = ssm_client.get_parameters(Names = batch)
 
-    except botocore.exceptions.ClientError as ec:
-        logging.error(f"Error getting parameter {parameter_name}: {ec}")
-        return ""
+            for parameter in response['Parameters']:
+                parameters[parameter['Name']] = parameter['Value']
+                PARAMETER_CACHE[parameter['Name']] = (parameter['Value'], now + cache_ttl)
+
+            logging.info(f"{len(response['Parameters'])} parameters found.")
+
+            # Missing parameters are not cached, so they are picked up as soon as they are created
+            for name in response['InvalidParameters']:
+                logging.warning(f"Parameter {name} not found.")
+                parameters[name] = ""
+
+        except botocore.exceptions.ParamValidationError as epv:
+            logging.error(f"Error getting parameters {batch}: {epv}")
+            parameters.update({name: "" for name in batch})
+
+        except botocore.exceptions.ClientError as ec:
+            logging.error(f"Error getting parameters {batch}: {ec}")
+            parameters.update({name: "" for name in batch})
+
+    return parameters
 
 
 def get_filename_from_endpoint(endpoint: str) -> str:
@@ -77,31 +406,139 @@ def get_filename_from_endpoint(endpoint: str) -> str:
         return ""
 
 
-def get_wordpress_api_json(requests_session, api_url: str, api_call_timeout: int) -> dict:
+def build_requests_session(pool_maxsize: int = API_POOL_MAXSIZE, retry_total: int = API_RETRY_TOTAL) -> requests.Session:
+    """
+    Creates the requests session used for every WordPress API call.
+    Transient failures are retried with capped exponential backoff plus jitter, and Retry-After waits are capped at
+    API_RATE_PAUSE_MAX.  Keep-alive connections are pooled per host, and compressed responses are asked for.
+    Brotli is only advertised when the Brotli package is installed.
+    RETURNS: requests Session
+    """
+    retry = CappedRetry(
+        total = retry_total,
+        allowed_methods = frozenset(['GET']),
+        status_forcelist = API_RETRY_STATUSES,
+        backoff_factor = API_RETRY_BACKOFF_FACTOR,
+        backoff_max = API_RETRY_BACKOFF_MAX,
+        backoff_jitter = API_RETRY_BACKOFF_JITTER,
+        respect_retry_after_header = True,
+        raise_on_status = False
+        )
+    adapter = HTTPAdapter(max_retries = retry, pool_maxsize = pool_maxsize)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    return session
+
+
+def get_backoff_seconds(attempt: int) -> float:
+    """
+    Creates a capped exponential backoff with full jitter, for retries made on top of the session's own retries.
+    RETURNS: Seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(API_RETRY_BACKOFF_MAX, API_RETRY_BACKOFF_FACTOR * 2 ** attempt))
+
+
+def get_retry_after_seconds(response: requests.Response) -> float:
     """
-    Gets JSON from WordPress API.
-    RETURNS: JSON string, or an exception if the API call fails
+    Gets how long a throttled response asks clients to wait, from its Retry-After header in seconds or HTTP date form.
+    RETURNS: Seconds to wait, capped at API_RATE_PAUSE_MAX, or 0 if the header is missing or invalid
     """
+    value = response.headers.get('Retry-After', '')
+
+    if not value:
+        return 0.0
+
+    try:
+        return min(API_RATE_PAUSE_MAX, Retry().parse_retry_after(value))
+
+    except InvalidHeader:
+        logging.warning(f"Ignoring invalid Retry-After header: {value}")
+        return 0.0
+
+
+def get_api_timeout(manifest: dict, api_call_timeout: int) -> tuple:
+    """
+    Creates an endpoint's connect and read timeouts from the response latency recorded in its manifest.
+    Endpoints with no recorded latency use api_call_timeout.
+    RETURNS: Tuple of connect and read timeouts in seconds
+    """
+    latency = manifest.get('latency', 0)
+
+    if not latency:
+        return (API_CONNECT_TIMEOUT, api_call_timeout)
+
+    return (API_CONNECT_TIMEOUT, min(API_TIMEOUT_MAX, max(API_TIMEOUT_MIN, latency * API_TIMEOUT_MULTIPLIER)))
+
+
+def get_wordpress_api_response(requests_session, api_url: str, api_timeout: tuple, headers: dict = None,
+                               stream: bool = False, params: dict = None) -> requests.Response:
+    """
+    Sends a request to the WordPress API.  The session retries transient failures before anything is raised here.
+    Each request waits for a slot from API_RATE_CONTROLLER, which it releases with the response.  Streamed responses
+    keep their slot until they are closed, so callers must close them, such as with a with block.
+    Conditional requests can return 304 Not Modified, which is treated as a valid response.
+    RETURNS: Response with status 200 or 304, or a WordPressApiError if the API call fails
+    """
+    name = get_filename_from_endpoint(api_url)
+
     try:
         logging.info(f"Sending request to {api_url} endpoint...")
-        response = requests_session.get(api_url, timeout = api_call_timeout)
 
-        if response.status_code == 200:
-            json_raw = response.json()
+        started = API_RATE_CONTROLLER.acquire()
+        response = None
+        timed_out = False
+
+        try:
+            with METRICS.timer('api', name):
+                response = requests_session.get(api_url, params = params, headers = headers, timeout = api_timeout, stream = stream)
+
+        except requests.exceptions.RequestException as e:
+            # Read timeouts the session retried until it gave up arrive as a ConnectionError wrapping urllib3's error
+            reason = getattr(e.args[0], 'reason', None) if e.args else None
+            timed_out = isinstance(e, requests.exceptions.Timeout) or isinstance(reason, Urllib3TimeoutError)
+            raise
+
+        finally:
+            # A streamed body has still to be read, so its slot is held until the response is closed
+            if response is not None and stream:
+                API_RATE_CONTROLLER.release_on_close(name, started, response)
+
+            else:
+                API_RATE_CONTROLLER.release(name, started, response, timed_out)
+
+        METRICS.add('api', name, Requests = 1)
+
+        # The urllib3 response records every retry the session made for this request
+        retries = getattr(response.raw, 'retries', None)
+
+        if retries is not None and retries.history:
+            logging.warning(f"{name} API call needed {len(retries.history)} retries.")
+            METRICS.add('api', name, Retries = len(retries.history))
+
+        if response.status_code in (200, 304):
             logging.info(f"API response: {response.status_code} {response.reason}")
-            return json_raw
+
+            # Streamed bodies have not been read yet, so they are counted as they are uploaded
+            if not stream:
+                METRICS.add('api', name, BytesIn = len(response.content))
+
+            return response
 
         else:
             logging.error(f"API response: {response.status_code} {response.reason} - {response.text}")
-            raise ValueError (f"API response: {response.status_code} {response.reason} - {response.text}")
+            response.close()
+            raise WordPressApiError(f"API response: {response.status_code} {response.reason} - {response.text}")
 
     except requests.exceptions.Timeout as et:
-        logging.error(f"API call request timed out after {api_call_timeout} seconds!")
-        raise Exception from et
+        logging.error(f"API call request timed out after {api_timeout} (connect, read) seconds!")
+        raise WordPressApiError(f"API call to {api_url} timed out") from et
 
     except requests.exceptions.RequestException as e:
         logging.exception(f"Error during API call to {api_url}: {e}")
-        raise Exception from e
+        raise WordPressApiError(f"API call to {api_url} failed: {e}") from e
 
 
 def put_s3_object(s3_client: BaseClient, bucket: str, prefix:str, name: str, json_data: str, suffix: str) -> bool:
@@ -111,19 +548,560 @@ def put_s3_object(s3_client: BaseClient, bucket: str, prefix:str, name: str, jso
     """
     try:
         logging.info(f"Attempting to put {name} data in {bucket} bucket's {prefix}/{name} prefix...")
+
+        with METRICS.timer('s3_write', name):
+            s3_client.put_object(
+                Body = json_data,
+                Bucket = bucket,
+                Key = f"{prefix}/{name}/{name}.{suffix}"
+            )
+
+        METRICS.add('s3_write', name, BytesOut = len(json_data if isinstance(json_data, bytes) else json_data.encode()))
+        logging.info(f"{name} API data S3 upload successful.")
+        return True
+
+    except botocore.exceptions.ClientError as e:
+        logging.error(f"{name} API data S3 upload failed: {e}")
+        return False
+
+
+def get_manifest_key(prefix: str, name: str) -> str:
+    """
+    Creates the S3 key of an endpoint's manifest.
+    Manifests sit outside the data prefix so they are never picked up as data objects.
+    RETURNS: S3 key string
+    """
+    return f"_manifest/{prefix}/{name}.json"
+
+
+def get_endpoint_manifest(s3_client: BaseClient, bucket: str, prefix: str, name: str) -> dict:
+    """
+    Gets an endpoint's manifest from S3.
+    RETURNS: Manifest dict, or an empty dict if there is no manifest or it cannot be read
+    """
+    key = get_manifest_key(prefix, name)
+
+    try:
+        logging.info(f"Attempting to get {name} manifest from {bucket} bucket's {key} key...")
+        response = s3_client.get_object(Bucket = bucket, Key = key)
+        return json.loads(response['Body'].read())
+
+    except s3_client.exceptions.NoSuchKey:
+        logging.info(f"No {name} manifest found.")
+        return {}
+
+    except (botocore.exceptions.ClientError, ValueError) as e:
+        logging.warning(f"{name} manifest could not be read: {e}")
+        return {}
+
+
+def put_endpoint_manifest(s3_client: BaseClient, bucket: str, prefix: str, name: str, manifest: dict) -> bool:
+    """
+    Uploads an endpoint's manifest to S3.
+    RETURNS: True or False depending on outcome
+    """
+    key = get_manifest_key(prefix, name)
+
+    try:
         s3_client.put_object(
-            Body = json_data,
+            Body = json.dumps(manifest),
             Bucket = bucket,
-            Key = f"{prefix}/{name}/{name}.{suffix}"
+            Key = key
         )
-        logging.info(f"{name} API data S3 upload successful.")
+        logging.info(f"{name} manifest updated.")
         return True
 
     except botocore.exceptions.ClientError as e:
-        logging.error(f"{name} API data S3 upload failed: {e}")
+        logging.warning(f"{name} manifest update failed: {e}")
         return False
 
 
+def get_conditional_headers(manifest: dict) -> dict:
+    """
+    Creates conditional request headers from an endpoint's manifest.
+    Manifests from paginated runs only describe page 1, so they give no headers.
+    RETURNS: dict of headers, empty if the manifest holds no validators
+    """
+    headers = {}
+
+    if manifest.get('parts'):
+        return headers
+
+    if manifest.get('etag'):
+        headers['If-None-Match'] = manifest['etag']
+
+    if manifest.get('last_modified'):
+        headers['If-Modified-Since'] = manifest['last_modified']
+
+    return headers
+
+
+def build_endpoint_manifest(manifest: dict, response: requests.Response, api_endpoint: str, key: str, sha256: str,
+                            changed: bool, parts: dict = None) -> dict:
+    """
+    Creates an endpoint's new manifest from the previous manifest and the latest API response.
+    changed_at only moves when the S3 object is rewritten, so downstream stages can compare against it.
+    Paginated endpoints also record the SHA-256 of every part object.
+    latency is the smoothed time to the response headers in seconds, used for the endpoint's next timeout.
+    RETURNS: Manifest dict
+    """
+    checked_at = datetime.now(timezone.utc).isoformat()
+    latency = response.elapsed.total_seconds()
+
+    if manifest.get('latency'):
+        latency = API_LATENCY_SMOOTHING * latency + (1 - API_LATENCY_SMOOTHING) * manifest['latency']
+
+    return {
+        'endpoint': api_endpoint,
+        'key': key,
+        'etag': response.headers.get('ETag', manifest.get('etag', '')),
+        'last_modified': response.headers.get('Last-Modified', manifest.get('last_modified', '')),
+        'sha256': sha256,
+        'checked_at': checked_at,
+        'changed_at': checked_at if changed else manifest.get('changed_at', checked_at),
+        'parts': parts or {},
+        'latency': round(latency, 3)
+    }
+
+
+def iter_response_parts(response, part_size: int):
+    """
+    Re-chunks a streamed API response into S3 upload parts.
+    RETURNS: Generator of bytes, each exactly part_size long apart from the last
+    """
+    buffer = bytearray()
+
+    for chunk in response.iter_content(chunk_size = 1024 * 1024):
+        buffer.extend(chunk)
+
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+
+    if buffer:
+        yield bytes(buffer)
+
+
+def put_s3_multipart_object(s3_client: BaseClient, bucket: str, key: str, name: str, parts,
+                            validator: JsonStructureValidator = None, previous_sha256: str = "") -> str:
+    """
+    Uploads an iterable of byte parts to S3 as a multipart upload.
+    The upload is aborted if any part, or the optional JSON validation, fails.
+    It is also abandoned without writing anything if the body matches previous_sha256.
+    RETURNS: SHA-256 hex digest of the body, or a blank string if the upload failed
+    """
+    logging.info(f"Attempting multipart upload of {name} data to {bucket} bucket's {key} key...")
+    hasher = hashlib.sha256()
+    upload_id = None
+    size = 0
+
+    try:
+        upload_id = s3_client.create_multipart_upload(Bucket = bucket, Key = key)['UploadId']
+        uploaded_parts = []
+
+        for part_number, body in enumerate(parts, start = 1):
+            if validator:
+                validator.feed(body)
+            hasher.update(body)
+            size += len(body)
+
+            response = s3_client.upload_part(
+                Body = body,
+                Bucket = bucket,
+                Key = key,
+                PartNumber = part_number,
+                UploadId = upload_id
+            )
+            uploaded_parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+
+        if validator:
+            validator.close()
+
+        sha256 = hasher.hexdigest()
+        METRICS.add('api', name, BytesIn = size)
+
+        if sha256 == previous_sha256:
+            logging.info(f"{name} API data unchanged.  Abandoning multipart upload.")
+            abort_s3_multipart_upload(s3_client, bucket, key, upload_id)
+            return sha256
+
+        s3_client.complete_multipart_upload(
+            Bucket = bucket,
+            Key = key,
+            UploadId = upload_id,
+            MultipartUpload = {'Parts': uploaded_parts}
+        )
+        METRICS.add('s3_write', name, BytesOut = size)
+        logging.info(f"{name} API data S3 multipart upload of {len(uploaded_parts)} parts successful.")
+        return sha256
+
+    except botocore.exceptions.ClientError as e:
+        logging.error(f"{name} API data S3 multipart upload failed: {e}")
+        abort_s3_multipart_upload(s3_client, bucket, key, upload_id)
+        return ""
+
+    except Exception:
+        abort_s3_multipart_upload(s3_client, bucket, key, upload_id)
+        raise
+
+
+def abort_s3_multipart_upload(s3_client: BaseClient, bucket: str, key: str, upload_id: str) -> None:
+    """
+    Aborts an unfinished multipart upload so no partial object or orphaned parts are left behind.
+    """
+    if not upload_id:
+        return
+
+    try:
+        s3_client.abort_multipart_upload(Bucket = bucket, Key = key, UploadId = upload_id)
+        logging.info(f"Multipart upload {upload_id} for {key} aborted.")
+
+    except botocore.exceptions.ClientError as e:
+        logging.error(f"Unable to abort multipart upload {upload_id} for {key}: {e}")
+
+
+def stream_response_to_s3(response: requests.Response, s3_client: BaseClient, bucket: str, prefix: str, name: str,
+                          suffix: str, validate_json: bool, previous_sha256: str = "") -> str:
+    """
+    Streams a WordPress API response body straight into S3, without parsing or re-serialising it.
+    Bodies that fit in one part use a single put, larger bodies use a multipart upload.
+    Nothing is written if the body matches previous_sha256.
+    The response is always closed, so a stream aborted part way through does not leave its connection half-read.
+    RETURNS: SHA-256 hex digest of the body, or a blank string if the upload failed
+    """
+    validator = JsonStructureValidator() if validate_json else None
+
+    try:
+        parts = iter_response_parts(response, S3_MULTIPART_CHUNKSIZE)
+        first_part = next(parts, b'')
+
+        # A short first part means the whole body has arrived
+        if len(first_part) < S3_MULTIPART_CHUNKSIZE:
+            if validator:
+                validator.feed(first_part)
+                validator.close()
+
+            METRICS.add('api', name, BytesIn = len(first_part))
+
+            if first_part.strip() in (b'', b'[]', b'{}'):
+                logging.warning(f"{name} API response contained no data.")
+                return ""
+
+            sha256 = hashlib.sha256(first_part).hexdigest()
+
+            if sha256 == previous_sha256:
+                logging.info(f"{name} API data unchanged.  Skipping S3 upload.")
+                return sha256
+
+            return sha256 if put_s3_object(s3_client, bucket, prefix, name, first_part, suffix) else ""
+
+        # Otherwise the remaining parts are pulled from the stream as they upload
+        parts_all = (part for group in ([first_part], parts) for part in group)
+        return put_s3_multipart_object(s3_client, bucket, f"{prefix}/{name}/{name}.{suffix}", name,
+                                       parts_all, validator, previous_sha256)
+
+    except requests.exceptions.RequestException as e:
+        logging.exception(f"Error while streaming {name} API response: {e}")
+        raise WordPressApiError(f"{name} API response stream failed: {e}") from e
+
+    finally:
+        # Unread bodies, such as after a failed validation or upload, drop the connection instead of returning it to the pool
+        response.close()
+
+
+def buffer_response_to_s3(response: requests.Response, s3_client: BaseClient, bucket: str, prefix: str, name: str,
+                          suffix: str, previous_sha256: str = "") -> str:
+    """
+    Parses a WordPress API response body and uploads it to S3 as a JSON string.
+    Nothing is written if the JSON string matches previous_sha256.
+    RETURNS: SHA-256 hex digest of the JSON string, or a blank string if there is no data or the upload failed
+    """
+    api_json = response.json()
+
+    # If no data returned, record failure
+    if not api_json:
+        logging.warning(f"{name} API response contained no data.")
+        return ""
+
+    METRICS.add('api', name, RowsIn = len(api_json))
+
+    # If API does return data, transform to a json string and upload this to S3.
+    api_json_string = json.dumps(api_json)
+    sha256 = hashlib.sha256(api_json_string.encode()).hexdigest()
+
+    if sha256 == previous_sha256:
+        logging.info(f"{name} API data unchanged.  Skipping S3 upload.")
+        return sha256
+
+    return sha256 if put_s3_object(s3_client, bucket, prefix, name, api_json_string, suffix) else ""
+
+
+def get_total_pages(response: requests.Response, page_size: int) -> int:
+    """
+    Gets the number of pages a paginated WordPress API endpoint holds from its total-count headers.
+    RETURNS: Total pages, or 0 if the endpoint sends neither X-WP-TotalPages nor X-WP-Total
+    """
+    if response.headers.get('X-WP-TotalPages', '').isdigit():
+        return int(response.headers['X-WP-TotalPages'])
+
+    if response.headers.get('X-WP-Total', '').isdigit():
+        return -(-int(response.headers['X-WP-Total']) // page_size)
+
+    return 0
+
+
+def get_wordpress_api_page(requests_session, api_url: str, api_timeout: tuple, page: int, page_size: int, page_retries: int) -> requests.Response:
+    """
+    Gets one page of a paginated WordPress API endpoint, retrying that page on its own if it fails.
+    Page retries back off on top of the session's retries, and also cover errors such as an unreadable body.
+    RETURNS: Response with status 200, or a WordPressApiError once all retries have failed
+    """
+    params = {'page': page, 'per_page': page_size}
+
+    for attempt in range(1, page_retries + 2):
+        try:
+            return get_wordpress_api_response(requests_session, api_url, api_timeout, params = params)
+
+        except Exception as e:
+            if attempt > page_retries:
+                raise
+
+            logging.warning(f"Page {page} of {api_url} failed on attempt {attempt}: {e!r}.  Retrying...")
+            METRICS.add('api', get_filename_from_endpoint(api_url), Retries = 1)
+            time.sleep(get_backoff_seconds(attempt))
+
+
+def extract_endpoint_page(requests_session, s3_client: BaseClient, bucket: str, prefix: str, name: str, api_endpoint: str,
+                          api_timeout: tuple, page: int, page_size: int, page_retries: int, previous_parts: dict) -> tuple:
+    """
+    Gets one page of API data and uploads it to S3 as a numbered part object, using the response body as-is.
+    Empty pages and pages matching the previous run's SHA-256 are not written.
+    RETURNS: Tuple of the page's response, part S3 key, SHA-256 hex digest and row count.  The digest is blank if the upload failed.
+    """
+    response = get_wordpress_api_page(requests_session, api_endpoint, api_timeout, page, page_size, page_retries)
+
+    suffix = f"part-{page:05d}.json"
+    key = f"{prefix}/{name}/{name}.{suffix}"
+    rows = len(response.json())
+    METRICS.add('api', name, RowsIn = rows)
+    sha256 = hashlib.sha256(response.content).hexdigest()
+
+    if not rows:
+        return response, key, sha256, rows
+
+    if sha256 == previous_parts.get(key, ""):
+        logging.info(f"{name} page {page} unchanged.  Skipping S3 upload.")
+        return response, key, sha256, rows
+
+    if not put_s3_object(s3_client, bucket, prefix, name, response.content, suffix):
+        return response, key, "", rows
+
+    return response, key, sha256, rows
+
+
+def delete_stale_s3_objects(s3_client: BaseClient, bucket: str, prefix: str, keep: set) -> bool:
+    """
+    Deletes objects under an S3 prefix that are not in the keep set, such as parts left over from a larger previous run.
+    RETURNS: True or False depending on outcome
+    """
+    try:
+        paginator = s3_client.get_paginator('list_objects_v2')
+        stale_keys = [
+            item['Key']
+            for page in paginator.paginate(Bucket = bucket, Prefix = prefix)
+            for item in page.get('Contents', [])
+            if item['Key'] not in keep
+            ]
+
+        # delete_objects accepts up to 1000 keys per call
+        for index in range(0, len(stale_keys), 1000):
+            s3_client.delete_objects(
+                Bucket = bucket,
+                Delete = {'Objects': [{'Key': key} for key in stale_keys[index:index + 1000]], 'Quiet': True}
+            )
+
+        if stale_keys:
+            logging.info(f"Deleted {len(stale_keys)} stale objects under {prefix}.")
+        return True
+
+    except botocore.exceptions.ClientError as e:
+        logging.error(f"Unable to delete stale objects under {prefix}: {e}")
+        return False
+
+
+def extract_endpoint_pages(requests_session, s3_client: BaseClient, bucket: str, prefix: str, name: str, api_endpoint: str,
+                           api_timeout: tuple, page_size: int, page_workers: int, page_retries: int, manifest: dict) -> tuple:
+    """
+    Gets a paginated WordPress API endpoint page by page, writing each page as a numbered part object.
+    When the endpoint sends total-count headers the remaining pages are fetched in parallel,
+    otherwise pages are walked in order until a short page is returned.
+    RETURNS: Tuple of the first page's response and a dict of part keys and SHA-256 digests.  The dict is empty on failure.
+    """
+    previous_parts = manifest.get('parts', {})
+    part_hashes = {}
+    page_failures = 0
+
+    # Page 1 always comes first, as its headers say how many pages there are
+    first_response, key, sha256, rows = extract_endpoint_page(requests_session, s3_client, bucket, prefix, name, api_endpoint,
+                                                              api_timeout, 1, page_size, page_retries, previous_parts)
+
+    if not rows:
+        logging.warning(f"{name} API response contained no data.")
+        return first_response, {}
+
+    if not sha256:
+        return first_response, {}
+
+    part_hashes[key] = sha256
+    total_pages = get_total_pages(first_response, page_size)
+
+    if total_pages:
+        logging.info(f"{name} has {total_pages} pages of {page_size} rows.")
+
+        with ThreadPoolExecutor(max_workers = page_workers) as executor:
+            futures = {
+                executor.submit(extract_endpoint_page, requests_session, s3_client, bucket, prefix, name, api_endpoint,
+                                api_timeout, page, page_size, page_retries, previous_parts): page
+                for page in range(2, total_pages + 1)
+                }
+
+            for future in as_completed(futures):
+                try:
+                    _, key, sha256, rows = future.result()
+
+                except Exception as e:
+                    logging.error(f"{name} page {futures[future]} failed after {page_retries} retries: {e!r}")
+                    page_failures += 1
+                    continue
+
+                if not sha256:
+                    page_failures += 1
+
+                elif rows:
+                    part_hashes[key] = sha256
+
+    else:
+        logging.info(f"{name} sent no total-count headers.  Walking pages in order...")
+        page = 1
+
+        while rows == page_size:
+            page += 1
+            _, key, sha256, rows = extract_endpoint_page(requests_session, s3_client, bucket, prefix, name, api_endpoint,
+                                                         api_timeout, page, page_size, page_retries, previous_parts)
+
+            if not sha256:
+                page_failures += 1
+                break
+
+            if rows:
+                part_hashes[key] = sha256
+
+    if page_failures:
+        logging.warning(f"{name} had {page_failures} failed pages.")
+        return first_response, {}
+
+    # Remove anything the new set of parts does not cover, such as an unpaged object or surplus parts
+    if not delete_stale_s3_objects(s3_client, bucket, f"{prefix}/{name}/", set(part_hashes)):
+        return first_response, {}
+
+    return first_response, part_hashes
+
+
+def extract_endpoint(requests_session, s3_client: BaseClient, bucket: str, prefix: str, api_endpoint: str, api_call_timeout: int,
+                     stream_to_s3: bool = False, validate_json: bool = False, use_manifest: bool = True,
+                     page_size: int = 0, page_workers: int = 1, page_retries: int = 0) -> bool:
+    """
+    Gets data from a single WordPress API endpoint and uploads it to S3.
+    The endpoint's manifest makes the request conditional, and unchanged data is not rewritten.
+    Its recorded latency sets the read timeout, with api_call_timeout used for endpoints with no history.
+    A page_size above 0 fetches the endpoint as numbered part objects instead of one object.
+    Safe to run in a worker thread, as the requests session and boto3 client are shared read-only.
+    RETURNS: True or False depending on outcome
+    """
+    # Get filename from endpoint
+    object_name = get_filename_from_endpoint(api_endpoint)
+
+    # If no name returned, record failure
+    if not object_name.strip():
+        logging.warning(f"Unable to parse name from {api_endpoint}.")
+        return False
+
+    # Get the previous run's manifest, unless a full rebuild was asked for
+    manifest = get_endpoint_manifest(s3_client, bucket, prefix, object_name) if use_manifest else {}
+    api_timeout = get_api_timeout(manifest, api_call_timeout)
+
+    # Paginated mode writes one part object per page
+    if page_size > 0:
+        logging.info(f"Attempting paginated API query for {object_name}...")
+        response, parts = extract_endpoint_pages(requests_session, s3_client, bucket, prefix, object_name, api_endpoint,
+                                                 api_timeout, page_size, page_workers, page_retries, manifest)
+
+        if not parts:
+            logging.warning(f"{object_name} paginated S3 Upload failed!")
+            return False
+
+        sha256 = hashlib.sha256("".join(parts[key] for key in sorted(parts)).encode()).hexdigest()
+        changed = sha256 != manifest.get('sha256', '')
+        put_endpoint_manifest(s3_client, bucket, prefix, object_name,
+                              build_endpoint_manifest(manifest, response, api_endpoint,
+                                                      f"{prefix}/{object_name}/", sha256, changed, parts))
+
+        logging.info(f"{object_name} paginated S3 Upload of {len(parts)} parts complete." if changed else f"{object_name} unchanged.")
+        return True
+
+    # Get data using the endpoint
+    logging.info(f"Attempting API query for {object_name}...")
+    response = get_wordpress_api_response(requests_session, api_endpoint, api_timeout,
+                                          get_conditional_headers(manifest), stream_to_s3)
+
+    with response:
+
+        # 304 means WordPress has confirmed nothing changed since the manifest was written
+        if response.status_code == 304:
+            logging.info(f"{object_name} not modified since last run.  Skipping S3 upload.")
+            sha256 = manifest.get('sha256', '')
+
+        # Streaming mode pipes the response body straight into S3
+        elif stream_to_s3:
+            sha256 = stream_response_to_s3(response, s3_client, bucket, prefix, object_name, 'json',
+                                           validate_json, manifest.get('sha256', ''))
+
+        else:
+            sha256 = buffer_response_to_s3(response, s3_client, bucket, prefix, object_name, 'json',
+                                           manifest.get('sha256', ''))
+
+    if not sha256:
+        logging.warning(f"{object_name} S3 Upload failed!")
+        return False
+
+    # Remove part objects left over from a previous paginated run
+    if manifest.get('parts'):
+        delete_stale_s3_objects(s3_client, bucket, f"{prefix}/{object_name}/", {f"{prefix}/{object_name}/{object_name}.json"})
+
+    changed = sha256 != manifest.get('sha256', '')
+    put_endpoint_manifest(s3_client, bucket, prefix, object_name,
+                          build_endpoint_manifest(manifest, response, api_endpoint,
+                                                  f"{prefix}/{object_name}/{object_name}.json", sha256, changed))
+
+    logging.info(f"{object_name} S3 Upload complete." if changed else f"{object_name} unchanged.")
+    return True
+
+
+###############
+### CLIENTS ###
+###############
+
+# Created once per container and reused by warm invocations
+clients_started = time.perf_counter()
+session = boto3.Session()
+client_ssm = session.client('ssm')
+client_s3 = session.client('s3')
+client_sns = session.client('sns')
+requests_session = build_requests_session()
+INIT_TIMINGS['clients'] = (time.perf_counter() - clients_started) * 1000
+COLD_START: bool = True
+
+
 #############
 ### START ###
 #############
@@ -144,18 +1122,13 @@ def lambda_handler(event, context):
         force = True
         )
 
+    log_init_report()
+
 
     #################
     ### VARIABLES ###
     #################
 
-    # AWS sessions and clients
-    session = boto3.Session()
-    client_ssm = session.client('ssm')
-    client_s3 = session.client('s3')
-    client_sns = session.client('sns')
-    requests_session = requests.Session()
-
     # AWS Parameter Store Names
     parametername_s3bucket: str = '/s3/lakehouse/name/raw'
     parametername_snstopic: str = '/sns/data/lakehouse/raw'
@@ -165,6 +1138,26 @@ def lambda_handler(event, context):
     data_source: str = 'wordpress_api'
     function_name: str = f'data_{data_source}_raw'
 
+    # Concurrency - endpoints extracted at the same time.  Set to 1 for serial extraction.
+    api_max_workers: int = max(1, int(event.get('api_max_workers', 4)))
+
+    # Streaming - pipe response bodies straight to S3, optionally checking the JSON structure on the way
+    api_stream_to_s3: bool = bool(event.get('api_stream_to_s3', False))
+    api_validate_json: bool = bool(event.get('api_validate_json', False))
+
+    # Pagination - rows per page (0 disables pagination), pages fetched at the same time per endpoint and retries per page
+    api_page_size: int = max(0, int(event.get('api_page_size', 0)))
+    api_page_workers: int = max(1, int(event.get('api_page_workers', 4)))
+    api_page_retries: int = max(0, int(event.get('api_page_retries', 2)))
+
+    # Request rate - the most WordPress API requests in flight, and whether the limit starts low and adapts to how the
+    # host responds.  Workers above the limit wait for a free slot.
+    api_max_in_flight: int = max(1, int(event.get('api_max_in_flight', api_max_workers * (api_page_workers if api_page_size else 1))))
+    api_adaptive_rate: bool = bool(event.get('api_adaptive_rate', True))
+
+    # Change detection - ignore endpoint manifests and rewrite every object
+    force_full_rebuild: bool = bool(event.get('force_full_rebuild', False))
+
     # Counters
     api_call_timeout: int = 30
     endpoint_count_all: int = 0
@@ -176,9 +1169,14 @@ def lambda_handler(event, context):
     ### PARAMETERS ###
     ##################
 
-    # Get SNS topic from Parameter Store
-    logging.info("Getting SNS parameter...")
-    sns_topic = get_parameter_from_ssm(client_ssm, parametername_snstopic)
+    # Get every parameter from Parameter Store in one batch
+    logging.info("Getting Parameter Store parameters...")
+
+    with METRICS.timer('ssm'):
+        parameters = get_parameters_from_ssm(client_ssm, [parametername_snstopic, parametername_wordpressapi, parametername_s3bucket])
+
+    # Get SNS topic
+    sns_topic = parameters[parametername_snstopic]
 
     # Check an SNS topic has been returned.
     if not sns_topic:
@@ -186,9 +1184,8 @@ def lambda_handler(event, context):
         logging.warning(message)
         raise ValueError(message)
 
-    # Get the WordPress endpoints from Parameter Store and convert the string to a list
-    logging.info("Getting WordPress parameter...")
-    api_endpoints_list = get_parameter_from_ssm(client_ssm, parametername_wordpressapi).split(",")
+    # Get the WordPress endpoints and convert the string to a list
+    api_endpoints_list = parameters[parametername_wordpressapi].split(",")
 
     # Check the API list isn't empty
     if not any(api_endpoints_list):
@@ -203,9 +1200,8 @@ def lambda_handler(event, context):
     endpoint_total = len(api_endpoints_list)
     logging.info(f"{endpoint_total} API endpoints returned.")
 
-    # Get S3 bucket name from Parameter Store
-    logging.info("Getting S3 parameter...")
-    s3_bucket = get_parameter_from_ssm(client_ssm, parametername_s3bucket)
+    # Get S3 bucket name
+    s3_bucket = parameters[parametername_s3bucket]
 
     # Check an S3 bucket has been returned.
     if not s3_bucket:
@@ -221,45 +1217,51 @@ def lambda_handler(event, context):
     ### ENDPOINTS ###
     #################
 
-    for api_endpoint in api_endpoints_list:
+    logging.info(f"Extracting endpoints with {api_max_workers} workers and up to {api_max_in_flight} requests in flight...")
+    API_RATE_CONTROLLER.reset(API_RATE_START if api_adaptive_rate else api_max_in_flight, api_max_in_flight, api_adaptive_rate)
+    extract_start = time.perf_counter()
 
-        # Increment & log counter
-        endpoint_count_all += 1
-        logging.info(f"Processing endpoint {endpoint_count_all} of {endpoint_total}")
+    with ThreadPoolExecutor(max_workers = api_max_workers) as executor:
 
-        # Get filename from endpoint
-        object_name = get_filename_from_endpoint(api_endpoint)
+        # Submit every endpoint, keeping a lookup for failure messages
+        futures = {
+            executor.submit(extract_endpoint, requests_session, client_s3, s3_bucket, data_source, api_endpoint, api_call_timeout,
+                            stream_to_s3 = api_stream_to_s3,
+                            validate_json = api_validate_json,
+                            use_manifest = not force_full_rebuild,
+                            page_size = api_page_size,
+                            page_workers = api_page_workers,
+                            page_retries = api_page_retries): api_endpoint
+            for api_endpoint in api_endpoints_list
+            }
 
-        # If no name returned, record failure & end current iteration
-        if not object_name.strip():
-            logging.warning(f"Unable to parse name from {api_endpoint}.")
-            endpoint_count_failure += 1
-            continue
+        # Counters are only updated here in the handler thread as each endpoint completes
+        for future in as_completed(futures):
 
-        # Get data using the endpoint
-        logging.info(f"Attempting API query for {object_name}...")
-        api_json = get_wordpress_api_json(requests_session, api_endpoint, api_call_timeout)
+            # Increment & log counter
+            endpoint_count_all += 1
+            api_endpoint = futures[future]
+            logging.info(f"Finished endpoint {endpoint_count_all} of {endpoint_total}: {api_endpoint}")
 
-        # If no data returned, record failure & end current iteration
-        if not api_json:
-            logging.warning("Skipping attempt due to API call failure.")
-            endpoint_count_failure += 1
-            continue
+            try:
+                ok = future.result()
 
-        # If API does return data, transform to a json string and upload this to S3.
-        api_json_string = json.dumps(api_json)
+            except Exception as e:
+                logging.error(f"Endpoint {api_endpoint} raised an error: {e!r}")
+                ok = False
 
-        logging.info("Attempting API data S3 upload...")
-        ok = put_s3_object(client_s3, s3_bucket, data_source, object_name, api_json_string, 'json')
+            # Iteration summaries
+            if not ok:
+                endpoint_count_failure += 1
 
-        # Iteration summaries
-        if not ok:
-            logging.warning("S3 Upload failed!")
-            endpoint_count_failure += 1
+            else:
+                endpoint_count_success += 1
 
-        else:
-            logging.info("S3 Upload complete.")
-            endpoint_count_success += 1
+    extract_seconds = time.perf_counter() - extract_start
+    logging.info(f"Endpoint extraction took {extract_seconds:.2f} seconds, "
+                 f"finishing with {int(API_RATE_CONTROLLER.limit)} requests in flight allowed.")
+    METRICS.add('extract', Duration = extract_seconds * 1000, ObjectsSucceeded = endpoint_count_success,
+                ObjectsFailed = endpoint_count_failure)
 
 
     ###############
@@ -268,6 +1270,9 @@ def lambda_handler(event, context):
     logging.info("WordPress API Raw process complete: " \
                  f"{endpoint_count_success} Successful | {endpoint_count_failure} Failed.")
 
+    # Emit this run's metrics as EMF records
+    METRICS.flush(function_name)
+
     # Send SNS notification if any failures found
     if endpoint_count_failure > 0:
         message = f"{function_name} ran with {endpoint_count_failure} errors.  Please check logs."
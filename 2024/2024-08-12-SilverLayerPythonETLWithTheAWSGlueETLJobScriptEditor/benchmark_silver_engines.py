@@ -0,0 +1,177 @@
+"""
+Benchmarks the silver pandas and Arrow engines against a synthetic bronze statistics_pages table, without touching AWS.
+Each engine runs in its own process so peak memory is measured separately.
+
+Usage: python benchmark_silver_engines.py --rows 5000000 --repeat 3
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+# The silver module creates boto3 clients on import, which need a region but make no calls
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-west-1')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+#################
+### FUNCTIONS ###
+#################
+
+
+def generate_bronze_parquet(object_name: str, rows: int, seed: int = 42) -> bytes:
+    """
+    Generates a bronze Parquet object with the column types the bronze function writes.
+    RETURNS: Parquet file bytes
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rng = np.random.default_rng(seed)
+
+    if object_name == 'posts':
+        dates = (np.datetime64('2020-01-01T00:00:00') + rng.integers(0, 10**8, rows).astype('timedelta64[s]')).astype(str)
+        table = pa.table({
+            'ID': np.arange(1, rows + 1), 'post_author': np.ones(rows, dtype = 'int64'),
+            'post_date': pa.array(np.char.replace(dates, 'T', ' ')), 'post_content': ['Lorem ipsum dolor sit amet.'] * rows,
+            'post_title': [f'Post {index}' for index in range(rows)], 'post_status': ['publish'] * rows,
+            'post_password': [''] * rows, 'post_modified': pa.array(np.char.replace(dates, 'T', ' ')),
+            'post_parent': np.zeros(rows, dtype = 'int64'), 'post_type': ['post'] * rows
+            })
+
+    else:
+        table = pa.table({
+            'page_id': np.arange(1, rows + 1),
+            'uri': pa.array([f'/post-{index}/' for index in range(500)]).take(rng.integers(0, 500, rows)),
+            'type': pa.array(['post', 'page', 'home']).take(rng.integers(0, 3, rows)),
+            'date': pa.array(np.datetime64('2022-01-01') + (np.arange(rows) // 2000).astype('timedelta64[D]'),
+                             pa.timestamp('ms')),
+            'count': rng.integers(1, 200, rows),
+            'id': rng.integers(1, 500, rows)
+            })
+
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, compression = 'snappy', coerce_timestamps = 'ms')
+    return sink.getvalue().to_pybytes()
+
+
+def convert_pandas(body: bytes, object_name: str) -> bytes:
+    """
+    Converts bronze Parquet to silver the way the pandas engine does, minus the S3 calls.
+    RETURNS: Parquet file bytes
+    """
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    import wordpress_api_etl_silver as silver
+
+    df = pd.read_parquet(pa.BufferReader(body), columns = silver.SILVER_TRANSFORMS[object_name]['columns'])
+    df = silver.transform_data(object_name, df)
+
+    sink = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pandas(df, preserve_index = False), sink, compression = 'snappy',
+                   coerce_timestamps = 'ms', allow_truncated_timestamps = False)
+    return sink.getvalue().to_pybytes()
+
+
+def convert_arrow(body: bytes, object_name: str) -> bytes:
+    """
+    Converts bronze Parquet to silver the way the Arrow engine does, minus the S3 calls.
+    RETURNS: Parquet file bytes
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    import wordpress_api_etl_silver as silver
+
+    parquet_file = pq.ParquetFile(pa.BufferReader(body))
+    sink = pa.BufferOutputStream()
+    writer = None
+
+    for batch in parquet_file.iter_batches(columns = silver.SILVER_TRANSFORMS[object_name]['columns']):
+        batch = silver.transform_record_batch(object_name, batch)
+
+        if writer is None:
+            writer = pq.ParquetWriter(sink, batch.schema, compression = 'snappy', coerce_timestamps = 'ms',
+                                      allow_truncated_timestamps = False, use_deprecated_int96_timestamps = False)
+
+        writer.write_batch(batch)
+
+    writer.close()
+    return sink.getvalue().to_pybytes()
+
+
+def run_engine(engine: str, object_name: str, rows: int) -> dict:
+    """
+    Runs one engine once in the current process.
+    RETURNS: dict of wall seconds, CPU seconds, peak RSS growth in MiB and the Parquet output
+    """
+    body = generate_bronze_parquet(object_name, rows)
+
+    # Import libraries before timing, as a warm Glue job would have them loaded
+    import pandas, pyarrow.compute, pyarrow.parquet  # noqa: F401, E401
+    import wordpress_api_etl_silver  # noqa: F401
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+    parquet = (convert_arrow if engine == 'arrow' else convert_pandas)(body, object_name)
+
+    return {
+        'wall': time.perf_counter() - wall_start,
+        'cpu': time.process_time() - cpu_start,
+        'rss_mib': max(0, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024,
+        'parquet': parquet
+    }
+
+
+def outputs_match(parquet_pandas: bytes, parquet_arrow: bytes) -> bool:
+    """
+    Checks both engines wrote the same columns, types and values.  Schema metadata such as pandas' is ignored.
+    RETURNS: True or False
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table_pandas = pq.read_table(pa.BufferReader(parquet_pandas)).replace_schema_metadata()
+    table_arrow = pq.read_table(pa.BufferReader(parquet_arrow)).replace_schema_metadata()
+    return table_pandas.equals(table_arrow)
+
+
+#############
+### START ###
+#############
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    parser.add_argument('--rows', type = int, default = 5000000, help = 'statistics_pages rows')
+    parser.add_argument('--posts', type = int, default = 5000)
+    parser.add_argument('--repeat', type = int, default = 3)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+
+    for object_name, rows in (('posts', args.posts), ('statistics_pages', args.rows)):
+        results = {}
+
+        for engine in ('pandas', 'arrow'):
+            runs = []
+
+            # A fresh process per run keeps peak RSS readings independent
+            for _ in range(args.repeat):
+                with context.Pool(1) as pool:
+                    runs.append(pool.apply(run_engine, (engine, object_name, rows)))
+
+            results[engine] = min(runs, key = lambda run: run['wall'])
+            best = results[engine]
+            print(f"{object_name:<17} {engine:<7} rows {rows:>9} | "
+                  f"wall {best['wall']:7.2f} s | cpu {best['cpu']:7.2f} s | peak RSS +{best['rss_mib']:7.1f} MiB")
+
+        speedup = results['pandas']['wall'] / results['arrow']['wall']
+        match = outputs_match(results['pandas']['parquet'], results['arrow']['parquet'])
+        print(f"{object_name:<17} arrow speedup {speedup:.2f}x | outputs match: {match}")
@@ -1,20 +1,159 @@
 # pylint: disable=W1203
 """
-Function gets data from WordPress API and stores as JSON in S3.
+Glue job transforms bronze WordPress API Parquet objects into silver Parquet datasets in the Silver S3 bucket.
+Each object is transformed by its SILVER_TRANSFORMS entry with the pandas (awswrangler) or Arrow engine, and partitioned
+objects are rebuilt incrementally from their watermark.
 """
+from __future__ import annotations
+import time
+INIT_STARTED: float = time.perf_counter()
+
+import importlib
+import json
 import logging
+import os
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
 import boto3
 import botocore
-import awswrangler as wr
-import pandas as pd
 from botocore.client import BaseClient
 
+# Type hints only.  pandas and pyarrow themselves are imported lazily through import_heavy_module.
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+# Cold start timings in milliseconds, reported once per container
+INIT_TIMINGS: dict = {'imports': (time.perf_counter() - INIT_STARTED) * 1000}
+
+# Heavy modules are imported one at a time, so no thread is handed a module another thread is still importing
+IMPORT_LOCK = threading.Lock()
+
+# Parameter Store values cached across warm invocations, keyed by name as (value, expiry) tuples
+PARAMETER_CACHE: dict = {}
+PARAMETER_CACHE_TTL: int = int(os.environ.get('PARAMETER_CACHE_TTL', 300))
+
+# Silver transforms for each mapped object:
+#   columns - bronze columns kept, in source order, and the only ones read from Parquet.  None keeps every column.
+#   date_parts - columns parsed as dates and split into {column}_todate, _year, _month and _day columns
+#   replacements - string columns with (old, new) substring replacements
+#   partition_cols - Hive partition columns used when the object is written as a partitioned dataset
+#   watermark_column - date column tracked for incremental runs of a partitioned dataset.  None always rebuilds in full.
+SILVER_TRANSFORMS: dict = {
+    'posts': {
+        'columns': ['ID', 'post_author', 'post_date', 'post_content', 'post_title', 'post_status',
+                    'post_password', 'post_modified', 'post_parent', 'post_type'],
+        'date_parts': ['post_date', 'post_modified'],
+        'replacements': {},
+        'partition_cols': ['post_date_year', 'post_date_month'],
+        'watermark_column': None
+        },
+    'statistics_pages': {
+        'columns': None,
+        'date_parts': ['date'],
+        'replacements': {},
+        'partition_cols': ['date_year', 'date_month'],
+        'watermark_column': 'date'
+        },
+    'term_relationship': {
+        'columns': ['object_id', 'term_taxonomy_id'],
+        'date_parts': [],
+        'replacements': {},
+        'partition_cols': None,
+        'watermark_column': None
+        },
+    'term_taxonomy': {
+        'columns': ['term_taxonomy_id', 'term_id', 'taxonomy', 'count'],
+        'date_parts': [],
+        'replacements': {},
+        'partition_cols': None,
+        'watermark_column': None
+        },
+    'terms': {
+        'columns': ['term_id', 'name', 'slug'],
+        'date_parts': [],
+        'replacements': {'name': [('&amp;', '&')]},
+        'partition_cols': None,
+        'watermark_column': None
+        }
+    }
+
+# Integer type of the _year, _month and _day columns in both engines, matching the bigint columns the gold job maps
+SILVER_DATE_PART_TYPE: str = 'int64'
+
+# Parquet writer settings for the Arrow engine, matching awswrangler's to_parquet defaults used by the pandas engine
+SILVER_PARQUET_OPTIONS: dict = {
+    'compression': 'snappy',
+    'coerce_timestamps': 'ms',
+    'allow_truncated_timestamps': False,
+    'use_deprecated_int96_timestamps': False
+    }
+
+# Athena column types for the Arrow types silver writes, used when registering Arrow engine datasets
+ATHENA_TYPES: dict = {
+    'int32': 'int',
+    'int64': 'bigint',
+    'double': 'double',
+    'bool': 'boolean',
+    'string': 'string',
+    'large_string': 'string'
+    }
+
+# CloudWatch embedded metric format (EMF) metrics, recorded with the shared lakehouse_metrics module.  It is deployed
+# alongside this file, and local runs import it from its folder in this repo.
+METRICS_FOLDER: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'InProgress', 'WordPressLakehouseMetrics')
+
+if os.path.isdir(METRICS_FOLDER):
+    sys.path.append(METRICS_FOLDER)
+
+from lakehouse_metrics import MetricsRecorder
+
+# Metrics for the current run, recorded by any function and flushed by the handler
+METRICS: MetricsRecorder = MetricsRecorder()
+
 
 #################
 ### FUNCTIONS ###
 #################
 
 
+def log_init_report() -> None:
+    """
+    Logs how long module imports and client creation took, once per container.
+    Later invocations are logged as warm starts.
+    """
+    global COLD_START
+
+    if not COLD_START:
+        logging.info("Warm start.")
+        return
+
+    COLD_START = False
+    report = " | ".join(f"{name} {milliseconds:.0f} ms" for name, milliseconds in INIT_TIMINGS.items())
+    logging.info(f"Cold start init report: {report}")
+
+
+def import_heavy_module(name: str):
+    """
+    Imports a heavy module on first use, so invocations that exit early never pay for it.
+    The first import's duration is logged and added to the init report.
+    Safe to call from worker threads, as imports are made under IMPORT_LOCK.
+    RETURNS: Imported module
+    """
+    with IMPORT_LOCK:
+        if name in sys.modules:
+            return importlib.import_module(name)
+
+        import_started = time.perf_counter()
+        module = importlib.import_module(name)
+        INIT_TIMINGS[f'import {name}'] = (time.perf_counter() - import_started) * 1000
+
+    logging.info(f"Imported {name} in {INIT_TIMINGS[f'import {name}']:.0f} ms.")
+    return module
+
+
 def send_sns_message(sns_client: BaseClient, topic_arn: str, subject: str, message: str) -> None:
     """
     Sends messages via AWS SNS.
@@ -32,29 +171,205 @@ def send_sns_message(sns_client: BaseClient, topic_arn: str, subject: str, messa
         logging.error(f"SNS message [{subject}] not sent: {ec}")
 
 
-def get_parameter_from_ssm(ssm_client: BaseClient, parameter_name: str) -> str:
+def get_parameters_from_ssm(ssm_client: BaseClient, parameter_names: list, cache_ttl: int = PARAMETER_CACHE_TTL) -> dict:
+    """
+    Gets parameters from AWS Parameter Store in batches of up to 10 per call.
+    Values are cached at module scope, so warm invocations within cache_ttl seconds make no calls.
+    RETURNS: dict of Parameter Names and Values, with a blank string for any parameter not found to allow graceful fail.
+    """
+    now = time.monotonic()
+    parameters = {
+        name: PARAMETER_CACHE[name][0]
+        for name in parameter_names
+        if name in PARAMETER_CACHE and PARAMETER_CACHE[name][1] > now
+        }
+    parameter_names_uncached = [name for name in parameter_names if name not in parameters]
+
+    if parameters:
+        logging.info(f"{len(parameters)} parameters found in cache.")
+
+    for index in range(0, len(parameter_names_uncached), 10):
+        batch = parameter_names_uncached[index:index + 10]
+
+        try:
+            logging.info(f"Attempting to get parameters {batch}...")
+            response = ssm_client.get_parameters(Names = batch)
+
+            for parameter in response['Parameters']:
+                parameters[parameter['Name']] = parameter['Value']
+                PARAMETER_CACHE[parameter['Name']] = (parameter['Value'], now + cache_ttl)
+
+            logging.info(f"{len(response['Parameters'])} parameters found.")
+
+            # Missing parameters are not cached, so they are picked up as soon as they are created
+            for name in response['InvalidParameters']:
+                logging.warning(f"Parameter {name} not found.")
+                parameters[name] = ""
+
+        except botocore.exceptions.ParamValidationError as epv:
+            logging.error(f"Error getting parameters {batch}: {epv}")
+            parameters.update({name: "" for name in batch})
+
+        except botocore.exceptions.ClientError as ec:
+            logging.error(f"Error getting parameters {batch}: {ec}")
+            parameters.update({name: "" for name in batch})
+
+    return parameters
+
+
+def get_job_arguments(argv: list, defaults: dict) -> dict:
+    """
+    Gets optional Glue job arguments passed as --name value pairs.
+    RETURNS: dict of argument values, using the defaults for any not supplied
+    """
+    arguments = dict(defaults)
+
+    for name in defaults:
+        flag = f'--{name}'
+
+        if flag in argv and argv.index(flag) + 1 < len(argv):
+            arguments[name] = argv[argv.index(flag) + 1]
+
+    return arguments
+
+
+def get_s3_last_modified(s3_client: BaseClient, bucket: str, key: str):
     """
-    Gets parameter from AWS Parameter Store.
-    RETURNS: Parameter, Value, or a blank string to allow graceful fail.
+    Gets the last modified time of an S3 object.
+    RETURNS: Timezone-aware datetime, or None if the object does not exist or cannot be read
     """
     try:
-        logging.info(f"Attempting to get parameter {parameter_name}...")
-        response = ssm_client.get_parameter(Name = parameter_name)
+        response = s3_client.head_object(Bucket = bucket, Key = key)
+        return response['LastModified']
 
-        logging.info("Parameter found.")
-        return response['Parameter']['Value']
+    except botocore.exceptions.ClientError as e:
+        if e.response['Error']['Code'] not in ('404', 'NoSuchKey'):
+            logging.warning(f"Unable to read {key} metadata: {e}")
+        return None
 
-    except ssm_client.exceptions.ParameterNotFound as pnf:
-        logging.warning(f"Parameter {parameter_name} not found: {pnf}")
-        return ""
 
-    except botocore.exceptions.ParamValidationError as epv:
-        logging.error(f"Error getting parameter {parameter_name}: {epv}")
-        return ""
+def list_s3_objects(s3_client: BaseClient, bucket: str, prefix: str, suffix: str) -> list:
+    """
+    Lists S3 objects under a prefix with boto3, so listing never needs awswrangler.
+    RETURNS: List of s3:// paths ending with the suffix
+    """
+    paginator = s3_client.get_paginator('list_objects_v2')
 
-    except botocore.exceptions.ClientError as ec:
-        logging.error(f"Error getting parameter {parameter_name}: {ec}")
-        return ""
+    return [
+        f"s3://{bucket}/{item['Key']}"
+        for page in paginator.paginate(Bucket = bucket, Prefix = prefix)
+        for item in page.get('Contents', [])
+        if item['Key'].endswith(suffix)
+        ]
+
+
+def delete_s3_prefix(s3_client: BaseClient, bucket: str, prefix: str) -> bool:
+    """
+    Deletes every object under an S3 prefix, like awswrangler's overwrite mode does before a dataset write.
+    RETURNS: True or False depending on outcome
+    """
+    paginator = s3_client.get_paginator('list_objects_v2')
+
+    try:
+        for page in paginator.paginate(Bucket = bucket, Prefix = prefix):
+            keys = [{'Key': item['Key']} for item in page.get('Contents', [])]
+
+            if keys:
+                s3_client.delete_objects(Bucket = bucket, Delete = {'Objects': keys, 'Quiet': True})
+
+        return True
+
+    except botocore.exceptions.ClientError as e:
+        logging.error(f"Unable to delete objects under {prefix}: {e}")
+        return False
+
+
+def put_silver_manifest(s3_client: BaseClient, bucket: str, data_source: str, name: str, manifest: dict) -> bool:
+    """
+    Uploads the manifest recording when a partitioned silver dataset was written and which partitions it holds.
+    Manifests sit outside the data prefix so they are never picked up as data objects.
+    RETURNS: True or False depending on outcome
+    """
+    key = f"_manifest/{data_source}/{name}.json"
+
+    try:
+        s3_client.put_object(
+            Body = json.dumps(manifest),
+            Bucket = bucket,
+            Key = key
+        )
+        logging.info(f"{name} silver manifest updated.")
+        return True
+
+    except botocore.exceptions.ClientError as e:
+        logging.warning(f"{name} silver manifest update failed: {e}")
+        return False
+
+
+def get_silver_watermark(s3_client: BaseClient, bucket: str, data_source: str, name: str) -> dict:
+    """
+    Gets the high watermark recording the latest watermark_column value written to a partitioned silver dataset.
+    RETURNS: Watermark dict, or an empty dict if there is no watermark or it cannot be read
+    """
+    key = f"_watermarks/{data_source}/{name}.json"
+
+    try:
+        response = s3_client.get_object(Bucket = bucket, Key = key)
+        return json.loads(response['Body'].read())
+
+    except s3_client.exceptions.NoSuchKey:
+        logging.info(f"No {name} silver watermark found.")
+        return {}
+
+    except (botocore.exceptions.ClientError, ValueError) as e:
+        logging.warning(f"{name} silver watermark could not be read: {e}")
+        return {}
+
+
+def put_silver_watermark(s3_client: BaseClient, bucket: str, data_source: str, name: str, watermark: dict) -> bool:
+    """
+    Uploads the high watermark for a partitioned silver dataset.
+    Watermarks sit outside the data prefix so they are never picked up as data objects.
+    RETURNS: True or False depending on outcome
+    """
+    key = f"_watermarks/{data_source}/{name}.json"
+
+    try:
+        s3_client.put_object(
+            Body = json.dumps(watermark),
+            Bucket = bucket,
+            Key = key
+        )
+        logging.info(f"{name} silver watermark updated to {watermark['watermark']}.")
+        return True
+
+    except botocore.exceptions.ClientError as e:
+        logging.warning(f"{name} silver watermark update failed: {e}")
+        return False
+
+
+def get_watermark_from(watermark: dict) -> datetime | None:
+    """
+    Gets the first row time an incremental run reads, which is the start of the watermark's month.
+    Whole months are rebuilt so each affected partition can be overwritten, and the watermark's own day is
+    always re-read as its statistics may have grown since the last run.
+    RETURNS: Naive datetime, or None if there is no watermark so the dataset is rebuilt in full
+    """
+    if not watermark.get('watermark'):
+        return None
+
+    return datetime.fromisoformat(watermark['watermark']).replace(day = 1, hour = 0, minute = 0, second = 0, microsecond = 0)
+
+
+def get_s3_path_from_argument(value: str, bucket: str) -> str:
+    """
+    Gets a full S3 path from an s3_object job argument, which may be an s3:// path or a key in the given bucket.
+    RETURNS: s3:// path
+    """
+    if value.startswith('s3://'):
+        return value
+
+    return f"s3://{bucket}/{value.lstrip('/')}"
 
 
 def get_objectname_from_s3_path(path: str) -> str:
@@ -78,15 +393,22 @@ def get_objectname_from_s3_path(path: str) -> str:
         return ""
 
 
-def get_data_from_s3_object(boto3_session: BaseClient, s3_object: str, name: str) -> pd.DataFrame:
+def get_data_from_s3_object(boto3_session: BaseClient, s3_object: str, name: str, columns: list = None) -> pd.DataFrame:
     """
-    Get data from S3 object.
+    Get data from S3 object, reading only the given columns so the others are never fetched or decoded.
     RETURNS: DataFrame (populated or empty)
     """
+    wr = import_heavy_module('awswrangler')
+    pd = import_heavy_module('pandas')
+
     try:
         logging.info(f"Attempting to read {name} data at {s3_object}...")
-        df = wr.s3.read_parquet(path = s3_object,
-                             boto3_session = boto3_session)
+
+        with METRICS.timer('read', name):
+            df = wr.s3.read_parquet(path = s3_object,
+                                 columns = columns,
+                                 boto3_session = boto3_session)
+
         return df
 
     except wr.exceptions.NoFilesFound as e:
@@ -98,76 +420,264 @@ def get_data_from_s3_object(boto3_session: BaseClient, s3_object: str, name: str
         return pd.DataFrame()
 
 
-
 def transform_data(object_name: str, df: pd.DataFrame) -> pd.DataFrame:
     """
-    Transforms DataFrame based on object name
+    Transforms DataFrame using the object's SILVER_TRANSFORMS entry.
+    Unneeded columns are already excluded by the Parquet read.
     RETURNS: transformed pandas DataFrame
     """
-    # posts transformations
-    if object_name == 'posts':
+    pd = import_heavy_module('pandas')
+
+    transform = SILVER_TRANSFORMS[object_name]
+
+    # Partition dates
+    for column in transform['date_parts']:
+        df[f'{column}_todate'] = pd.to_datetime(df[column])
+
+        df[f'{column}_year'] = df[f'{column}_todate'].dt.year.astype(SILVER_DATE_PART_TYPE)
+        df[f'{column}_month'] = df[f'{column}_todate'].dt.month.astype(SILVER_DATE_PART_TYPE)
+        df[f'{column}_day'] = df[f'{column}_todate'].dt.day.astype(SILVER_DATE_PART_TYPE)
+
+    # Amend string columns, such as swapping '&amp;' for '&'
+    for column, replacements in transform['replacements'].items():
+        for old, new in replacements:
+            df[column] = df[column].str.replace(old, new)
+
+    return df
+
+
+def transform_record_batch(object_name: str, batch: pa.RecordBatch) -> pa.RecordBatch:
+    """
+    Transforms an Arrow record batch using the object's SILVER_TRANSFORMS entry, with Arrow compute kernels.
+    Columns are derived in the same order and with the same types as transform_data.
+    RETURNS: transformed Arrow RecordBatch
+    """
+    pa = import_heavy_module('pyarrow')
+    pc = import_heavy_module('pyarrow.compute')
 
-        # Drop unneeded columns
-        df = df.drop(columns=['post_date_gmt', 'post_excerpt',
-            'comment_status', 'ping_status', 'post_name', 'to_ping',
-            'pinged', 'post_modified_gmt', 'post_content_filtered',
-            'guid', 'menu_order', 'post_mime_type', 'comment_count'])
+    transform = SILVER_TRANSFORMS[object_name]
+    columns = dict(zip(batch.schema.names, batch.columns))
 
-        # Partition dates
-        df['post_date_todate'] = pd.to_datetime(df['post_date'])
+    # Partition dates, parsing string columns like pd.to_datetime does
+    for column in transform['date_parts']:
+        todate = columns[column]
 
-        df['post_date_year'] = df['post_date_todate'].dt.year
-        df['post_date_month'] = df['post_date_todate'].dt.month
-        df['post_date_day'] = df['post_date_todate'].dt.day
+        if not pa.types.is_timestamp(todate.type):
+            todate = pc.cast(todate, pa.timestamp('ns'))
 
-        df['post_modified_todate'] = pd.to_datetime(df['post_modified'])
+        columns[f'{column}_todate'] = todate
+        columns[f'{column}_year'] = pc.year(todate).cast(SILVER_DATE_PART_TYPE)
+        columns[f'{column}_month'] = pc.month(todate).cast(SILVER_DATE_PART_TYPE)
+        columns[f'{column}_day'] = pc.day(todate).cast(SILVER_DATE_PART_TYPE)
 
-        df['post_modified_year'] = df['post_modified_todate'].dt.year
-        df['post_modified_month'] = df['post_modified_todate'].dt.month
-        df['post_modified_day'] = df['post_modified_todate'].dt.day
+    # Amend string columns, such as swapping '&amp;' for '&'
+    for column, replacements in transform['replacements'].items():
+        for old, new in replacements:
+            columns[column] = pc.replace_substring(columns[column], pattern = old, replacement = new)
 
-    # statistics_pages transformations
-    elif object_name == 'statistics_pages':
+    return pa.RecordBatch.from_arrays(list(columns.values()), names = list(columns))
 
-        # Partition dates
-        df['date_todate'] = pd.to_datetime(df['date'])
 
-        df['date_year'] = df['date_todate'].dt.year
-        df['date_month'] = df['date_todate'].dt.month
-        df['date_day'] = df['date_todate'].dt.day
+def convert_object_arrow(s3_client: BaseClient, object_name: str, s3_bucket_bronze: str, s3_key_bronze: str,
+                         s3_bucket_silver: str, s3_key_silver: str, partition_cols: list = None,
+                         database: str = None, table: str = None, session: BaseClient = None,
+                         watermark_from: datetime = None) -> tuple:
+    """
+    Converts a bronze Parquet object to silver through Arrow only, one record batch at a time.
+    Only the kept columns are decoded, and transformed batches go straight to the Parquet writer with no DataFrame.
+    With partition_cols, the batches are instead collected and written as a Hive-partitioned dataset.
+    With watermark_from, only rows from then on are transformed and only their partitions are overwritten.
+    RETURNS: Tuple of True or False depending on outcome, and the new watermark as an ISO string or a blank string
+    """
+    pa = import_heavy_module('pyarrow')
+    pc = import_heavy_module('pyarrow.compute')
+    pq = import_heavy_module('pyarrow.parquet')
 
-    # term_relationship transformations
-    elif object_name == 'term_relationship':
+    watermark_column = SILVER_TRANSFORMS[object_name]['watermark_column']
 
-        # Drop unneeded columns
-        df = df.drop(columns=['term_order'])
+    try:
+        logging.info(f"Attempting to read {object_name} data at s3://{s3_bucket_bronze}/{s3_key_bronze}...")
 
-    # term_taxonomy transformations
-    elif object_name == 'term_taxonomy':
+        with METRICS.timer('read', object_name):
+            body = s3_client.get_object(Bucket = s3_bucket_bronze, Key = s3_key_bronze)['Body'].read()
 
-        # Drop unneeded columns
-        df = df.drop(columns=['description', 'parent'])
+        METRICS.add('read', object_name, BytesIn = len(body))
 
-    # terms transformations
-    elif object_name == 'terms':
+    except botocore.exceptions.ClientError as e:
+        logging.error(f"{object_name} data S3 read failed: {e}")
+        return False, ""
+
+    parquet_file = pq.ParquetFile(pa.BufferReader(body))
+    batches = parquet_file.iter_batches(columns = SILVER_TRANSFORMS[object_name]['columns'])
+
+    # Drop rows before the watermark month ahead of any transform work
+    if watermark_from:
+        logging.info(f"Incremental run for {object_name} rows from {watermark_from.isoformat()}.")
+        batches = (
+            batch.filter(pc.greater_equal(batch[watermark_column], pa.scalar(watermark_from, type = batch[watermark_column].type)))
+            for batch in batches
+            )
 
-        # Drop unneeded columns
-        df = df.drop(columns=['term_group'])
+    batches = (transform_record_batch(object_name, batch) for batch in batches)
 
-        # Amend column to swap '&amp;' for '&'
-        df['name'] = df['name'].str.replace('&amp;', '&')
+    logging.info(f'Beginning {object_name} transformations...')
 
-    return df
+    if partition_cols:
+        arrow_table = pa.Table.from_batches(list(batches))
+        METRICS.add('convert', object_name, RowsOut = arrow_table.num_rows)
+        watermark = pc.max(arrow_table[watermark_column]).as_py() if watermark_column and arrow_table.num_rows else None
+
+        ok = put_s3_parquet_dataset_arrow(s3_client, arrow_table, object_name, s3_bucket_silver, s3_key_silver,
+                                          partition_cols, database, table, session,
+                                          'overwrite_partitions' if watermark_from else 'overwrite')
+        return ok, watermark.isoformat() if ok and watermark else ""
+
+    sink = pa.BufferOutputStream()
+    writer = None
+    rows = 0
+
+    for batch in batches:
+        if writer is None:
+            writer = pq.ParquetWriter(sink, batch.schema, **SILVER_PARQUET_OPTIONS)
 
+        writer.write_batch(batch)
+        rows += batch.num_rows
 
-def put_s3_parquet_object(df: pd.DataFrame, name: str, s3_object_silver: str, session: BaseClient) -> bool:
+    # Check table is populated
+    if writer is None or rows == 0:
+        logging.warning(f"{object_name} table is empty!")
+        return False, ""
+
+    writer.close()
+    logging.info(f'{object_name} table now has {len(writer.schema.names)} columns and {rows} rows.')
+    METRICS.add('convert', object_name, RowsOut = rows)
+
+    try:
+        logging.info(f"Attempting to put {object_name} data in s3://{s3_bucket_silver}/{s3_key_silver}...")
+        body = sink.getvalue().to_pybytes()
+
+        with METRICS.timer('write', object_name):
+            s3_client.put_object(Body = body, Bucket = s3_bucket_silver, Key = s3_key_silver)
+
+        METRICS.add('write', object_name, BytesOut = len(body))
+        logging.info(f"{object_name} data S3 upload successful.")
+        return True, ""
+
+    except botocore.exceptions.ClientError as e:
+        logging.error(f"{object_name} data S3 upload failed: {e}")
+        return False, ""
+
+
+def put_s3_parquet_dataset_arrow(s3_client: BaseClient, arrow_table: pa.Table, name: str, bucket: str, prefix: str,
+                                 partition_cols: list, database: str, table: str, session: BaseClient,
+                                 mode: str = 'overwrite') -> bool:
+    """
+    Uploads an Arrow table to S3 as a Hive-partitioned Parquet dataset and registers the table and its partitions
+    in the Glue Data Catalog.  The 'overwrite' mode replaces everything under the prefix, while 'overwrite_partitions'
+    only replaces the partitions present in the table.
+    Laid out like awswrangler's partitioned to_parquet, so either engine can rewrite the other's dataset.
+    RETURNS: True or False depending on outcome
+    """
+    pa = import_heavy_module('pyarrow')
+    pc = import_heavy_module('pyarrow.compute')
+    pq = import_heavy_module('pyarrow.parquet')
+    wr = import_heavy_module('awswrangler')
+
+    # Check table is populated
+    if arrow_table.num_rows == 0:
+        logging.warning(f"{name} table is empty!")
+        return False
+
+    logging.info(f'{name} table now has {arrow_table.num_columns} columns and {arrow_table.num_rows} rows.')
+
+    data_columns = [column for column in arrow_table.column_names if column not in partition_cols]
+    partitions = arrow_table.group_by(partition_cols).aggregate([]).to_pylist()
+    partitions_values = {}
+
+    if mode == 'overwrite' and not delete_s3_prefix(s3_client, bucket, prefix):
+        return False
+
+    try:
+        logging.info(f"Attempting to put {name} data in {len(partitions)} partitions under s3://{bucket}/{prefix}...")
+
+        for partition in partitions:
+            mask = pc.equal(arrow_table[partition_cols[0]], partition[partition_cols[0]])
+
+            for column in partition_cols[1:]:
+                mask = pc.and_(mask, pc.equal(arrow_table[column], partition[column]))
+
+            partition_prefix = prefix + "".join(f"{column}={partition[column]}/" for column in partition_cols)
+
+            if mode == 'overwrite_partitions' and not delete_s3_prefix(s3_client, bucket, partition_prefix):
+                return False
+
+            sink = pa.BufferOutputStream()
+            pq.write_table(arrow_table.filter(mask).select(data_columns), sink, **SILVER_PARQUET_OPTIONS)
+
+            body = sink.getvalue().to_pybytes()
+
+            with METRICS.timer('write', name):
+                s3_client.put_object(Body = body, Bucket = bucket, Key = f"{partition_prefix}{name}.parquet")
+
+            METRICS.add('write', name, BytesOut = len(body), Partitions = 1)
+            partitions_values[f"s3://{bucket}/{partition_prefix}"] = [str(partition[column]) for column in partition_cols]
+
+        catalog_start = time.perf_counter()
+        wr.catalog.create_parquet_table(
+            database = database,
+            table = table,
+            path = f"s3://{bucket}/{prefix}",
+            columns_types = {
+                column: 'timestamp' if pa.types.is_timestamp(arrow_table.schema.field(column).type)
+                else ATHENA_TYPES[str(arrow_table.schema.field(column).type)]
+                for column in data_columns
+                },
+            partitions_types = {column: ATHENA_TYPES[str(arrow_table.schema.field(column).type)] for column in partition_cols},
+            compression = 'snappy',
+            mode = 'overwrite' if mode == 'overwrite' else 'update',
+            boto3_session = session
+            )
+        wr.catalog.add_parquet_partitions(
+            database = database,
+            table = table,
+            partitions_values = partitions_values,
+            compression = 'snappy',
+            boto3_session = session
+            )
+        METRICS.add('catalog', name, Duration = (time.perf_counter() - catalog_start) * 1000)
+        logging.info(f"{name} data S3 upload successful.")
+        return True
+
+    except botocore.exceptions.ClientError as e:
+        logging.error(f"{name} data S3 upload failed: {e}")
+        return False
+
+
+def put_s3_parquet_object(df: pd.DataFrame, name: str, s3_object_silver: str, session: BaseClient,
+                          partition_cols: list = None, database: str = None, table: str = None,
+                          mode: str = 'overwrite') -> bool:
     """
     Uploads pandas DataFrame to S3 as Parquet.
+    With partition_cols, s3_object_silver is a prefix holding a Hive-partitioned dataset, and the table and its
+    partitions are registered in the Glue Data Catalog.  The 'overwrite' mode replaces the whole dataset,
+    while 'overwrite_partitions' only replaces the partitions present in the DataFrame.
     RETURNS: True or False depending on outcome
     """
+    wr = import_heavy_module('awswrangler')
+
     try:
         logging.info(f"Attempting to put {name} data in {s3_object_silver}...")
-        wr.s3.to_parquet(df = df, path = s3_object_silver, boto3_session = session)
+
+        with METRICS.timer('write', name):
+
+            if partition_cols:
+                wr.s3.to_parquet(df = df, path = s3_object_silver, dataset = True, mode = mode,
+                                 partition_cols = partition_cols, database = database, table = table,
+                                 compression = 'snappy', boto3_session = session)
+
+            else:
+                wr.s3.to_parquet(df = df, path = s3_object_silver, boto3_session = session)
+
         logging.info(f"{name} data S3 upload successful.")
         return True
 
@@ -176,6 +686,149 @@ def put_s3_parquet_object(df: pd.DataFrame, name: str, s3_object_silver: str, se
         return False
 
 
+def convert_object_pandas(session: BaseClient, object_name: str, s3_object_bronze: str, s3_object_silver: str,
+                          partition_cols: list = None, database: str = None, table: str = None,
+                          watermark_from: datetime = None) -> tuple:
+    """
+    Converts a bronze Parquet object to silver through pandas and awswrangler.
+    With watermark_from, only rows from then on are transformed and only their partitions are overwritten.
+    RETURNS: Tuple of True or False depending on outcome, and the new watermark as an ISO string or a blank string
+    """
+    pd = import_heavy_module('pandas')
+
+    watermark_column = SILVER_TRANSFORMS[object_name]['watermark_column']
+
+    # Get the kept columns from S3 Bronze object
+    logging.info(f"Attempting to read {object_name} data...")
+    df = get_data_from_s3_object(session, s3_object_bronze, object_name, SILVER_TRANSFORMS[object_name]['columns'])
+
+    # Drop rows before the watermark month ahead of any transform work
+    if watermark_from and not df.empty:
+        logging.info(f"Incremental run for {object_name} rows from {watermark_from.isoformat()}.")
+        df = df[pd.to_datetime(df[watermark_column]) >= pd.Timestamp(watermark_from)].reset_index(drop = True)
+
+    # Check DataFrame is populated
+    if df.empty:
+        logging.warning(f"{object_name} DataFrame is empty!")
+        return False, ""
+
+    logging.info(f'{object_name} DataFrame has {len(df.columns)} columns and {len(df)} rows.')
+
+    ##################
+    ### TRANSFORMS ###
+    ##################
+
+    logging.info(f'Beginning {object_name} transformations...')
+
+    with METRICS.timer('transform', object_name):
+        df = transform_data(object_name, df)
+
+    logging.info(f'{object_name} DataFrame now has {len(df.columns)} columns and {len(df)} rows.')
+    METRICS.add('convert', object_name, RowsOut = len(df))
+
+    watermark = pd.to_datetime(df[watermark_column]).max() if partition_cols and watermark_column else None
+
+    logging.info(f"Attempting {object_name} S3 Silver upload...")
+    ok = put_s3_parquet_object(df, object_name, s3_object_silver, session, partition_cols, database, table,
+                               'overwrite_partitions' if watermark_from else 'overwrite')
+
+    return ok, watermark.isoformat() if ok and watermark is not None else ""
+
+
+def convert_silver_object(s3_client: BaseClient, session: BaseClient, s3_object_bronze: str, s3_bucket_bronze: str,
+                          s3_bucket_silver: str, data_source: str, partitioned_objects: list, engine: str = 'pandas',
+                          force_full_rebuild: bool = False, full_refresh: bool = False) -> str:
+    """
+    Converts one bronze Parquet object into its silver object or partitioned dataset, then records its manifest and watermark.
+    Objects the bronze function has not rewritten since the last silver upload are skipped.
+    RETURNS: 'success', 'failure' or 'unchanged'
+    """
+    # Get filename from endpoint
+    object_name = get_objectname_from_s3_path(s3_object_bronze)
+
+    # If no name returned, record failure
+    if not object_name:
+        logging.warning(f"Unable to parse name from {s3_object_bronze}.")
+        return 'failure'
+
+    # Partitioned objects are written as datasets under their prefix, with a manifest marking each write
+    partition_cols = SILVER_TRANSFORMS.get(object_name, {}).get('partition_cols') if object_name in partitioned_objects else None
+
+    # Create S3 Bronze and Silver object keys
+    s3_key_bronze = s3_object_bronze.split(f's3://{s3_bucket_bronze}/', 1)[-1]
+    s3_key_silver = f'{data_source}/{object_name}/' if partition_cols else f'{data_source}/{object_name}/{object_name}.parquet'
+    s3_key_silver_written = f'_manifest/{data_source}/{object_name}.json' if partition_cols else s3_key_silver
+
+    # Skip objects the bronze function has not rewritten since the last silver upload
+    if not force_full_rebuild and not full_refresh:
+        bronze_last_modified = get_s3_last_modified(s3_client, s3_bucket_bronze, s3_key_bronze)
+        silver_last_modified = get_s3_last_modified(s3_client, s3_bucket_silver, s3_key_silver_written)
+
+        if bronze_last_modified and silver_last_modified and bronze_last_modified <= silver_last_modified:
+            logging.info(f"{object_name} bronze data unchanged since last silver upload.  Skipping...")
+            return 'unchanged'
+
+    # Check if object is mapped and bypass if not, before any data is read
+    if object_name not in SILVER_TRANSFORMS:
+        logging.warning(f'{object_name} is not currently mapped.  Skipping transform...')
+        return 'failure'
+
+    # Incremental runs start from the month of the last watermark written
+    watermark_from = None
+
+    if partition_cols and SILVER_TRANSFORMS[object_name]['watermark_column'] and not full_refresh:
+        watermark_from = get_watermark_from(get_silver_watermark(s3_client, s3_bucket_silver, data_source, object_name))
+
+    with METRICS.timer('convert', object_name):
+
+        if engine == 'arrow':
+            ok, watermark = convert_object_arrow(s3_client, object_name, s3_bucket_bronze, s3_key_bronze, s3_bucket_silver,
+                                                 s3_key_silver, partition_cols, data_source, f'silver-{object_name}', session,
+                                                 watermark_from)
+
+        else:
+            ok, watermark = convert_object_pandas(session, object_name, s3_object_bronze, f's3://{s3_bucket_silver}/{s3_key_silver}',
+                                                  partition_cols, data_source, f'silver-{object_name}', watermark_from)
+
+    if not ok:
+        logging.warning(f"{object_name} S3 Silver upload failed!")
+        return 'failure'
+
+    logging.info(f"{object_name} S3 Silver upload complete.")
+
+    if partition_cols:
+        put_silver_manifest(s3_client, s3_bucket_silver, data_source, object_name, {
+            'prefix': s3_key_silver,
+            'partition_cols': partition_cols,
+            'written_at': datetime.now(timezone.utc).isoformat()
+            })
+
+    # Record the watermark only once its partitions are in place
+    if watermark:
+        put_silver_watermark(s3_client, s3_bucket_silver, data_source, object_name, {
+            'column': SILVER_TRANSFORMS[object_name]['watermark_column'],
+            'watermark': watermark,
+            'updated_at': datetime.now(timezone.utc).isoformat()
+            })
+
+    return 'success'
+
+
+###############
+### CLIENTS ###
+###############
+
+# Created once per process, matching the Lambda functions
+clients_started = time.perf_counter()
+session = boto3.Session()
+client_s3 = session.client('s3')
+client_ssm = session.client('ssm')
+client_sns = session.client('sns')
+client_sts = session.client('sts')
+INIT_TIMINGS['clients'] = (time.perf_counter() - clients_started) * 1000
+COLD_START: bool = True
+
+
 #############
 ### START ###
 #############
@@ -196,16 +849,33 @@ def wordpress_api_silver_handler():
         force = True
         )
 
+    log_init_report()
+
 
     #################
     ### VARIABLES ###
     #################
 
-    # AWS sessions and clients
-    session = boto3.Session()
-    client_ssm = session.client('ssm')
-    client_sns = session.client('sns')
-    client_sts = session.client('sts')
+    # Optional Glue job arguments
+    job_arguments = get_job_arguments(sys.argv, {'force_full_rebuild': 'false', 's3_object': '', 'silver_engine': 'pandas',
+                                                 'partitioned_objects': 'statistics_pages', 'full_refresh': 'false'})
+
+    # Partitioning - comma-separated objects written as year/month Hive-partitioned datasets and registered in the
+    # Glue Data Catalog.  Only objects with partition_cols in SILVER_TRANSFORMS can be partitioned.
+    partitioned_objects: list = [name.strip() for name in job_arguments['partitioned_objects'].split(',') if name.strip()]
+
+    # Incremental runs - partitioned objects with a watermark_column only rebuild the months from their high watermark
+    # onwards.  full_refresh ignores the watermarks and rebuilds every object in full, such as for repairs.
+    full_refresh: bool = job_arguments['full_refresh'].lower() == 'true'
+
+    # Transform engine - 'pandas' (awswrangler) or 'arrow' (Arrow compute kernels, no pandas)
+    silver_engine: str = job_arguments['silver_engine']
+
+    # Event-driven mode - process only this bronze object, given as an s3:// path or key.  Blank sweeps every object.
+    s3_object_argument: str = job_arguments['s3_object']
+
+    # Change detection - rewrite every object even if its bronze object has not changed
+    force_full_rebuild: bool = job_arguments['force_full_rebuild'].lower() == 'true'
 
     # AWS Parameter Store Names
     parametername_s3bucket_bronze: str = '/s3/lakehouse/name/bronze'
@@ -220,6 +890,7 @@ def wordpress_api_silver_handler():
     object_count_all: int = 0
     object_count_failure: int = 0
     object_count_success: int = 0
+    object_count_unchanged: int = 0
 
 
     ##################
@@ -231,9 +902,14 @@ def wordpress_api_silver_handler():
     account_id = identity['Account']
     logging.info(f"Starting in AWS Account ID {account_id}")
 
-    # Get SNS topic from Parameter Store
-    logging.info("Getting SNS parameter...")
-    sns_topic = get_parameter_from_ssm(client_ssm, parametername_snstopic)
+    # Get every parameter from Parameter Store in one batch
+    logging.info("Getting Parameter Store parameters...")
+
+    with METRICS.timer('ssm'):
+        parameters = get_parameters_from_ssm(client_ssm, [parametername_snstopic, parametername_s3bucket_bronze, parametername_s3bucket_silver])
+
+    # Get SNS topic
+    sns_topic = parameters[parametername_snstopic]
 
     # Check an SNS topic has been returned.
     if not sns_topic:
@@ -241,9 +917,8 @@ def wordpress_api_silver_handler():
         logging.warning(message)
         raise ValueError(message)
 
-    # Get S3 bucket name from Parameter Store
-    logging.info("Getting S3 Bronze parameter...")
-    s3_bucket_bronze = get_parameter_from_ssm(client_ssm, parametername_s3bucket_bronze)
+    # Get S3 Bronze bucket name
+    s3_bucket_bronze = parameters[parametername_s3bucket_bronze]
 
     # Check an S3 bucket has been returned.
     if not s3_bucket_bronze:
@@ -254,9 +929,8 @@ def wordpress_api_silver_handler():
         send_sns_message(client_sns, sns_topic, subject, message)
         return
 
-    # Get S3 bucket name from Parameter Store
-    logging.info("Getting S3 Silver parameter...")
-    s3_bucket_silver = get_parameter_from_ssm(client_ssm, parametername_s3bucket_silver)
+    # Get S3 Silver bucket name
+    s3_bucket_silver = parameters[parametername_s3bucket_silver]
 
     # Check an S3 bucket has been returned.
     if not s3_bucket_silver:
@@ -267,11 +941,25 @@ def wordpress_api_silver_handler():
         send_sns_message(client_sns, sns_topic, subject, message)
         return
 
-    # Capture all s3 paths in s3_objects and total them in endpoint_total
-    s3_objects_bronze = wr.s3.list_objects(path = f's3://{s3_bucket_bronze}/{data_source}',
-                                        suffix = 'parquet',
-                                        boto3_session = session
-                                        )
+    if not s3_object_argument:
+        # Capture all s3 paths in s3_objects and total them in endpoint_total
+        with METRICS.timer('list'):
+            s3_objects_bronze = list_s3_objects(client_s3, s3_bucket_bronze, data_source, 'parquet')
+
+    else:
+        # Process only the named object, with no listing
+        s3_object_bronze = get_s3_path_from_argument(s3_object_argument, s3_bucket_bronze)
+        logging.info(f"Event-driven run for {s3_object_bronze}.")
+
+        if not s3_object_bronze.startswith(f's3://{s3_bucket_bronze}/{data_source}/') or not s3_object_bronze.endswith('.parquet'):
+            message = f"{function_name}: {s3_object_bronze} is not a {data_source} bronze object."
+            subject = f"{function_name}: Failed"
+
+            logging.warning(message)
+            send_sns_message(client_sns, sns_topic, subject, message)
+            return
+
+        s3_objects_bronze = [s3_object_bronze]
 
     # Count the endpoints and log the total
     object_total = len(s3_objects_bronze)
@@ -282,74 +970,39 @@ def wordpress_api_silver_handler():
     ### OBJECTS ###
     ###############
 
+    convert_start = time.perf_counter()
+
     for s3_object_bronze in s3_objects_bronze:
 
         # Increment & log counter
         object_count_all += 1
         logging.info(f"Processing object {object_count_all} of {object_total}.")
 
-        # Get filename from endpoint
-        object_name = get_objectname_from_s3_path(s3_object_bronze)
-
-        # If no name returned, record failure & end current iteration
-        if not object_name:
-            logging.warning(f"Unable to parse name from {s3_object_bronze}.")
-            endpoint_count_failure += 1
-            continue
-
-        # Get data from S3 Bronze object
-        logging.info(f"Attempting to read {object_name} data...")
-        df = get_data_from_s3_object(session, s3_object_bronze, object_name)
-
-        # Check DataFrame is populated
-        if df.empty:
-            logging.warning(f"{object_name} DataFrame is empty!")
-            endpoint_count_failure += 1
-            continue
-
-        logging.info(f'{object_name} DataFrame has {len(df.columns)} columns and {len(df)} rows.')
-
-        ##################
-        ### TRANSFORMS ###
-        ##################
-
-        logging.info(f'Beginning {object_name} transformations...')
-
-
-        # Check if object is mapped and bypass if not.
-        if object_name not in {
-            'posts', 'statistics_pages', 'term_relationship', 'term_taxonomy', 'terms'
-            }:
-            logging.warning(f'{object_name} is not currently mapped.  Skipping transform...')
-            object_count_failure += 1
-            continue
-
-        df = transform_data(object_name, df)
-
-        logging.info(f'{object_name} DataFrame now has {len(df.columns)} columns and {len(df)} rows.')
-
-        # Create S3 Silver object path
-        s3_object_silver = f's3://{s3_bucket_silver}/{data_source}/{object_name}/{object_name}.parquet'
-
-        logging.info(f"Attempting {object_name} S3 Silver upload...")
-        ok = put_s3_parquet_object(df, object_name, s3_object_silver, session)
+        outcome = convert_silver_object(client_s3, session, s3_object_bronze, s3_bucket_bronze, s3_bucket_silver, data_source,
+                                        partitioned_objects, silver_engine, force_full_rebuild, full_refresh)
 
         # Iteration summaries
-        if not ok:
-            logging.warning("S3 Silver upload failed!")
-            object_count_failure += 1
+        if outcome == 'unchanged':
+            object_count_unchanged += 1
 
-        else:
-            logging.info("S3 Silver upload complete.")
+        elif outcome == 'success':
             object_count_success += 1
 
+        else:
+            object_count_failure += 1
+
 
     ###############
     ### SUMMARY ###
     ###############
 
     logging.info("WordPress API Silver process complete: " \
-                 f"{object_count_success} Successful | {object_count_failure} Failed.")
+                 f"{object_count_success} Successful | {object_count_failure} Failed | {object_count_unchanged} Unchanged.")
+
+    # Emit this run's metrics as EMF records
+    METRICS.add('convert', Duration = (time.perf_counter() - convert_start) * 1000, ObjectsSucceeded = object_count_success,
+                ObjectsFailed = object_count_failure, ObjectsUnchanged = object_count_unchanged)
+    METRICS.flush(function_name)
 
     # Send SNS notification if any failures found
     if object_count_failure > 0:
@@ -360,4 +1013,5 @@ def wordpress_api_silver_handler():
         send_sns_message(client_sns, sns_topic, subject, message)
 
 # Run Silver handler
-wordpress_api_silver_handler()
+if __name__ == '__main__':
+    wordpress_api_silver_handler()
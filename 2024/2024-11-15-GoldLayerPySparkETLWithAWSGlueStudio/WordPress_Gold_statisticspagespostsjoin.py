@@ -1,34 +1,242 @@
 import sys
-from awsglue.transforms import *
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+import boto3
 from awsglue.utils import getResolvedOptions
 from pyspark.context import SparkContext
 from awsglue.context import GlueContext
+from awsglue.dynamicframe import DynamicFrame
 from awsglue.job import Job
-import re
+from pyspark.sql import functions as F
 
-args = getResolvedOptions(sys.argv, ['JOB_NAME'])
+# Optional job arguments are only resolved when supplied
+optional_args = [name for name in ['statistics_from_month', 'full_refresh'] if f'--{name}' in sys.argv]
+args = getResolvedOptions(sys.argv, ['JOB_NAME'] + optional_args)
 sc = SparkContext()
 glueContext = GlueContext(sc)
 spark = glueContext.spark_session
 job = Job(glueContext)
 job.init(args['JOB_NAME'], args)
+logger = glueContext.get_logger()
+client_s3 = boto3.client('s3')
 
-# Script generated for node S3 Silver statistics_pages
-S3Silverstatistics_pages_node1724058965930 = glueContext.create_dynamic_frame.from_options(format_options={}, connection_type="s3", format="parquet", connection_options={"paths": ["s3://data-lakehouse-silver/wordpress_api/statistics_pages/"], "recurse": True}, transformation_ctx="S3Silverstatistics_pages_node1724058965930")
+# Silver inputs, gold output and the gold state manifest
+silver_bucket = "data-lakehouse-silver"
+silver_posts_prefix = "wordpress_api/posts/"
+silver_statistics_pages_prefix = "wordpress_api/statistics_pages/"
+gold_bucket = "data-lakehouse-gold"
+gold_prefix = "wordpress_api/statistics_postname/"
 
-# Script generated for node S3 Silver posts
-S3Silverposts_node1724058915313 = glueContext.create_dynamic_frame.from_options(format_options={}, connection_type="s3", format="parquet", connection_options={"paths": ["s3://data-lakehouse-silver/wordpress_api/posts/"], "recurse": True}, transformation_ctx="S3Silverposts_node1724058915313")
+# Gold rollups for dashboards.  The monthly and daily rollups share the gold partitions and are rebuilt with them,
+# while the all-time rollup is re-aggregated from the small monthly rollup on every change.
+gold_rollup_prefixes = {
+    "statistics_post_monthly": "wordpress_api/statistics_post_monthly/",
+    "statistics_site_daily": "wordpress_api/statistics_site_daily/",
+    "statistics_post_alltime": "wordpress_api/statistics_post_alltime/"
+    }
+gold_partition_keys = ["statistics_date_year", "statistics_date_month"]
+gold_manifest_key = "_manifest/wordpress_api/statistics_postname.json"
 
-# Script generated for node Join
-Join_node1724059035756 = Join.apply(frame1=S3Silverposts_node1724058915313, frame2=S3Silverstatistics_pages_node1724058965930, keys1=["ID"], keys2=["id"], transformation_ctx="Join_node1724059035756")
+# CloudWatch embedded metric format (EMF) metrics, recorded with the shared lakehouse_metrics module.  It is deployed
+# alongside this script with --extra-py-files, and local runs import it from its folder in this repo.
+METRICS_FOLDER = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'InProgress', 'WordPressLakehouseMetrics')
 
-# Script generated for node Change Schema
-ChangeSchema_node1724059144495 = ApplyMapping.apply(frame=Join_node1724059035756, mappings=[("ID", "bigint", "post_ID", "long"), ("post_title", "string", "post_title", "string"), ("post_status", "string", "post_status", "string"), ("post_parent", "bigint", "post_parent", "long"), ("post_type", "string", "post_type", "string"), ("post_date_todate", "timestamp", "post_date", "timestamp"), ("post_date_year", "bigint", "post_date_year", "long"), ("post_date_month", "bigint", "post_date_month", "long"), ("post_date_day", "bigint", "post_date_day", "long"), ("page_id", "bigint", "statistics_id", "long"), ("date", "timestamp", "statistics_date", "timestamp"), ("count", "bigint", "statistics_count", "long"), ("date_year", "bigint", "statistics_date_year", "long"), ("date_month", "bigint", "statistics_date_month", "long"), ("date_day", "bigint", "statistics_date_day", "long")], transformation_ctx="ChangeSchema_node1724059144495")
+if os.path.isdir(METRICS_FOLDER):
+    sys.path.append(METRICS_FOLDER)
 
-# Script generated for node Filter
-Filter_node1724060106174 = Filter.apply(frame=ChangeSchema_node1724059144495, f=lambda row: (bool(re.match("post", row["post_type"]))), transformation_ctx="Filter_node1724060106174")
+from lakehouse_metrics import MetricsRecorder
 
-# Script generated for node S3 Gold
-S3Gold_node1724060393283 = glueContext.write_dynamic_frame.from_options(frame=Filter_node1724060106174, connection_type="s3", format="glueparquet", connection_options={"path": "s3://data-lakehouse-gold/wordpress_api/statistics_postname/", "partitionKeys": []}, format_options={"compression": "snappy"}, transformation_ctx="S3Gold_node1724060393283")
 
-job.commit()
\ No newline at end of file
+def get_partition_versions(bucket, prefix):
+    """
+    Gets a version for each Hive partition folder under an S3 prefix, from its object keys and ETags.
+    RETURNS: dict of partition folders such as date_year=2024/date_month=5 and SHA-256 hex digests
+    """
+    objects = {}
+
+    for page in client_s3.get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=prefix):
+        for item in page.get('Contents', []):
+            partition = item['Key'][len(prefix):].rpartition('/')[0]
+            objects.setdefault(partition, []).append(f"{item['Key']}:{item['ETag']}")
+
+    return {partition: hashlib.sha256("|".join(sorted(keys)).encode()).hexdigest() for partition, keys in objects.items()}
+
+
+def get_partition_values(partition):
+    """
+    Gets the year and month of a date_year=YYYY/date_month=M partition folder.
+    RETURNS: Tuple of year and month integers
+    """
+    values = dict(part.split('=', 1) for part in partition.split('/'))
+    return int(values['date_year']), int(values['date_month'])
+
+
+def get_gold_manifest():
+    """
+    Gets the manifest recording the silver versions the gold dataset was last built from.
+    RETURNS: Manifest dict, or an empty dict if there is no manifest
+    """
+    try:
+        return json.loads(client_s3.get_object(Bucket=gold_bucket, Key=gold_manifest_key)['Body'].read())
+
+    except client_s3.exceptions.NoSuchKey:
+        return {}
+
+
+def write_gold(dataframe, prefix, partition_keys, transformation_ctx):
+    """
+    Writes a Spark DataFrame to a gold prefix as snappy glueparquet.
+    """
+    glueContext.write_dynamic_frame.from_options(frame=DynamicFrame.fromDF(dataframe, glueContext, transformation_ctx), connection_type="s3", format="glueparquet", connection_options={"path": f"s3://{gold_bucket}/{prefix}", "partitionKeys": partition_keys}, format_options={"compression": "snappy"}, transformation_ctx=transformation_ctx)
+
+
+# Metrics for the current run, flushed at the end of the job
+METRICS = MetricsRecorder()
+
+
+# Change detection - compare silver versions with those the gold dataset was last built from.
+# A posts change affects every gold row, so it rebuilds everything.  Otherwise only changed statistics months are rebuilt.
+plan_start = time.perf_counter()
+manifest = get_gold_manifest()
+posts_version = hashlib.sha256(json.dumps(get_partition_versions(silver_bucket, silver_posts_prefix), sort_keys=True).encode()).hexdigest()
+statistics_pages_all_versions = get_partition_versions(silver_bucket, silver_statistics_pages_prefix)
+statistics_pages_versions = {
+    partition: version
+    for partition, version in statistics_pages_all_versions.items()
+    if partition.startswith('date_year=')
+    }
+
+# Silver written unpartitioned has no month folders, so it is versioned as one table under a blank partition name.
+# Any change to it, or a switch to or from it, rebuilds everything with no predicate.
+if not statistics_pages_versions and statistics_pages_all_versions:
+    statistics_pages_versions = {'': hashlib.sha256(json.dumps(statistics_pages_all_versions, sort_keys=True).encode()).hexdigest()}
+
+statistics_pages_whole_table = '' in statistics_pages_versions or '' in manifest.get('statistics_pages_versions', {})
+full_rebuild = (
+    args.get('full_refresh', 'false').lower() == 'true' or not manifest or manifest.get('posts_version') != posts_version
+    or (statistics_pages_whole_table and ('statistics_from_month' in args or manifest.get('statistics_pages_versions') != statistics_pages_versions))
+    )
+
+if full_rebuild:
+    rebuild_partitions = sorted(statistics_pages_versions)
+    removed_partitions = []
+
+else:
+    rebuild_partitions = sorted(
+        partition for partition, version in statistics_pages_versions.items()
+        if manifest.get('statistics_pages_versions', {}).get(partition) != version
+        )
+    removed_partitions = sorted(set(manifest.get('statistics_pages_versions', {})) - set(statistics_pages_versions))
+
+# --statistics_from_month YYYY-MM also rebuilds every month from then onwards, such as after a gold repair
+if 'statistics_from_month' in args:
+    from_month = tuple(int(part) for part in args['statistics_from_month'].split('-'))
+    rebuild_partitions = sorted(set(rebuild_partitions) | {
+        partition for partition in statistics_pages_versions if partition and get_partition_values(partition) >= from_month
+        })
+
+# A full rebuild with no silver statistics to read would only empty gold, so gold and its manifest are left as they are
+skip_full_rebuild = full_rebuild and not rebuild_partitions
+
+if skip_full_rebuild:
+    logger.warn("No silver statistics_pages found for a full rebuild.  Leaving gold unchanged.")
+
+logger.info(f"Gold {'full' if full_rebuild else 'incremental'} build of {len(rebuild_partitions)} months, removing {len(removed_partitions)}.")
+METRICS.add('plan', Duration=(time.perf_counter() - plan_start) * 1000, PartitionsRebuilt=len(rebuild_partitions), PartitionsRemoved=len(removed_partitions))
+
+# Partition pruning for statistics_pages, which silver writes partitioned by date_year and date_month.
+# A full rebuild reads every row with no predicate, so no month is missed and the read plan stays small.
+statistics_pages_predicate = "" if full_rebuild else " or ".join(
+    f"(date_year = {year} and date_month = {month})"
+    for year, month in (get_partition_values(partition) for partition in rebuild_partitions)
+    )
+
+# Change Schema mappings as (source column, source type, gold column, gold type)
+# posts ID is renamed to post_ID when read, as Spark resolves names case-insensitively and would clash it with statistics id
+mappings = [("post_ID", "bigint", "post_ID", "long"), ("post_title", "string", "post_title", "string"), ("post_status", "string", "post_status", "string"), ("post_parent", "bigint", "post_parent", "long"), ("post_type", "string", "post_type", "string"), ("post_date_todate", "timestamp", "post_date", "timestamp"), ("post_date_year", "bigint", "post_date_year", "long"), ("post_date_month", "bigint", "post_date_month", "long"), ("post_date_day", "bigint", "post_date_day", "long"), ("page_id", "bigint", "statistics_id", "long"), ("date", "timestamp", "statistics_date", "timestamp"), ("count", "bigint", "statistics_count", "long"), ("date_year", "bigint", "statistics_date_year", "long"), ("date_month", "bigint", "statistics_date_month", "long"), ("date_day", "bigint", "statistics_date_day", "long")]
+posts_columns = ["ID"] + [source for source, _, _, _ in mappings[1:9]]
+statistics_pages_columns = [source for source, _, _, _ in mappings[9:]] + ["id"]
+
+# Gold months being rebuilt or whose silver month has gone are purged first, so the writes below replace them.
+# A full rebuild purges the whole dataset, so earlier runs are never appended to.
+if not skip_full_rebuild:
+    with METRICS.timer('purge'):
+        for prefix in [gold_prefix, gold_rollup_prefixes["statistics_post_monthly"], gold_rollup_prefixes["statistics_site_daily"]]:
+            if full_rebuild:
+                glueContext.purge_s3_path(f"s3://{gold_bucket}/{prefix}", {"retentionPeriod": 0})
+
+            else:
+                for year, month in (get_partition_values(partition) for partition in rebuild_partitions + removed_partitions):
+                    glueContext.purge_s3_path(f"s3://{gold_bucket}/{prefix}statistics_date_year={year}/statistics_date_month={month}/", {"retentionPeriod": 0})
+
+if rebuild_partitions:
+
+    # Silver tables are read as Spark DataFrames, so the column selections and filters below are pushed into the Parquet
+    # scans.  Only mapped columns are read, and partitions and row groups that cannot match are skipped.
+
+    # Script generated for node S3 Silver statistics_pages
+    S3Silverstatistics_pages_node1724058965930 = glueContext.create_data_frame.from_catalog(database="wordpress_api", table_name="silver-statistics_pages", transformation_ctx="S3Silverstatistics_pages_node1724058965930").select(*statistics_pages_columns)
+
+    if statistics_pages_predicate:
+        S3Silverstatistics_pages_node1724058965930 = S3Silverstatistics_pages_node1724058965930.where(statistics_pages_predicate)
+
+    # Script generated for node S3 Silver posts
+    S3Silverposts_node1724058915313 = glueContext.create_data_frame.from_catalog(database="wordpress_api", table_name="silver-posts", transformation_ctx="S3Silverposts_node1724058915313").select(*posts_columns).withColumnRenamed("ID", "post_ID")
+
+    # Script generated for node Filter
+    # Columnar equivalent of re.match("post", post_type), applied to posts before the join
+    Filter_node1724060106174 = S3Silverposts_node1724058915313.where(F.col("post_type").startswith("post"))
+
+    # Script generated for node Join
+    # posts is a small dimension, so it is broadcast to every executor and statistics_pages is joined without a shuffle
+    Join_node1724059035756 = S3Silverstatistics_pages_node1724058965930.join(F.broadcast(Filter_node1724060106174), Filter_node1724060106174["post_ID"] == S3Silverstatistics_pages_node1724058965930["id"], "inner")
+
+    # Script generated for node Change Schema
+    # Cached as the gold table and both partitioned rollups are built from it
+    ChangeSchema_node1724059144495 = Join_node1724059035756.select(*[F.col(source).cast(target_type).alias(target) for source, _, target, target_type in mappings]).cache()
+
+    # Script generated for node S3 Gold
+    # Spark is lazy, so this write's timing includes the silver reads and the join
+    with METRICS.timer('write', 'statistics_postname'):
+        write_gold(ChangeSchema_node1724059144495, gold_prefix, gold_partition_keys, "S3Gold_node1724060393283")
+
+    METRICS.add('write', 'statistics_postname', RowsOut=ChangeSchema_node1724059144495.count())
+
+    # Per-post monthly totals
+    with METRICS.timer('write', 'statistics_post_monthly'):
+        write_gold(ChangeSchema_node1724059144495.groupBy("post_ID", "post_title", "post_type", *gold_partition_keys).agg(F.sum("statistics_count").alias("statistics_count"), F.countDistinct("statistics_date").alias("statistics_days")), gold_rollup_prefixes["statistics_post_monthly"], gold_partition_keys, "S3GoldPostMonthly")
+
+    # Site-wide daily totals
+    with METRICS.timer('write', 'statistics_site_daily'):
+        write_gold(ChangeSchema_node1724059144495.groupBy("statistics_date", "statistics_date_day", *gold_partition_keys).agg(F.sum("statistics_count").alias("statistics_count"), F.countDistinct("post_ID").alias("post_count")), gold_rollup_prefixes["statistics_site_daily"], gold_partition_keys, "S3GoldSiteDaily")
+
+    ChangeSchema_node1724059144495.unpersist()
+
+# Per-post all-time totals, re-aggregated from the monthly rollup whenever any month changed
+if rebuild_partitions or removed_partitions:
+    glueContext.purge_s3_path(f"s3://{gold_bucket}/{gold_rollup_prefixes['statistics_post_alltime']}", {"retentionPeriod": 0})
+
+    if client_s3.list_objects_v2(Bucket=gold_bucket, Prefix=gold_rollup_prefixes["statistics_post_monthly"], MaxKeys=1).get('KeyCount', 0):
+        post_monthly = spark.read.parquet(f"s3://{gold_bucket}/{gold_rollup_prefixes['statistics_post_monthly']}")
+
+        with METRICS.timer('write', 'statistics_post_alltime'):
+            write_gold(post_monthly.groupBy("post_ID", "post_title", "post_type").agg(F.sum("statistics_count").alias("statistics_count"), F.sum("statistics_days").alias("statistics_days"), F.count(F.lit(1)).alias("statistics_months")), gold_rollup_prefixes["statistics_post_alltime"], [], "S3GoldPostAlltime")
+
+# Record the silver versions only once the gold write has succeeded
+if not skip_full_rebuild:
+    client_s3.put_object(Bucket=gold_bucket, Key=gold_manifest_key, Body=json.dumps({
+        'posts_version': posts_version,
+        'statistics_pages_versions': statistics_pages_versions,
+        'rebuilt_partitions': rebuild_partitions,
+        'full_rebuild': full_rebuild,
+        'written_at': datetime.now(timezone.utc).isoformat()
+        }))
+
+# Emit this run's metrics as EMF records
+METRICS.add('gold', Duration=(time.perf_counter() - plan_start) * 1000)
+METRICS.flush(args['JOB_NAME'])
+
+job.commit()
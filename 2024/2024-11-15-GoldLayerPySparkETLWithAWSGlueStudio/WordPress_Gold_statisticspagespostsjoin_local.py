@@ -0,0 +1,618 @@
+# pylint: disable=W1203
+"""
+Function joins silver statistics_pages and posts data into the gold statistics_postname dataset without Spark.
+Runs the same Join, ApplyMapping, Filter and snappy Parquet steps as WordPress_Gold_statisticspagespostsjoin.py
+with PyArrow, as an AWS Lambda function or from the command line.
+"""
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+import boto3
+import botocore
+from botocore.client import BaseClient
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs
+
+# Glue job ApplyMapping as (source column, gold column, gold type), in output column order
+GOLD_MAPPINGS: list = [
+    ('ID', 'post_ID', pa.int64()),
+    ('post_title', 'post_title', pa.string()),
+    ('post_status', 'post_status', pa.string()),
+    ('post_parent', 'post_parent', pa.int64()),
+    ('post_type', 'post_type', pa.string()),
+    ('post_date_todate', 'post_date', pa.timestamp('ms')),
+    ('post_date_year', 'post_date_year', pa.int64()),
+    ('post_date_month', 'post_date_month', pa.int64()),
+    ('post_date_day', 'post_date_day', pa.int64()),
+    ('page_id', 'statistics_id', pa.int64()),
+    ('date', 'statistics_date', pa.timestamp('ms')),
+    ('count', 'statistics_count', pa.int64()),
+    ('date_year', 'statistics_date_year', pa.int64()),
+    ('date_month', 'statistics_date_month', pa.int64()),
+    ('date_day', 'statistics_date_day', pa.int64())
+    ]
+
+# Glue job join keys and Filter, which keeps rows whose post_type matches "post" from its start
+GOLD_JOIN_KEYS: tuple = ('ID', 'id')
+GOLD_POST_TYPE_PREFIX: str = 'post'
+
+# Glue job output partitioning, so date-bounded queries only read the months they need
+GOLD_PARTITION_COLS: list = ['statistics_date_year', 'statistics_date_month']
+
+# Silver input and gold output locations of the Glue job
+GOLD_SILVER_POSTS: str = 's3://{bucket}/wordpress_api/posts/'
+GOLD_SILVER_STATISTICS_PAGES: str = 's3://{bucket}/wordpress_api/statistics_pages/'
+GOLD_OUTPUT: str = 's3://{bucket}/wordpress_api/statistics_postname/'
+
+# Gold rollups for dashboards, as folders under the gold wordpress_api prefix.  The monthly and daily rollups share the
+# gold partitions and are rebuilt with them, while the all-time rollup is re-aggregated from the monthly rollup.
+GOLD_ROLLUPS_ROOT: str = 's3://{bucket}/wordpress_api/'
+
+# Gold state manifest for incremental builds, kept apart from the Glue job's own manifest
+GOLD_MANIFEST: str = 's3://{bucket}/_manifest/wordpress_api/statistics_postname_local.json'
+
+# Parameter Store values cached across warm invocations, keyed by name as (value, expiry) tuples
+PARAMETER_CACHE: dict = {}
+PARAMETER_CACHE_TTL: int = int(os.environ.get('PARAMETER_CACHE_TTL', 300))
+
+# CloudWatch embedded metric format (EMF) metrics, recorded with the shared lakehouse_metrics module.  It is deployed
+# alongside this file, and local runs import it from its folder in this repo.
+METRICS_FOLDER: str = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'InProgress', 'WordPressLakehouseMetrics')
+
+if os.path.isdir(METRICS_FOLDER):
+    sys.path.append(METRICS_FOLDER)
+
+from lakehouse_metrics import MetricsRecorder
+
+# Metrics for the current run, recorded by any function and flushed by the handler
+METRICS: MetricsRecorder = MetricsRecorder()
+
+
+#################
+### FUNCTIONS ###
+#################
+
+
+def send_sns_message(sns_client: BaseClient, topic_arn: str, subject: str, message: str) -> None:
+    """
+    Sends messages via AWS SNS.
+    """
+    try:
+        logging.info(f"Attempting to send SNS message: {subject}...")
+        sns_client.publish(
+            TopicArn = topic_arn,
+            Message = message,
+            Subject = subject
+            )
+        logging.info(f"SNS message [{subject}] sent.")
+
+    except botocore.exceptions.ClientError as ec:
+        logging.error(f"SNS message [{subject}] not sent: {ec}")
+
+
+def get_parameters_from_ssm(ssm_client: BaseClient, parameter_names: list, cache_ttl: int = PARAMETER_CACHE_TTL) -> dict:
+    """
+    Gets parameters from AWS Parameter Store in batches of up to 10 per call.
+    Values are cached at module scope, so warm invocations within cache_ttl seconds make no calls.
+    RETURNS: dict of Parameter Names and Values, with a blank string for any parameter not found to allow graceful fail.
+    """
+    now = time.monotonic()
+    parameters = {
+        name: PARAMETER_CACHE[name][0]
+        for name in parameter_names
+        if name in PARAMETER_CACHE and PARAMETER_CACHE[name][1] > now
+        }
+    parameter_names_uncached = [name for name in parameter_names if name not in parameters]
+
+    if parameters:
+        logging.info(f"{len(parameters)} parameters found in cache.")
+
+    for index in range(0, len(parameter_names_uncached), 10):
+        batch = parameter_names_uncached[index:index + 10]
+
+        try:
+            logging.info(f"Attempting to get parameters {batch}...")
+            response = ssm_client.get_parameters(Names = batch)
+
+            for parameter in response['Parameters']:
+                parameters[parameter['Name']] = parameter['Value']
+                PARAMETER_CACHE[parameter['Name']] = (parameter['Value'], now + cache_ttl)
+
+            logging.info(f"{len(response['Parameters'])} parameters found.")
+
+            # Missing parameters are not cached, so they are picked up as soon as they are created
+            for name in response['InvalidParameters']:
+                logging.warning(f"Parameter {name} not found.")
+                parameters[name] = ""
+
+        except botocore.exceptions.ParamValidationError as epv:
+            logging.error(f"Error getting parameters {batch}: {epv}")
+            parameters.update({name: "" for name in batch})
+
+        except botocore.exceptions.ClientError as ec:
+            logging.error(f"Error getting parameters {batch}: {ec}")
+            parameters.update({name: "" for name in batch})
+
+    return parameters
+
+
+def get_filesystem_path(path: str) -> tuple:
+    """
+    Gets the Arrow filesystem for an S3 URI or a local path, which may be relative.
+    RETURNS: Tuple of Arrow FileSystem and the path within it
+    """
+    if '://' not in path:
+        path = os.path.abspath(path)
+
+    return pyarrow.fs.FileSystem.from_uri(path)
+
+
+def get_partition_versions(path: str) -> dict:
+    """
+    Gets a version for each Hive partition folder under a dataset path, from its file paths, sizes and modified times.
+    RETURNS: dict of partition folders such as date_year=2024/date_month=5 and SHA-256 hex digests
+    """
+    filesystem, base_path = get_filesystem_path(path)
+    base_path = base_path.rstrip('/')
+    files = {}
+
+    for info in filesystem.get_file_info(pyarrow.fs.FileSelector(base_path, allow_not_found = True, recursive = True)):
+        if info.type == pyarrow.fs.FileType.File:
+            partition = info.path[len(base_path) + 1:].rpartition('/')[0]
+            files.setdefault(partition, []).append(f"{info.path}:{info.size}:{info.mtime_ns}")
+
+    return {partition: hashlib.sha256("|".join(sorted(paths)).encode()).hexdigest() for partition, paths in files.items()}
+
+
+def get_partition_values(partition: str) -> tuple:
+    """
+    Gets the year and month of a date_year=YYYY/date_month=M partition folder.
+    RETURNS: Tuple of year and month integers
+    """
+    values = dict(part.split('=', 1) for part in partition.split('/'))
+    return int(values['date_year']), int(values['date_month'])
+
+
+def get_statistics_pages_filter(partitions: list) -> ds.Expression | None:
+    """
+    Gets the statistics_pages filter for a list of date_year/date_month partition folders, matching the Glue job's predicate.
+    RETURNS: Dataset expression, or None to read every partition
+    """
+    if partitions is None:
+        return None
+
+    row_filter = ds.scalar(False)
+
+    for year, month in (get_partition_values(partition) for partition in partitions):
+        row_filter = row_filter | ((ds.field('date_year') == year) & (ds.field('date_month') == month))
+
+    return row_filter
+
+
+def get_gold_manifest(path: str) -> dict:
+    """
+    Gets the manifest recording the silver versions the gold dataset was last built from.
+    RETURNS: Manifest dict, or an empty dict if there is no manifest or it cannot be read
+    """
+    try:
+        filesystem, manifest_path = get_filesystem_path(path)
+
+        with filesystem.open_input_stream(manifest_path) as stream:
+            return json.loads(stream.read())
+
+    except FileNotFoundError:
+        logging.info("No gold manifest found.")
+        return {}
+
+    except (OSError, ValueError) as e:
+        logging.warning(f"Gold manifest could not be read: {e}")
+        return {}
+
+
+def put_gold_manifest(path: str, manifest: dict) -> bool:
+    """
+    Uploads the manifest recording the silver versions the gold dataset was last built from.
+    RETURNS: True or False depending on outcome
+    """
+    try:
+        filesystem, manifest_path = get_filesystem_path(path)
+        filesystem.create_dir(manifest_path.rpartition('/')[0], recursive = True)
+
+        with filesystem.open_output_stream(manifest_path) as stream:
+            stream.write(json.dumps(manifest).encode())
+
+        logging.info("Gold manifest updated.")
+        return True
+
+    except OSError as e:
+        logging.warning(f"Gold manifest update failed: {e}")
+        return False
+
+
+def read_silver_table(path: str, columns: list, row_filter: ds.Expression = None) -> pa.Table:
+    """
+    Reads the given columns of a silver dataset from S3 or a local path.
+    Hive partition folders such as date_year=2024/date_month=1 become columns, like the Glue catalog read.
+    The filter is pushed into the scan, so partitions and row groups whose statistics cannot match are skipped.
+    RETURNS: Arrow Table
+    """
+    name = path.rstrip('/').rsplit('/', 1)[-1]
+    logging.info(f"Attempting to read {columns} from {path} where {row_filter}...")
+
+    with METRICS.timer('read', name):
+        table = ds.dataset(path, format = 'parquet', partitioning = 'hive').to_table(columns = columns, filter = row_filter)
+
+    METRICS.add('read', name, RowsIn = table.num_rows)
+    logging.info(f"{table.num_rows} rows read from {path}.")
+    return table
+
+
+def join_statistics_posts(posts: pa.Table, statistics_pages: pa.Table) -> pa.Table:
+    """
+    Applies the Glue job's Join and ApplyMapping steps.  The post_type Filter is applied when posts are read.
+    The hash table is built on the right-hand input, so posts goes there as the small side, like a broadcast join.
+    RETURNS: Arrow Table with the gold statistics_postname columns, sorted for stable output
+    """
+    joined = statistics_pages.join(posts, keys = GOLD_JOIN_KEYS[1], right_keys = GOLD_JOIN_KEYS[0], join_type = 'inner',
+                                   coalesce_keys = False)
+
+    gold = pa.table({
+        target: joined[source].cast(target_type)
+        for source, target, target_type in GOLD_MAPPINGS
+        })
+
+    return gold.sort_by([('post_ID', 'ascending'), ('statistics_date', 'ascending'), ('statistics_id', 'ascending')])
+
+
+def build_post_monthly(gold: pa.Table) -> pa.Table:
+    """
+    Aggregates gold rows into per-post monthly totals.
+    RETURNS: Arrow Table of post, month, total count and days with statistics
+    """
+    keys = ['post_ID', 'post_title', 'post_type'] + GOLD_PARTITION_COLS
+    rollup = gold.group_by(keys).aggregate([('statistics_count', 'sum'), ('statistics_date', 'count_distinct')])
+
+    return pa.table({
+        **{key: rollup[key] for key in keys},
+        'statistics_count': rollup['statistics_count_sum'],
+        'statistics_days': rollup['statistics_date_count_distinct']
+        })
+
+
+def build_site_daily(gold: pa.Table) -> pa.Table:
+    """
+    Aggregates gold rows into site-wide daily totals.
+    RETURNS: Arrow Table of date, total count and posts with statistics
+    """
+    keys = ['statistics_date', 'statistics_date_day'] + GOLD_PARTITION_COLS
+    rollup = gold.group_by(keys).aggregate([('statistics_count', 'sum'), ('post_ID', 'count_distinct')])
+
+    return pa.table({
+        **{key: rollup[key] for key in keys},
+        'statistics_count': rollup['statistics_count_sum'],
+        'post_count': rollup['post_ID_count_distinct']
+        })
+
+
+def build_post_alltime(post_monthly: pa.Table) -> pa.Table:
+    """
+    Aggregates per-post monthly totals into per-post all-time totals.
+    RETURNS: Arrow Table of post, total count, days and months with statistics
+    """
+    keys = ['post_ID', 'post_title', 'post_type']
+    rollup = post_monthly.group_by(keys).aggregate([
+        ('statistics_count', 'sum'), ('statistics_days', 'sum'), ('statistics_count', 'count')
+        ])
+
+    return pa.table({
+        **{key: rollup[key] for key in keys},
+        'statistics_count': rollup['statistics_count_sum'],
+        'statistics_days': rollup['statistics_days_sum'],
+        'statistics_months': rollup['statistics_count_count']
+        })
+
+
+def put_gold_table(table: pa.Table, path: str, name: str, purge_partitions: list = None,
+                   partition_cols: list = GOLD_PARTITION_COLS) -> bool:
+    """
+    Writes a gold dataset at an S3 or local path as snappy Parquet files, Hive-partitioned by partition_cols.
+    Without purge_partitions the whole dataset is replaced.  With them, only those silver date_year/date_month
+    partitions' gold folders are emptied first, and other gold partitions are left as they are.
+    RETURNS: True or False depending on outcome
+    """
+    try:
+        filesystem, base_path = get_filesystem_path(path)
+        base_path = base_path.rstrip('/')
+        filesystem.create_dir(base_path, recursive = True)
+
+        if purge_partitions is None:
+            filesystem.delete_dir_contents(base_path, missing_dir_ok = True)
+
+        else:
+            for year, month in (get_partition_values(partition) for partition in purge_partitions):
+                filesystem.delete_dir_contents(f"{base_path}/{GOLD_PARTITION_COLS[0]}={year}/{GOLD_PARTITION_COLS[1]}={month}",
+                                               missing_dir_ok = True)
+
+        logging.info(f"Attempting to put {table.num_rows} {name} rows in {path}...")
+        write_start = time.perf_counter()
+        ds.write_dataset(
+            table,
+            base_path,
+            filesystem = filesystem,
+            format = 'parquet',
+            partitioning = partition_cols or None,
+            partitioning_flavor = 'hive' if partition_cols else None,
+            basename_template = f"{name}-{{i}}.parquet",
+            existing_data_behavior = 'overwrite_or_ignore',
+            file_options = ds.ParquetFileFormat().make_write_options(
+                compression = 'snappy', coerce_timestamps = 'ms', allow_truncated_timestamps = False)
+            )
+        METRICS.add('write', name, Duration = (time.perf_counter() - write_start) * 1000, RowsOut = table.num_rows)
+        logging.info(f"{name} data upload successful.")
+        return True
+
+    except (OSError, pa.ArrowException) as e:
+        logging.error(f"{name} data upload failed: {e}")
+        return False
+
+
+def run_gold(silver_posts: str, silver_statistics_pages: str, gold_output: str, statistics_from_month: str = '',
+             gold_manifest: str = '', full_refresh: bool = False, gold_rollups_root: str = '') -> int:
+    """
+    Builds the gold statistics_postname dataset from silver posts and statistics_pages, and its rollups under
+    gold_rollups_root unless that is blank.
+    With a gold manifest, only statistics months whose silver partitions changed since the last build are rebuilt,
+    unless posts changed, which rebuilds everything.  statistics_from_month also rebuilds every month from then on.
+    Only mapped columns are read, and the post_type Filter and month selection are pushed into the scans.
+    RETURNS: Number of gold rows written, or -1 upon failure
+    """
+    started = time.perf_counter()
+
+    # Change detection - compare silver versions with those the gold dataset was last built from
+    manifest = get_gold_manifest(gold_manifest) if gold_manifest else {}
+    posts_version = hashlib.sha256(json.dumps(get_partition_versions(silver_posts), sort_keys = True).encode()).hexdigest()
+    statistics_pages_all_versions = get_partition_versions(silver_statistics_pages)
+    statistics_pages_versions = {
+        partition: version
+        for partition, version in statistics_pages_all_versions.items()
+        if partition.startswith('date_year=')
+        }
+
+    # Silver written unpartitioned has no month folders, so it is versioned as one table under a blank partition name.
+    # Any change to it, or a switch to or from it, rebuilds everything with no filter.
+    if not statistics_pages_versions and statistics_pages_all_versions:
+        statistics_pages_versions = {'': hashlib.sha256(json.dumps(statistics_pages_all_versions, sort_keys = True).encode()).hexdigest()}
+
+    statistics_pages_whole_table = '' in statistics_pages_versions or '' in manifest.get('statistics_pages_versions', {})
+    full_rebuild = (
+        full_refresh or not manifest or manifest.get('posts_version') != posts_version
+        or (statistics_pages_whole_table and (bool(statistics_from_month)
+                                              or manifest.get('statistics_pages_versions') != statistics_pages_versions))
+        )
+
+    if full_rebuild:
+        rebuild_partitions = sorted(statistics_pages_versions)
+        removed_partitions = []
+
+    else:
+        rebuild_partitions = sorted(
+            partition for partition, version in statistics_pages_versions.items()
+            if manifest.get('statistics_pages_versions', {}).get(partition) != version
+            )
+        removed_partitions = sorted(set(manifest.get('statistics_pages_versions', {})) - set(statistics_pages_versions))
+
+    if statistics_from_month:
+        from_month = tuple(int(part) for part in statistics_from_month.split('-'))
+        rebuild_partitions = sorted(set(rebuild_partitions) | {
+            partition for partition in statistics_pages_versions if partition and get_partition_values(partition) >= from_month
+            })
+
+    # A full rebuild with no silver statistics to read would only empty gold, so gold and its manifest are left as they are
+    if full_rebuild and not rebuild_partitions:
+        logging.warning("No silver statistics_pages found for a full rebuild.  Leaving gold unchanged.")
+        return 0
+
+    logging.info(f"Gold {'full' if full_rebuild else 'incremental'} build of {len(rebuild_partitions)} months, removing {len(removed_partitions)}.")
+    METRICS.add('plan', Duration = (time.perf_counter() - started) * 1000, PartitionsRebuilt = len(rebuild_partitions),
+                PartitionsRemoved = len(removed_partitions))
+
+    gold = pa.table({target: pa.array([], target_type) for _, target, target_type in GOLD_MAPPINGS})
+
+    if rebuild_partitions:
+        # The Filter is the columnar equivalent of the Glue job's re.match on post_type
+        posts = read_silver_table(silver_posts, sorted({source for source, _, _ in GOLD_MAPPINGS[:9]} | {GOLD_JOIN_KEYS[0]}),
+                                  pc.starts_with(ds.field('post_type'), GOLD_POST_TYPE_PREFIX))
+        statistics_pages = read_silver_table(silver_statistics_pages, sorted({source for source, _, _ in GOLD_MAPPINGS[9:]} | {GOLD_JOIN_KEYS[1]}),
+                                             None if full_rebuild else get_statistics_pages_filter(rebuild_partitions))
+
+        with METRICS.timer('join', 'statistics_postname'):
+            gold = join_statistics_posts(posts, statistics_pages)
+
+        logging.info(f"Join produced {gold.num_rows} rows in {time.perf_counter() - started:.2f} s.")
+
+    purge_partitions = None if full_rebuild else rebuild_partitions + removed_partitions
+
+    if not put_gold_table(gold, gold_output, 'statistics_postname', purge_partitions):
+        return -1
+
+    # Rollups from the same join output, with the all-time totals re-aggregated from every month of the monthly rollup
+    if gold_rollups_root and (rebuild_partitions or removed_partitions):
+        post_monthly_path = f"{gold_rollups_root.rstrip('/')}/statistics_post_monthly/"
+
+        with METRICS.timer('rollup'):
+
+            if not (put_gold_table(build_post_monthly(gold), post_monthly_path, 'statistics_post_monthly', purge_partitions)
+                    and put_gold_table(build_site_daily(gold), f"{gold_rollups_root.rstrip('/')}/statistics_site_daily/",
+                                       'statistics_site_daily', purge_partitions)):
+                return -1
+
+            post_monthly = read_silver_table(post_monthly_path, None)
+
+            if not put_gold_table(build_post_alltime(post_monthly), f"{gold_rollups_root.rstrip('/')}/statistics_post_alltime/",
+                                  'statistics_post_alltime', None, []):
+                return -1
+
+    # Record the silver versions only once the gold write has succeeded
+    if gold_manifest:
+        put_gold_manifest(gold_manifest, {
+            'posts_version': posts_version,
+            'statistics_pages_versions': statistics_pages_versions,
+            'rebuilt_partitions': rebuild_partitions,
+            'full_rebuild': full_rebuild,
+            'written_at': datetime.now(timezone.utc).isoformat()
+            })
+
+    logging.info(f"Gold statistics_postname complete in {time.perf_counter() - started:.2f} s.")
+    METRICS.add('gold', Duration = (time.perf_counter() - started) * 1000, RowsOut = gold.num_rows)
+    return gold.num_rows
+
+
+###############
+### CLIENTS ###
+###############
+
+# Created once per container and reused by warm invocations.  Command line runs on local paths need no clients, so
+# they still start when no AWS region is configured.
+session = boto3.Session()
+
+try:
+    client_ssm = session.client('ssm')
+    client_sns = session.client('sns')
+
+except botocore.exceptions.NoRegionError:
+    logging.warning("No AWS region configured.  Parameter Store and SNS clients not created.")
+    client_ssm = client_sns = None
+
+
+#############
+### START ###
+#############
+
+def lambda_handler(event, context):
+    """
+    Main handler for AWS Lambda service.
+    """
+
+    ###############
+    ### LOGGING ###
+    ###############
+
+    logging.basicConfig(
+        level = logging.INFO,
+        format = "%(asctime)s [%(levelname)s]: %(message)s",
+        datefmt = "%Y-%m-%d %H:%M:%S",
+        force = True
+        )
+
+
+    #################
+    ### VARIABLES ###
+    #################
+
+    # AWS Parameter Store Names
+    parametername_s3bucket_silver: str = '/s3/lakehouse/name/silver'
+    parametername_s3bucket_gold: str = '/s3/lakehouse/name/gold'
+    parametername_snstopic: str = '/sns/data/lakehouse/gold'
+
+    # Lambda name for messages
+    data_source: str = 'wordpress_api'
+    function_name: str = f'data_{data_source}_gold'
+
+    # Rebuilds - YYYY-MM month to rebuild statistics from, matching the Glue job's --statistics_from_month, and
+    # full_refresh to rebuild everything.  Otherwise only changed months are rebuilt.
+    statistics_from_month: str = event.get('statistics_from_month', '')
+    full_refresh: bool = bool(event.get('full_refresh', False))
+
+
+    ##################
+    ### PARAMETERS ###
+    ##################
+
+    with METRICS.timer('ssm'):
+        parameters = get_parameters_from_ssm(client_ssm, [parametername_snstopic, parametername_s3bucket_silver, parametername_s3bucket_gold])
+
+    # Get SNS topic
+    sns_topic = parameters[parametername_snstopic]
+
+    # Check an SNS topic has been returned.
+    if not sns_topic:
+        message = "No SNS topic returned."
+        logging.warning(message)
+        raise ValueError(message)
+
+    # Get S3 bucket names
+    s3_bucket_silver = parameters[parametername_s3bucket_silver]
+    s3_bucket_gold = parameters[parametername_s3bucket_gold]
+
+    # Check S3 buckets have been returned.
+    if not s3_bucket_silver or not s3_bucket_gold:
+        message = f"{function_name}: No S3 Silver or Gold bucket returned."
+        subject = f"{function_name}: Failed"
+
+        logging.warning(message)
+        send_sns_message(client_sns, sns_topic, subject, message)
+        return
+
+
+    ##############
+    ### OBJECT ###
+    ##############
+
+    rows = run_gold(GOLD_SILVER_POSTS.format(bucket = s3_bucket_silver),
+                    GOLD_SILVER_STATISTICS_PAGES.format(bucket = s3_bucket_silver),
+                    GOLD_OUTPUT.format(bucket = s3_bucket_gold),
+                    statistics_from_month,
+                    GOLD_MANIFEST.format(bucket = s3_bucket_gold),
+                    full_refresh,
+                    GOLD_ROLLUPS_ROOT.format(bucket = s3_bucket_gold))
+
+
+    ###############
+    ### SUMMARY ###
+    ###############
+
+    # Emit this run's metrics as EMF records
+    METRICS.flush(function_name)
+
+    # Send SNS notification upon failure
+    if rows < 0:
+        message = f"{function_name} failed.  Please check logs."
+        subject = f"{function_name}: Failed"
+
+        logging.warning(message)
+        send_sns_message(client_sns, sns_topic, subject, message)
+
+
+if __name__ == '__main__':
+
+    logging.basicConfig(
+        level = logging.INFO,
+        format = "%(asctime)s [%(levelname)s]: %(message)s",
+        datefmt = "%Y-%m-%d %H:%M:%S"
+        )
+
+    # Defaults match the Glue job's buckets.  Local folder paths can be given instead of S3 URIs.
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    parser.add_argument('--silver-posts', default = GOLD_SILVER_POSTS.format(bucket = 'data-lakehouse-silver'))
+    parser.add_argument('--silver-statistics-pages', default = GOLD_SILVER_STATISTICS_PAGES.format(bucket = 'data-lakehouse-silver'))
+    parser.add_argument('--gold-output', default = GOLD_OUTPUT.format(bucket = 'data-lakehouse-gold'))
+    parser.add_argument('--gold-manifest', default = GOLD_MANIFEST.format(bucket = 'data-lakehouse-gold'),
+                        help = 'gold state manifest for incremental builds, blank to always rebuild in full')
+    parser.add_argument('--statistics-from-month', default = '', help = 'YYYY-MM month to rebuild statistics from')
+    parser.add_argument('--gold-rollups-root', default = GOLD_ROLLUPS_ROOT.format(bucket = 'data-lakehouse-gold'),
+                        help = 'folder holding the rollup datasets, blank to skip rollups')
+    parser.add_argument('--full-refresh', action = 'store_true')
+    args = parser.parse_args()
+
+    rows = run_gold(args.silver_posts, args.silver_statistics_pages, args.gold_output, args.statistics_from_month,
+                    args.gold_manifest, args.full_refresh, args.gold_rollups_root)
+    METRICS.flush('data_wordpress_api_gold')
+    raise SystemExit(0 if rows >= 0 else 1)
@@ -0,0 +1,111 @@
+# pylint: disable=W1203
+"""
+Benchmarks the local PyArrow gold statistics_postname job against the Glue PySpark job, end to end.
+The Glue job is started and polled until it finishes, and the local job runs against the same silver data.
+Both outputs are then compared.
+
+Usage: python benchmark_gold.py --repeat 3
+"""
+import argparse
+import logging
+import time
+import boto3
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+import WordPress_Gold_statisticspagespostsjoin_local as gold_local
+
+
+#################
+### FUNCTIONS ###
+#################
+
+
+def run_glue_job(glue_client, job_name: str, poll_seconds: int = 10) -> dict:
+    """
+    Starts a Glue job run and waits for it to finish.
+    RETURNS: dict of end-to-end seconds, Glue's billed execution seconds and the final run state
+    """
+    started = time.perf_counter()
+    run_id = glue_client.start_job_run(JobName = job_name)['JobRunId']
+    logging.info(f"Started {job_name} run {run_id}.")
+
+    while True:
+        job_run = glue_client.get_job_run(JobName = job_name, RunId = run_id)['JobRun']
+
+        if job_run['JobRunState'] in ('SUCCEEDED', 'FAILED', 'STOPPED', 'TIMEOUT', 'ERROR'):
+            return {
+                'wall': time.perf_counter() - started,
+                'execution': job_run.get('ExecutionTime', 0),
+                'state': job_run['JobRunState']
+                }
+
+        time.sleep(poll_seconds)
+
+
+def run_local_job(silver_posts: str, silver_statistics_pages: str, gold_output: str) -> dict:
+    """
+    Runs the local gold job once in this process.
+    RETURNS: dict of end-to-end seconds and rows written
+    """
+    started = time.perf_counter()
+    rows = gold_local.run_gold(silver_posts, silver_statistics_pages, gold_output)
+    return {'wall': time.perf_counter() - started, 'rows': rows}
+
+
+def read_gold_rows(path: str) -> pa.Table:
+    """
+    Reads a gold dataset as distinct rows in the local job's column types, sorted on every column.
+    Glue appends on each run, so duplicates from earlier runs are dropped before comparing.
+    RETURNS: Arrow Table
+    """
+    table = ds.dataset(path, format = 'parquet', partitioning = 'hive').to_table()
+    table = pa.table({target: table[target].cast(target_type) for _, target, target_type in gold_local.GOLD_MAPPINGS})
+    table = table.group_by(table.column_names).aggregate([])
+    return table.sort_by([(column, 'ascending') for column in table.column_names])
+
+
+#############
+### START ###
+#############
+
+if __name__ == '__main__':
+
+    logging.basicConfig(
+        level = logging.INFO,
+        format = "%(asctime)s [%(levelname)s]: %(message)s",
+        datefmt = "%Y-%m-%d %H:%M:%S"
+        )
+
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    parser.add_argument('--glue-job', default = 'WordPress_Gold_statisticspagespostsjoin')
+    parser.add_argument('--silver-bucket', default = 'data-lakehouse-silver')
+    parser.add_argument('--gold-bucket', default = 'data-lakehouse-gold')
+    parser.add_argument('--local-output-prefix', default = 'wordpress_api/statistics_postname_local_benchmark/',
+                        help = 'gold bucket prefix for the local output, kept apart from the Glue output')
+    parser.add_argument('--repeat', type = int, default = 3)
+    parser.add_argument('--skip-glue', action = 'store_true', help = 'only time the local job')
+    args = parser.parse_args()
+
+    silver_posts = gold_local.GOLD_SILVER_POSTS.format(bucket = args.silver_bucket)
+    silver_statistics_pages = gold_local.GOLD_SILVER_STATISTICS_PAGES.format(bucket = args.silver_bucket)
+    glue_output = gold_local.GOLD_OUTPUT.format(bucket = args.gold_bucket)
+    local_output = f"s3://{args.gold_bucket}/{args.local_output_prefix}"
+
+    local_runs = [run_local_job(silver_posts, silver_statistics_pages, local_output) for _ in range(args.repeat)]
+    local_best = min(run['wall'] for run in local_runs)
+    local_walls = ", ".join(f"{run['wall']:.2f}" for run in local_runs)
+    print(f"local  best {local_best:8.2f} s | runs {local_walls} | rows {local_runs[-1]['rows']}")
+
+    if not args.skip_glue:
+        glue_client = boto3.client('glue')
+        glue_runs = [run_glue_job(glue_client, args.glue_job) for _ in range(args.repeat)]
+        glue_best = min(run['wall'] for run in glue_runs)
+        glue_walls = ", ".join(f"{run['wall']:.2f}" for run in glue_runs)
+        glue_executions = ", ".join(str(run['execution']) for run in glue_runs)
+        print(f"glue   best {glue_best:8.2f} s | runs {glue_walls} | execution {glue_executions} s | "
+              f"states {[run['state'] for run in glue_runs]}")
+        print(f"local speedup {glue_best / local_best:.1f}x")
+
+        match = read_gold_rows(glue_output).equals(read_gold_rows(local_output))
+        print(f"outputs match: {match}")
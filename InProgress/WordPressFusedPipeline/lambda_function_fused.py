@@ -0,0 +1,416 @@
+"""
+Function gets data from WordPress API and writes the raw, bronze and silver objects in one pass.
+Each endpoint is fetched once and kept in memory, so bronze and silver never read the layer below back from S3.
+The raw, bronze and silver objects and manifests match the layered functions', which can still run afterwards.
+As in the silver job, silver manifests and watermarks are only written for partitioned objects, and single silver objects
+are change-checked by their LastModified time.
+"""
+import logging
+import os
+import hashlib
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+import botocore
+
+# The layered functions' modules.  A Lambda deployment package holds them alongside this file, and local runs
+# import them from their dated folders in this repo.
+REPO_ROOT: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LAYER_FOLDERS: list = [
+    '2024/2024-03-27-WordPressBronzeDataOrchestrationWithAWS',
+    '2024/2024-08-12-SilverLayerPythonETLWithTheAWSGlueETLJobScriptEditor'
+    ]
+
+for folder in LAYER_FOLDERS:
+    if os.path.isdir(os.path.join(REPO_ROOT, folder)):
+        sys.path.append(os.path.join(REPO_ROOT, folder))
+
+import lambda_function_raw as raw
+import lambda_function_bronze as bronze
+import wordpress_api_etl_silver as silver
+
+
+#################
+### FUNCTIONS ###
+#################
+
+
+def put_raw_object(s3_client, bucket: str, data_source: str, name: str, api_endpoint: str, response, api_json_string: str,
+                   sha256: str, manifest: dict) -> bool:
+    """
+    Uploads API records' JSON string to S3 Raw, like the raw function's buffered mode, and updates the endpoint manifest.
+    Part objects left over from a paginated raw run are removed.
+    RETURNS: True or False depending on outcome
+    """
+    key = f"{data_source}/{name}/{name}.json"
+
+    if not raw.put_s3_object(s3_client, bucket, data_source, name, api_json_string, 'json'):
+        return False
+
+    if manifest.get('parts'):
+        raw.delete_stale_s3_objects(s3_client, bucket, f"{data_source}/{name}/", {key})
+
+    return raw.put_endpoint_manifest(s3_client, bucket, data_source, name,
+                                     raw.build_endpoint_manifest(manifest, response, api_endpoint, key, sha256,
+                                                                 sha256 != manifest.get('sha256', '')))
+
+
+def put_bronze_object(s3_client, bucket_raw: str, bucket_bronze: str, data_source: str, name: str, table) -> bool:
+    """
+    Uploads an Arrow table to S3 Bronze as Parquet, and records the raw source version it was built from.
+    The raw object is listed for its ETag, so the bronze function sees the object as already converted.
+    RETURNS: True or False depending on outcome
+    """
+    key = f'{data_source}/{name}/{name}.parquet'
+
+    if not bronze.put_s3_parquet_table(s3_client, table, name, bucket_bronze, key):
+        return False
+
+    s3_objects_raw = bronze.list_s3_objects(s3_client, bucket_raw, f'{data_source}/{name}/', 'json')
+
+    return bronze.put_bronze_manifest(s3_client, bucket_bronze, data_source, name, {
+        'key': key,
+        'source_keys': sorted(s3_objects_raw),
+        'source_version': bronze.get_source_version(s3_objects_raw, sorted(s3_objects_raw)),
+        'written_at': datetime.now(timezone.utc).isoformat()
+        })
+
+
+def put_silver_object(s3_client, session, bucket_silver: str, data_source: str, name: str, table, partition_cols: list,
+                      engine: str = 'arrow') -> bool:
+    """
+    Transforms a bronze Arrow table with the silver SILVER_TRANSFORMS entry and uploads it to S3 Silver.
+    Timestamps are first cast to milliseconds, as bronze Parquet stores them, so silver sees the same types it reads
+    from S3.  The 'arrow' engine uses transform_record_batch, the 'pandas' engine transform_data.
+    Partitioned objects are always rewritten in full, with their manifest and watermark updated for later incremental runs.
+    RETURNS: True or False depending on outcome
+    """
+    pa = silver.import_heavy_module('pyarrow')
+    pc = silver.import_heavy_module('pyarrow.compute')
+    pq = silver.import_heavy_module('pyarrow.parquet')
+
+    transform = silver.SILVER_TRANSFORMS[name]
+    table = table.select(transform['columns'] or table.column_names)
+    table = table.cast(pa.schema([
+        field.with_type(pa.timestamp('ms')) if pa.types.is_timestamp(field.type) else field for field in table.schema
+        ]))
+
+    prefix = f'{data_source}/{name}/'
+    key = prefix if partition_cols else f'{prefix}{name}.parquet'
+
+    if engine == 'pandas':
+        df = silver.transform_data(name, table.to_pandas())
+        ok = silver.put_s3_parquet_object(df, name, f's3://{bucket_silver}/{key}', session, partition_cols, data_source,
+                                          f'silver-{name}')
+        silver_table = pa.Table.from_pandas(df, preserve_index = False) if ok and partition_cols else None
+
+    else:
+        silver_table = pa.Table.from_batches([silver.transform_record_batch(name, batch) for batch in table.to_batches()])
+
+        if partition_cols:
+            ok = silver.put_s3_parquet_dataset_arrow(s3_client, silver_table, name, bucket_silver, prefix, partition_cols,
+                                                     data_source, f'silver-{name}', session)
+
+        else:
+            sink = pa.BufferOutputStream()
+            pq.write_table(silver_table, sink, **silver.SILVER_PARQUET_OPTIONS)
+
+            try:
+                logging.info(f"Attempting to put {name} data in s3://{bucket_silver}/{key}...")
+                s3_client.put_object(Body = sink.getvalue().to_pybytes(), Bucket = bucket_silver, Key = key)
+                ok = True
+
+            except botocore.exceptions.ClientError as e:
+                logging.error(f"{name} data S3 upload failed: {e}")
+                ok = False
+
+    if not ok or not partition_cols:
+        return ok
+
+    silver.put_silver_manifest(s3_client, bucket_silver, data_source, name, {
+        'prefix': prefix,
+        'partition_cols': partition_cols,
+        'written_at': datetime.now(timezone.utc).isoformat()
+        })
+
+    # Record the watermark only once its partitions are in place
+    if transform['watermark_column'] and silver_table.num_rows:
+        watermark = pc.max(silver_table[transform['watermark_column']]).as_py()
+        silver.put_silver_watermark(s3_client, bucket_silver, data_source, name, {
+            'column': transform['watermark_column'],
+            'watermark': watermark.isoformat(),
+            'updated_at': datetime.now(timezone.utc).isoformat()
+            })
+
+    return True
+
+
+def fuse_endpoint(requests_session, s3_client, buckets: dict, data_source: str, api_endpoint: str, api_call_timeout: int,
+                  partitioned_objects: list, use_manifest: bool = True, engine: str = 'arrow') -> str:
+    """
+    Gets data from a single WordPress API endpoint and writes its raw, bronze and silver objects from memory.
+    The raw manifest makes the request conditional, so an endpoint WordPress reports as unchanged does no work.
+    WordPress rarely sends validators, so a body matching the manifest's SHA-256 only refreshes the manifest,
+    as the raw function's buffered mode does.
+    Safe to run in a worker thread.
+    RETURNS: 'success', 'failure' or 'unchanged'
+    """
+    # Get filename from endpoint
+    name = raw.get_filename_from_endpoint(api_endpoint)
+
+    # If no name returned, record failure
+    if not name.strip():
+        logging.warning(f"Unable to parse name from {api_endpoint}.")
+        return 'failure'
+
+    # Get the previous run's manifest, unless a full rebuild was asked for
+    manifest = raw.get_endpoint_manifest(s3_client, buckets['raw'], data_source, name) if use_manifest else {}
+
+    logging.info(f"Attempting API query for {name}...")
+    response = raw.get_wordpress_api_response(requests_session, api_endpoint, raw.get_api_timeout(manifest, api_call_timeout),
+                                              raw.get_conditional_headers(manifest))
+
+    if response.status_code == 304:
+        logging.info(f"{name} not modified since last run.  Skipping...")
+        return 'unchanged'
+
+    try:
+        records = response.json()
+
+    except ValueError as e:
+        logging.error(f"{name} API response is not valid JSON: {e}")
+        return 'failure'
+
+    if not records:
+        logging.warning(f"{name} API response contained no data.")
+        return 'failure'
+
+    # Raw - the JSON exactly as the raw function writes it, hashed the same way for change detection
+    api_json_string = json.dumps(records)
+    sha256 = hashlib.sha256(api_json_string.encode()).hexdigest()
+
+    if use_manifest and sha256 == manifest.get('sha256', ''):
+        logging.info(f"{name} API data unchanged.  Skipping...")
+        raw.put_endpoint_manifest(s3_client, buckets['raw'], data_source, name,
+                                  raw.build_endpoint_manifest(manifest, response, api_endpoint,
+                                                              f"{data_source}/{name}/{name}.json", sha256, False))
+        return 'unchanged'
+
+    if not put_raw_object(s3_client, buckets['raw'], data_source, name, api_endpoint, response, api_json_string, sha256,
+                          manifest):
+        logging.warning(f"{name} S3 Raw upload failed!")
+        return 'failure'
+
+    # Bronze - the records cast to the declared bronze schema
+    table = bronze.build_arrow_table(records, name)
+    del records, api_json_string
+
+    if table is None or table.num_rows == 0:
+        logging.warning(f"{name} Arrow table is empty!")
+        return 'failure'
+
+    if not put_bronze_object(s3_client, buckets['raw'], buckets['bronze'], data_source, name, table):
+        logging.warning(f"{name} S3 Bronze upload failed!")
+        return 'failure'
+
+    # Silver - the same transforms the silver job applies
+    if name not in silver.SILVER_TRANSFORMS:
+        logging.warning(f'{name} is not currently mapped.  Skipping silver transform...')
+        return 'failure'
+
+    partition_cols = silver.SILVER_TRANSFORMS[name]['partition_cols'] if name in partitioned_objects else None
+
+    if not put_silver_object(s3_client, bronze.get_thread_session(), buckets['silver'], data_source, name, table,
+                             partition_cols, engine):
+        logging.warning(f"{name} S3 Silver upload failed!")
+        return 'failure'
+
+    logging.info(f"{name} raw, bronze and silver uploads complete.")
+    return 'success'
+
+
+###############
+### CLIENTS ###
+###############
+
+# The layered modules' clients are created once per container and reused here
+client_ssm = raw.client_ssm
+client_s3 = raw.client_s3
+client_sns = raw.client_sns
+requests_session = raw.requests_session
+
+
+#############
+### START ###
+#############
+
+def lambda_handler(event, context):
+    """
+    Main handler for AWS Lambda service.
+    """
+
+    ###############
+    ### LOGGING ###
+    ###############
+
+    logging.basicConfig(
+        level = logging.INFO,
+        format = "%(asctime)s [%(levelname)s]: %(message)s",
+        datefmt = "%Y-%m-%d %H:%M:%S",
+        force = True
+        )
+
+
+    #################
+    ### VARIABLES ###
+    #################
+
+    # AWS Parameter Store Names
+    parametername_s3bucket_raw: str = '/s3/lakehouse/name/raw'
+    parametername_s3bucket_bronze: str = '/s3/lakehouse/name/bronze'
+    parametername_s3bucket_silver: str = '/s3/lakehouse/name/silver'
+    parametername_snstopic: str = '/sns/data/lakehouse/raw'
+    parametername_wordpressapi: str = '/wordpress/amazonwebshark/api/mysqlendpoints'
+
+    # Lambda name for messages
+    data_source: str = 'wordpress_api'
+    function_name: str = f'data_{data_source}_fused'
+
+    # Concurrency - endpoints processed at the same time.  Each holds its data in memory, so keep this low.
+    api_max_workers: int = max(1, int(event.get('api_max_workers', 2)))
+
+    # Partitioning - comma-separated objects written to silver as year/month Hive-partitioned datasets
+    partitioned_objects: list = [name.strip() for name in event.get('partitioned_objects', 'statistics_pages').split(',') if name.strip()]
+
+    # Transform engine - 'arrow' (Arrow compute kernels) or 'pandas' (transform_data and awswrangler)
+    fused_engine: str = event.get('fused_engine', 'arrow')
+
+    # Change detection - ignore endpoint manifests and rewrite every object
+    force_full_rebuild: bool = bool(event.get('force_full_rebuild', False))
+
+    # Heavy modules the engine needs, imported before the workers start as concurrent first imports can fail.
+    # Partitioned objects are registered in the Glue catalog through awswrangler by both engines.
+    engine_modules: list = ['pyarrow', 'pyarrow.compute', 'pyarrow.parquet']
+
+    if fused_engine == 'pandas':
+        engine_modules += ['pandas', 'awswrangler']
+
+    elif partitioned_objects:
+        engine_modules += ['awswrangler']
+
+    # Counters
+    api_call_timeout: int = 30
+    endpoint_count_all: int = 0
+    endpoint_count_failure: int = 0
+    endpoint_count_success: int = 0
+    endpoint_count_unchanged: int = 0
+
+
+    ##################
+    ### PARAMETERS ###
+    ##################
+
+    # Get every parameter from Parameter Store in one batch
+    logging.info("Getting Parameter Store parameters...")
+    parameters = raw.get_parameters_from_ssm(client_ssm, [parametername_snstopic, parametername_wordpressapi,
+                                                          parametername_s3bucket_raw, parametername_s3bucket_bronze,
+                                                          parametername_s3bucket_silver])
+
+    # Get SNS topic
+    sns_topic = parameters[parametername_snstopic]
+
+    # Check an SNS topic has been returned.
+    if not sns_topic:
+        message = "No SNS topic returned."
+        logging.warning(message)
+        raise ValueError(message)
+
+    # Get the WordPress endpoints and convert the string to a list
+    api_endpoints_list = parameters[parametername_wordpressapi].split(",")
+
+    # Get S3 bucket names
+    buckets = {
+        'raw': parameters[parametername_s3bucket_raw],
+        'bronze': parameters[parametername_s3bucket_bronze],
+        'silver': parameters[parametername_s3bucket_silver]
+        }
+
+    # Check the API list and S3 buckets have been returned.
+    if not any(api_endpoints_list) or not all(buckets.values()):
+        message = f"{function_name}: No API endpoints or S3 buckets returned."
+        subject = f"{function_name}: Failed"
+
+        logging.warning(message)
+        raw.send_sns_message(client_sns, sns_topic, subject, message)
+        return
+
+    endpoint_total = len(api_endpoints_list)
+    logging.info(f"{endpoint_total} API endpoints returned.")
+
+
+    #################
+    ### ENDPOINTS ###
+    #################
+
+    for module_name in engine_modules:
+        silver.import_heavy_module(module_name)
+
+    logging.info(f"Processing endpoints with {api_max_workers} workers...")
+
+    with ThreadPoolExecutor(max_workers = api_max_workers) as executor:
+
+        # Submit every endpoint, keeping a lookup for failure messages
+        futures = {
+            executor.submit(fuse_endpoint, requests_session, client_s3, buckets, data_source, api_endpoint, api_call_timeout,
+                            partitioned_objects, not force_full_rebuild, fused_engine): api_endpoint
+            for api_endpoint in api_endpoints_list
+            }
+
+        # Counters are only updated here in the handler thread as each endpoint completes
+        for future in as_completed(futures):
+
+            # Increment & log counter
+            endpoint_count_all += 1
+            logging.info(f"Finished endpoint {endpoint_count_all} of {endpoint_total}: {futures[future]}")
+
+            try:
+                outcome = future.result()
+
+            except Exception as e:
+                logging.error(f"Endpoint {futures[future]} raised an error: {e!r}")
+                outcome = 'failure'
+
+            # Iteration summaries
+            if outcome == 'unchanged':
+                endpoint_count_unchanged += 1
+
+            elif outcome == 'success':
+                endpoint_count_success += 1
+
+            else:
+                endpoint_count_failure += 1
+
+
+    ###############
+    ### SUMMARY ###
+    ###############
+
+    logging.info("WordPress API Fused process complete: " \
+                 f"{endpoint_count_success} Successful | {endpoint_count_failure} Failed | {endpoint_count_unchanged} Unchanged.")
+
+    # Emit this run's metrics as EMF records, from each layer's module
+    for module in (raw, bronze, silver):
+        module.METRICS.flush(function_name)
+
+    # Send SNS notification if any failures found
+    if endpoint_count_failure > 0:
+        message = f"{function_name} ran with {endpoint_count_failure} errors.  Please check logs."
+        subject = f"{function_name}: Ran With Failures"
+
+        logging.warning(message)
+        raw.send_sns_message(client_sns, sns_topic, subject, message)
+
+
+if __name__ == '__main__':
+    lambda_handler({}, None)
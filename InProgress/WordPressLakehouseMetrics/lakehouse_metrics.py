@@ -0,0 +1,103 @@
+"""
+Shared CloudWatch embedded metric format (EMF) recorder for the WordPress lakehouse raw, bronze, silver and gold jobs.
+Deployed alongside each job: in the Lambda zip or a Lambda layer for the raw, bronze and local gold functions, and with
+--extra-py-files for the Glue jobs.  Local runs import it from this folder.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# METRICS_SINK is 'stdout' for CloudWatch Logs, a file path that records are appended to as JSON lines for local runs,
+# or 'none' to keep them in memory only.
+METRICS_NAMESPACE: str = os.environ.get('METRICS_NAMESPACE', 'WordPressLakehouse')
+METRICS_SINK: str = os.environ.get('METRICS_SINK', 'stdout')
+
+# EMF unit of each metric name.  Anything not listed is a Count.
+METRIC_UNITS: dict = {'Duration': 'Milliseconds', 'BytesIn': 'Bytes', 'BytesOut': 'Bytes'}
+
+
+###############
+### CLASSES ###
+###############
+
+
+class MetricsRecorder:
+    """
+    Collects per-stage and per-object metrics such as durations, bytes, rows and retries, and emits them as
+    EMF records.  Values for the same stage and object are summed until flushed.
+    Thread-safe, so worker threads can record into the same instance.
+    Emitted records are also kept in the records list, so local runs and tests can inspect them.
+    """
+    def __init__(self, namespace: str = METRICS_NAMESPACE, sink: str = METRICS_SINK) -> None:
+        self.namespace: str = namespace
+        self.sink: str = sink
+        self.values: dict = {}
+        self.records: list = []
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, object_name: str = '', **values) -> None:
+        """
+        Adds metric values to a stage, or to one object within it.
+        """
+        with self._lock:
+            totals = self.values.setdefault((stage, object_name), {})
+
+            for name, value in values.items():
+                totals[name] = totals.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, stage: str, object_name: str = ''):
+        """
+        Adds the with block's run time to the stage's Duration in milliseconds, even if the block raises.
+        """
+        started = time.perf_counter()
+
+        try:
+            yield
+
+        finally:
+            self.add(stage, object_name, Duration = (time.perf_counter() - started) * 1000)
+
+    def flush(self, function_name: str) -> list:
+        """
+        Emits one EMF record per stage and object recorded since the last flush, then clears them.
+        RETURNS: List of the emitted records
+        """
+        with self._lock:
+            values, self.values = self.values, {}
+
+        timestamp = int(time.time() * 1000)
+        records = []
+
+        for (stage, object_name), metrics in sorted(values.items()):
+            dimensions = ['Function', 'Stage', 'Object'] if object_name else ['Function', 'Stage']
+            records.append({
+                '_aws': {
+                    'Timestamp': timestamp,
+                    'CloudWatchMetrics': [{
+                        'Namespace': self.namespace,
+                        'Dimensions': [dimensions],
+                        'Metrics': [{'Name': name, 'Unit': METRIC_UNITS.get(name, 'Count')} for name in metrics]
+                        }]
+                    },
+                'Function': function_name,
+                'Stage': stage,
+                **({'Object': object_name} if object_name else {}),
+                **{name: round(value, 3) for name, value in metrics.items()}
+                })
+
+        self.records.extend(records)
+
+        # Lambda turns EMF records on stdout into CloudWatch metrics with no API calls.  Elsewhere, such as in Glue,
+        # they are structured JSON log lines for metric filters and Logs Insights.
+        if self.sink == 'stdout':
+            for record in records:
+                print(json.dumps(record), flush = True)
+
+        elif self.sink != 'none':
+            with open(self.sink, 'a', encoding = 'utf-8') as file:
+                file.writelines(json.dumps(record) + '\n' for record in records)
+
+        return records
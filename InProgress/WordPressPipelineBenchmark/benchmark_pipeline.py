@@ -0,0 +1,298 @@
+"""
+Benchmarks the WordPress raw, bronze, silver and gold stages end to end against synthetic data, without touching AWS.
+The WordPress API is served by a local stub, and S3, SSM, SNS and the Glue Data Catalog by a local moto server.
+Each stage runs its real handler in its own process, so peak memory is measured separately.
+
+Usage: python benchmark_pipeline.py --posts 5000 --statistics-rows 1000000 --repeat 3
+"""
+import argparse
+import io
+import logging
+import multiprocessing
+import os
+import resource
+import shutil
+import socket
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# moto accepts any credentials, but boto3 needs some to sign requests
+for variable, value in (('AWS_ACCESS_KEY_ID', 'testing'), ('AWS_SECRET_ACCESS_KEY', 'testing'),
+                        ('AWS_SESSION_TOKEN', 'testing'), ('AWS_DEFAULT_REGION', 'eu-west-1')):
+    os.environ.setdefault(variable, value)
+
+BENCHMARK_DIR: str = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT: str = os.path.dirname(os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, BENCHMARK_DIR)
+
+# Folder and module of each stage's handler, in pipeline order
+PIPELINE_STAGES: dict = {
+    'raw': ('2024/2024-03-27-WordPressBronzeDataOrchestrationWithAWS', 'lambda_function_raw'),
+    'bronze': ('2024/2024-03-27-WordPressBronzeDataOrchestrationWithAWS', 'lambda_function_bronze'),
+    'silver': ('2024/2024-08-12-SilverLayerPythonETLWithTheAWSGlueETLJobScriptEditor', 'wordpress_api_etl_silver'),
+    'gold': ('2024/2024-11-15-GoldLayerPySparkETLWithAWSGlueStudio', 'WordPress_Gold_statisticspagespostsjoin_local')
+    }
+
+# Buckets and the Parameter Store values the handlers look up
+BENCHMARK_BUCKETS: dict = {'raw': 'benchmark-lakehouse-raw', 'bronze': 'benchmark-lakehouse-bronze',
+                           'silver': 'benchmark-lakehouse-silver'}
+BENCHMARK_PARAMETERS: dict = {
+    '/s3/lakehouse/name/raw': BENCHMARK_BUCKETS['raw'],
+    '/s3/lakehouse/name/bronze': BENCHMARK_BUCKETS['bronze'],
+    '/s3/lakehouse/name/silver': BENCHMARK_BUCKETS['silver']
+    }
+BENCHMARK_TOPICS: dict = {'/sns/data/lakehouse/raw': 'benchmark-raw', '/sns/data/lakehouse/bronze': 'benchmark-bronze',
+                          '/sns/data/lakehouse/silver': 'benchmark-silver'}
+DATA_SOURCE: str = 'wordpress_api'
+
+
+#################
+### FUNCTIONS ###
+#################
+
+
+def get_free_port() -> int:
+    """
+    Gets a free local TCP port for the moto server.
+    RETURNS: Port number
+    """
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def setup_aws(session, api_endpoints: list) -> None:
+    """
+    Creates the buckets, Parameter Store values, SNS topics and Glue database the handlers expect.
+    """
+    client_s3 = session.client('s3')
+
+    for bucket in BENCHMARK_BUCKETS.values():
+        client_s3.create_bucket(Bucket = bucket, CreateBucketConfiguration = {'LocationConstraint': session.region_name})
+
+    client_ssm = session.client('ssm')
+    client_sns = session.client('sns')
+    parameters = dict(BENCHMARK_PARAMETERS)
+    parameters['/wordpress/amazonwebshark/api/mysqlendpoints'] = ",".join(api_endpoints)
+
+    for name, topic in BENCHMARK_TOPICS.items():
+        parameters[name] = client_sns.create_topic(Name = topic)['TopicArn']
+
+    for name, value in parameters.items():
+        client_ssm.put_parameter(Name = name, Value = value, Type = 'String', Overwrite = True)
+
+    session.client('glue').create_database(DatabaseInput = {'Name': DATA_SOURCE})
+
+
+def get_s3_prefix_stats(client_s3, bucket: str, prefix: str) -> dict:
+    """
+    Totals the data objects under an S3 prefix.  Parquet row counts come from the file footers.
+    RETURNS: dict of bytes, rows and object count
+    """
+    import pyarrow.parquet as pq
+
+    stats = {'bytes': 0, 'rows': 0, 'objects': 0}
+
+    for page in client_s3.get_paginator('list_objects_v2').paginate(Bucket = bucket, Prefix = prefix):
+        for item in page.get('Contents', []):
+            stats['bytes'] += item['Size']
+            stats['objects'] += 1
+
+            if item['Key'].endswith('.parquet'):
+                body = client_s3.get_object(Bucket = bucket, Key = item['Key'])['Body'].read()
+                stats['rows'] += pq.read_metadata(io.BytesIO(body)).num_rows
+
+    return stats
+
+
+def download_s3_prefix(client_s3, bucket: str, prefix: str, directory: str) -> int:
+    """
+    Downloads every object under an S3 prefix into a local folder, keeping the key layout.
+    RETURNS: Bytes downloaded
+    """
+    total = 0
+
+    for page in client_s3.get_paginator('list_objects_v2').paginate(Bucket = bucket, Prefix = prefix):
+        for item in page.get('Contents', []):
+            path = os.path.join(directory, item['Key'])
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+            client_s3.download_file(bucket, item['Key'], path)
+            total += item['Size']
+
+    return total
+
+
+def get_directory_stats(directory: str) -> dict:
+    """
+    Totals the Parquet files in a local folder.
+    RETURNS: dict of bytes, rows and file count
+    """
+    import pyarrow.parquet as pq
+
+    stats = {'bytes': 0, 'rows': 0, 'objects': 0}
+
+    for folder, _, files in os.walk(directory):
+        for file in files:
+            if file.endswith('.parquet'):
+                path = os.path.join(folder, file)
+                stats['bytes'] += os.path.getsize(path)
+                stats['rows'] += pq.read_metadata(path).num_rows
+                stats['objects'] += 1
+
+    return stats
+
+
+def run_stage(stage: str, options: dict) -> dict:
+    """
+    Runs one stage's handler once in the current process, after importing it so imports are not timed.
+    RETURNS: dict of wall seconds, CPU seconds and peak RSS in MiB
+    """
+    folder, module_name = PIPELINE_STAGES[stage]
+    sys.path.insert(0, os.path.join(REPO_ROOT, folder))
+    module = __import__(module_name)
+
+    if not options['verbose']:
+        logging.disable(logging.INFO)
+
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+    if stage == 'raw':
+        module.lambda_handler({
+            'force_full_rebuild': True,
+            'api_max_workers': options['api_max_workers'],
+            'api_page_size': options['api_page_size'],
+            'api_stream_to_s3': options['api_stream_to_s3']
+            }, SimpleNamespace(memory_limit_in_mb = options['lambda_memory_mb']))
+
+    elif stage == 'bronze':
+        module.lambda_handler({
+            'force_full_rebuild': True,
+            'bronze_engine': options['bronze_engine'],
+            'bronze_max_workers': options['bronze_max_workers']
+            }, SimpleNamespace(memory_limit_in_mb = options['lambda_memory_mb']))
+
+    elif stage == 'silver':
+        sys.argv = [module_name, '--force_full_rebuild', 'true', '--full_refresh', 'true',
+                    '--silver_engine', options['silver_engine']]
+        module.wordpress_api_silver_handler()
+
+    else:
+        module.run_gold(options['silver_posts'], options['silver_statistics_pages'], options['gold_output'],
+                        full_refresh = True, gold_rollups_root = options['gold_rollups_root'])
+
+    return {
+        'wall': time.perf_counter() - wall_start,
+        'cpu': time.process_time() - cpu_start,
+        'rss_mib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        }
+
+
+#############
+### START ###
+#############
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    parser.add_argument('--posts', type = int, default = 5000)
+    parser.add_argument('--statistics-rows', type = int, default = 1000000)
+    parser.add_argument('--repeat', type = int, default = 3)
+    parser.add_argument('--api-latency-ms', type = int, default = 0, help = 'delay the stub adds to every response')
+    parser.add_argument('--api-max-workers', type = int, default = 4)
+    parser.add_argument('--api-page-size', type = int, default = 0)
+    parser.add_argument('--api-stream-to-s3', action = 'store_true')
+    parser.add_argument('--bronze-engine', default = 'arrow', choices = ['pandas', 'arrow'])
+    parser.add_argument('--bronze-max-workers', type = int, default = 4)
+    parser.add_argument('--silver-engine', default = 'arrow', choices = ['pandas', 'arrow'])
+    parser.add_argument('--skip-gold-rollups', action = 'store_true')
+    parser.add_argument('--lambda-memory-mb', type = int, default = 1024)
+    parser.add_argument('--verbose', action = 'store_true', help = 'show the handlers\' INFO logging')
+    args = parser.parse_args()
+
+    import boto3
+    from moto.server import ThreadedMotoServer
+
+    from generate_wordpress_data import generate_wordpress_data
+    from wordpress_api_stub import start_wordpress_api_stub
+
+    # Every boto3 client, including those in the stage processes, is pointed at the moto server
+    moto_port = get_free_port()
+    moto_server = ThreadedMotoServer(ip_address = '127.0.0.1', port = moto_port, verbose = False)
+    moto_server.start()
+    os.environ['AWS_ENDPOINT_URL'] = f'http://127.0.0.1:{moto_port}'
+
+    data = generate_wordpress_data(args.posts, args.statistics_rows)
+    stub = start_wordpress_api_stub(data, latency_ms = args.api_latency_ms)
+    session = boto3.Session()
+    client_s3 = session.client('s3')
+    setup_aws(session, stub.get_endpoints())
+
+    workdir = tempfile.TemporaryDirectory()
+    silver_dir = os.path.join(workdir.name, 'silver')
+    options = {
+        'verbose': args.verbose, 'lambda_memory_mb': args.lambda_memory_mb,
+        'api_max_workers': args.api_max_workers, 'api_page_size': args.api_page_size,
+        'api_stream_to_s3': args.api_stream_to_s3,
+        'bronze_engine': args.bronze_engine, 'bronze_max_workers': args.bronze_max_workers,
+        'silver_engine': args.silver_engine,
+        'silver_posts': os.path.join(silver_dir, DATA_SOURCE, 'posts'),
+        'silver_statistics_pages': os.path.join(silver_dir, DATA_SOURCE, 'statistics_pages'),
+        'gold_output': os.path.join(workdir.name, 'gold', DATA_SOURCE, 'statistics_postname'),
+        'gold_rollups_root': '' if args.skip_gold_rollups else os.path.join(workdir.name, 'gold', DATA_SOURCE)
+        }
+
+    context = multiprocessing.get_context('spawn')
+    runs = {stage: [] for stage in PIPELINE_STAGES}
+    sizes = {}
+
+    for _ in range(args.repeat):
+        previous_bytes = 0
+
+        for stage in PIPELINE_STAGES:
+            bytes_sent = stub.bytes_sent
+
+            # The gold job reads silver from the filesystem, so silver is copied out of moto before it is timed
+            if stage == 'gold':
+                shutil.rmtree(silver_dir, ignore_errors = True)
+                previous_bytes = sum(
+                    download_s3_prefix(client_s3, BENCHMARK_BUCKETS['silver'], f'{DATA_SOURCE}/{name}/', silver_dir)
+                    for name in ('posts', 'statistics_pages')
+                    )
+
+            # A fresh process per run keeps peak RSS readings independent
+            with context.Pool(1) as pool:
+                runs[stage].append(pool.apply(run_stage, (stage, options)))
+
+            # Input is what the stage read: API response bytes for raw, and the previous layer's objects after that
+            if stage == 'raw':
+                output = get_s3_prefix_stats(client_s3, BENCHMARK_BUCKETS['raw'], f'{DATA_SOURCE}/')
+                output['rows'] = sum(len(rows) for rows in data.values())
+                previous_bytes = stub.bytes_sent - bytes_sent
+
+            elif stage == 'gold':
+                output = get_directory_stats(os.path.join(workdir.name, 'gold'))
+
+            else:
+                output = get_s3_prefix_stats(client_s3, BENCHMARK_BUCKETS[stage], f'{DATA_SOURCE}/')
+
+            sizes[stage] = {'in': previous_bytes, 'out': output['bytes'], 'rows': output['rows']}
+            previous_bytes = output['bytes']
+
+    print(f"{args.posts} posts, {args.statistics_rows} statistics_pages rows, best of {args.repeat}")
+
+    for stage, stage_runs in runs.items():
+        best = min(stage_runs, key = lambda run: run['wall'])
+        size = sizes[stage]
+        in_mib, out_mib = size['in'] / (1024 * 1024), size['out'] / (1024 * 1024)
+        print(f"{stage:<7} rows {size['rows']:>10} | in {in_mib:8.1f} MiB | out {out_mib:8.1f} MiB | "
+              f"wall {best['wall']:7.2f} s | cpu {best['cpu']:7.2f} s | {size['rows'] / best['wall']:>11,.0f} rows/s | "
+              f"{in_mib / best['wall']:7.1f} MiB/s | peak RSS {best['rss_mib']:7.1f} MiB")
+
+    total = sum(min(run['wall'] for run in stage_runs) for stage_runs in runs.values())
+    print(f"pipeline wall {total:.2f} s")
+
+    stub.shutdown()
+    moto_server.stop()
+    workdir.cleanup()
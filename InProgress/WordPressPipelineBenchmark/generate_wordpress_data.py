@@ -0,0 +1,147 @@
+"""
+Generates synthetic WordPress API data for posts, statistics_pages, terms, term_taxonomy and term_relationship.
+Every value is a string like wpdb returns, so the output matches what the raw function gets from the real API.
+
+Usage: python generate_wordpress_data.py --posts 5000 --statistics-rows 1000000 --output-dir ./wordpress_api
+"""
+import argparse
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+# Objects in the order the WordPress API endpoints list them
+WORDPRESS_OBJECTS: list = ['posts', 'statistics_pages', 'terms', 'term_taxonomy', 'term_relationship']
+
+# Mix of post types, including types the gold Filter drops
+POST_TYPES: list = ['post', 'post', 'post', 'page', 'revision', 'attachment']
+
+
+#################
+### FUNCTIONS ###
+#################
+
+
+def generate_posts(posts: int, rng: random.Random, start: datetime) -> list:
+    """
+    Generates posts rows.
+    RETURNS: List of dicts
+    """
+    rows = []
+
+    for index in range(posts):
+        post_date = (start + timedelta(hours = index)).strftime('%Y-%m-%d %H:%M:%S')
+        post_modified = (start + timedelta(hours = index + rng.randint(1, 48))).strftime('%Y-%m-%d %H:%M:%S')
+
+        rows.append({
+            'ID': str(index + 1), 'post_author': '1', 'post_date': post_date, 'post_date_gmt': post_date,
+            'post_content': 'Lorem ipsum dolor sit amet. ' * rng.randint(20, 200),
+            'post_title': f'Post {index + 1}', 'post_excerpt': '', 'post_status': 'publish',
+            'comment_status': 'open', 'ping_status': 'open', 'post_password': '', 'post_name': f'post-{index + 1}',
+            'to_ping': '', 'pinged': '', 'post_modified': post_modified, 'post_modified_gmt': post_modified,
+            'post_content_filtered': '', 'post_parent': '0', 'guid': f'https://example.com/?p={index + 1}',
+            'menu_order': '0', 'post_type': rng.choice(POST_TYPES), 'post_mime_type': '',
+            'comment_count': str(rng.randint(0, 5))
+            })
+
+    return rows
+
+
+def generate_statistics_pages(statistics_rows: int, posts: int, rng: random.Random, start: datetime) -> list:
+    """
+    Generates statistics_pages rows, one per post per day with views, spread over as many days as the rows need.
+    RETURNS: List of dicts
+    """
+    posts_per_day = max(1, min(posts, 500))
+
+    return [
+        {
+            'page_id': str(index + 1),
+            'uri': f'/post-{index % posts_per_day + 1}/',
+            'type': 'post',
+            'date': (start + timedelta(days = index // posts_per_day)).strftime('%Y-%m-%d'),
+            'count': str(rng.randint(1, 200)),
+            'id': str(rng.randint(1, posts))
+        }
+        for index in range(statistics_rows)
+        ]
+
+
+def generate_terms(terms: int) -> list:
+    """
+    Generates terms rows.
+    RETURNS: List of dicts
+    """
+    return [
+        {'term_id': str(index + 1), 'name': f'Term {index + 1}', 'slug': f'term-{index + 1}', 'term_group': '0'}
+        for index in range(terms)
+        ]
+
+
+def generate_term_taxonomy(terms: int, rng: random.Random) -> list:
+    """
+    Generates term_taxonomy rows, one per term.
+    RETURNS: List of dicts
+    """
+    return [
+        {
+            'term_taxonomy_id': str(index + 1), 'term_id': str(index + 1),
+            'taxonomy': rng.choice(['category', 'post_tag']), 'description': '', 'parent': '0',
+            'count': str(rng.randint(0, 50))
+        }
+        for index in range(terms)
+        ]
+
+
+def generate_term_relationship(posts: int, terms: int, rng: random.Random) -> list:
+    """
+    Generates term_relationship rows, linking each post to up to three terms.
+    RETURNS: List of dicts
+    """
+    return [
+        {'object_id': str(post + 1), 'term_taxonomy_id': str(term), 'term_order': '0'}
+        for post in range(posts)
+        for term in sorted(rng.sample(range(1, terms + 1), min(terms, rng.randint(1, 3))))
+        ]
+
+
+def generate_wordpress_data(posts: int, statistics_rows: int, seed: int = 42) -> dict:
+    """
+    Generates every WordPress object at the given scale.  The same arguments always give the same data.
+    RETURNS: dict of object names and lists of row dicts
+    """
+    rng = random.Random(seed)
+    start = datetime(2022, 1, 1)
+    terms = max(10, posts // 10)
+
+    return {
+        'posts': generate_posts(posts, rng, start),
+        'statistics_pages': generate_statistics_pages(statistics_rows, posts, rng, start),
+        'terms': generate_terms(terms),
+        'term_taxonomy': generate_term_taxonomy(terms, rng),
+        'term_relationship': generate_term_relationship(posts, terms, rng)
+        }
+
+
+#############
+### START ###
+#############
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    parser.add_argument('--posts', type = int, default = 5000)
+    parser.add_argument('--statistics-rows', type = int, default = 1000000)
+    parser.add_argument('--seed', type = int, default = 42)
+    parser.add_argument('--output-dir', default = 'wordpress_api')
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok = True)
+
+    for name, rows in generate_wordpress_data(args.posts, args.statistics_rows, args.seed).items():
+        path = os.path.join(args.output_dir, f'{name}.json')
+
+        with open(path, 'w', encoding = 'utf-8') as file:
+            json.dump(rows, file)
+
+        print(f"{name:<17} rows {len(rows):>9} | {os.path.getsize(path) / (1024 * 1024):8.1f} MiB | {path}")
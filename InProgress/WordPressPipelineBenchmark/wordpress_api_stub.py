@@ -0,0 +1,142 @@
+"""
+Local HTTP stand-in for the WordPress API endpoints the raw function calls, serving synthetic data.
+Supports the page and per_page query parameters with X-WP-Total headers, and ETag / Last-Modified validators.
+
+Usage: python wordpress_api_stub.py --port 8080 --posts 5000 --statistics-rows 1000000
+"""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from generate_wordpress_data import generate_wordpress_data
+
+# Endpoint path for each object.  The raw function names objects from the text before the final underscore.
+WORDPRESS_API_PATH: str = '/wp-json/wordpress_api/v1/{name}_mysql/'
+
+
+###############
+### CLASSES ###
+###############
+
+
+class WordPressApiStub(ThreadingHTTPServer):
+    """
+    Threaded HTTP server holding each object's rows and its encoded JSON body.
+    Full bodies are encoded once up front, so serving them costs no more than a socket write.
+    """
+    daemon_threads = True
+
+    def __init__(self, address: tuple, data: dict, latency_ms: int = 0) -> None:
+        super().__init__(address, WordPressApiHandler)
+        self.rows = data
+        self.bodies = {name: json.dumps(rows).encode() for name, rows in data.items()}
+        self.etags = {name: f'"{hashlib.sha256(body).hexdigest()}"' for name, body in self.bodies.items()}
+        self.last_modified = formatdate(usegmt = True)
+        self.latency_ms = latency_ms
+        self.requests = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+
+    def get_endpoints(self) -> list:
+        """
+        Gets the URL of every endpoint, in the comma-separated form Parameter Store holds them.
+        RETURNS: List of endpoint URLs
+        """
+        host, port = self.server_address[:2]
+        return [f"http://{host}:{port}{WORDPRESS_API_PATH.format(name = name)}" for name in self.bodies]
+
+
+class WordPressApiHandler(BaseHTTPRequestHandler):
+    """
+    Serves GET requests for WordPress API endpoints.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        name = url.path.rstrip('/').rsplit('/', 1)[-1].rsplit('_', 1)[0]
+
+        if name not in self.server.bodies:
+            self.send_error(404, f"No endpoint for {url.path}")
+            return
+
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+
+        query = parse_qs(url.query)
+        headers = {'Content-Type': 'application/json; charset=UTF-8', 'Last-Modified': self.server.last_modified}
+
+        if 'page' in query:
+            rows = self.server.rows[name]
+            page = max(1, int(query['page'][0]))
+            per_page = max(1, int(query.get('per_page', ['10'])[0]))
+            headers['X-WP-Total'] = str(len(rows))
+            headers['X-WP-TotalPages'] = str(-(-len(rows) // per_page))
+            body = json.dumps(rows[(page - 1) * per_page:page * per_page]).encode()
+
+        else:
+            if self.headers.get('If-None-Match') == self.server.etags[name]:
+                self.send_response(304)
+                self.send_header('ETag', self.server.etags[name])
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            headers['ETag'] = self.server.etags[name]
+            body = self.server.bodies[name]
+
+        self.send_response(200)
+
+        for header, value in headers.items():
+            self.send_header(header, value)
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.bytes_sent += len(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # Per-request logging would dominate the timings
+        pass
+
+
+#################
+### FUNCTIONS ###
+#################
+
+
+def start_wordpress_api_stub(data: dict, host: str = '127.0.0.1', port: int = 0, latency_ms: int = 0) -> WordPressApiStub:
+    """
+    Starts the stub on a background thread.  Port 0 picks a free port.
+    RETURNS: Running WordPressApiStub, stopped with its shutdown method
+    """
+    server = WordPressApiStub((host, port), data, latency_ms)
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+    return server
+
+
+#############
+### START ###
+#############
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    parser.add_argument('--host', default = '127.0.0.1')
+    parser.add_argument('--port', type = int, default = 8080)
+    parser.add_argument('--posts', type = int, default = 5000)
+    parser.add_argument('--statistics-rows', type = int, default = 1000000)
+    parser.add_argument('--latency-ms', type = int, default = 0, help = 'delay added to every response')
+    args = parser.parse_args()
+
+    stub = WordPressApiStub((args.host, args.port), generate_wordpress_data(args.posts, args.statistics_rows), args.latency_ms)
+    print(",".join(stub.get_endpoints()))
+    stub.serve_forever()
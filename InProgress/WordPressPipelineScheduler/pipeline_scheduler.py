@@ -0,0 +1,341 @@
+"""
+Scheduler that runs the WordPress raw, bronze and silver stages per object instead of per layer.
+Each object's bronze conversion is queued as soon as its raw write completes, and its silver transform as soon as
+its bronze conversion does, so a slow endpoint no longer holds every other object back at each layer.
+Each stage runs the layered functions' own per-object code, so their objects, manifests and change detection are unchanged.
+
+Usage: python pipeline_scheduler.py --raw-workers 4 --bronze-workers 2 --silver-workers 2
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# The layered functions' modules.  A Lambda deployment package holds them alongside this file, and local runs
+# import them from their dated folders in this repo.
+REPO_ROOT: str = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LAYER_FOLDERS: list = [
+    '2024/2024-03-27-WordPressBronzeDataOrchestrationWithAWS',
+    '2024/2024-08-12-SilverLayerPythonETLWithTheAWSGlueETLJobScriptEditor'
+    ]
+
+for folder in LAYER_FOLDERS:
+    if os.path.isdir(os.path.join(REPO_ROOT, folder)):
+        sys.path.append(os.path.join(REPO_ROOT, folder))
+
+import lambda_function_raw as raw
+import lambda_function_bronze as bronze
+import wordpress_api_etl_silver as silver
+
+# Stages in the order each object passes through them
+PIPELINE_STAGES: list = ['raw', 'bronze', 'silver']
+
+# Engines the bronze and silver stages accept
+PIPELINE_ENGINES: tuple = ('pandas', 'arrow')
+
+# Heavy modules each silver engine uses.  Both register partitioned datasets in the Glue catalog through awswrangler.
+SILVER_ENGINE_MODULES: dict = {
+    'pandas': ['pandas', 'awswrangler'],
+    'arrow': ['pyarrow', 'pyarrow.compute', 'pyarrow.parquet', 'awswrangler']
+    }
+
+
+#################
+### FUNCTIONS ###
+#################
+
+
+def run_raw(s3_client, buckets: dict, data_source: str, api_endpoint: str, options: dict) -> str:
+    """
+    Extracts one WordPress API endpoint to S3 Raw with the raw function's extract_endpoint.
+    RETURNS: 'success' or 'failure'
+    """
+    ok = raw.extract_endpoint(raw.requests_session, s3_client, buckets['raw'], data_source, api_endpoint,
+                              options['api_call_timeout'],
+                              stream_to_s3 = options['api_stream_to_s3'],
+                              use_manifest = not options['force_full_rebuild'],
+                              page_size = options['api_page_size'],
+                              page_workers = options['api_page_workers'],
+                              page_retries = options['api_page_retries'])
+    return 'success' if ok else 'failure'
+
+
+def run_bronze(s3_client, buckets: dict, data_source: str, name: str, memory_budget, options: dict) -> str:
+    """
+    Converts one object's raw JSON, including any paginated part objects, to S3 Bronze with the bronze function's
+    convert_object.  Only the object's own raw folder is listed, like the bronze function's event-driven mode.
+    RETURNS: 'success', 'failure' or 'unchanged'
+    """
+    s3_objects_raw = bronze.list_s3_objects(s3_client, buckets['raw'], f'{data_source}/{name}/', 'json')
+
+    if not s3_objects_raw:
+        logging.warning(f"No raw objects found for {name}.")
+        return 'failure'
+
+    paths = sorted(s3_objects_raw)
+
+    return bronze.convert_object(s3_client, name, paths, bronze.get_source_version(s3_objects_raw, paths), buckets['bronze'],
+                                 data_source, options['force_full_rebuild'], memory_budget,
+                                 sum(s3_objects_raw[path]['size'] for path in paths) * bronze.BRONZE_MEMORY_FACTOR,
+                                 options['bronze_engine'])
+
+
+def run_silver(s3_client, buckets: dict, data_source: str, name: str, options: dict) -> str:
+    """
+    Converts one object's bronze Parquet to S3 Silver with the silver job's convert_silver_object.
+    Each worker thread uses its own boto3 session for awswrangler.
+    RETURNS: 'success', 'failure' or 'unchanged'
+    """
+    return silver.convert_silver_object(s3_client, bronze.get_thread_session(),
+                                        f's3://{buckets["bronze"]}/{data_source}/{name}/{name}.parquet',
+                                        buckets['bronze'], buckets['silver'], data_source, options['partitioned_objects'],
+                                        options['silver_engine'], options['force_full_rebuild'], options['full_refresh'])
+
+
+def import_engine_modules(bronze_engine: str, silver_engine: str) -> None:
+    """
+    Imports both stages' heavy modules up front, as the bronze and silver pools would otherwise race to import them first.
+    """
+    bronze.import_engine_modules(bronze_engine)
+
+    for name in SILVER_ENGINE_MODULES[silver_engine]:
+        silver.import_heavy_module(name)
+
+
+def run_pipeline(s3_client, buckets: dict, data_source: str, api_endpoints: list, options: dict) -> dict:
+    """
+    Runs every endpoint through the raw, bronze and silver stages, each stage with its own worker pool.
+    A finished stage queues the object's next stage straight away, and a failed stage stops that object only.
+    All scheduling happens in the calling thread, so the outcome records need no locks.
+    RETURNS: dict of object names, each a dict of stage outcomes and (start, finish) seconds from the pipeline start
+    """
+    started = time.perf_counter()
+    memory_budget = bronze.MemoryBudget(int(options['lambda_memory_mb'] * 1024 * 1024 * options['bronze_memory_fraction']))
+    executors = {stage: ThreadPoolExecutor(max_workers = options[f'{stage}_workers'], thread_name_prefix = stage)
+                 for stage in PIPELINE_STAGES}
+    objects = {}
+    pending = {}
+
+    def submit(stage: str, name: str, function, *args) -> None:
+        objects[name][stage] = {'start': time.perf_counter() - started}
+        pending[executors[stage].submit(function, *args)] = (stage, name)
+
+    try:
+        for api_endpoint in api_endpoints:
+            name = raw.get_filename_from_endpoint(api_endpoint) or api_endpoint
+            objects[name] = {}
+            submit('raw', name, run_raw, s3_client, buckets, data_source, api_endpoint, options)
+
+        while pending:
+            done, _ = wait(pending, return_when = FIRST_COMPLETED)
+
+            for future in done:
+                stage, name = pending.pop(future)
+
+                try:
+                    outcome = future.result()
+
+                except Exception as e:
+                    logging.error(f"{name} {stage} raised an error: {e!r}")
+                    outcome = 'failure'
+
+                objects[name][stage].update({'finish': time.perf_counter() - started, 'outcome': outcome})
+                logging.info(f"{name} {stage} finished: {outcome}.")
+
+                # Unchanged objects still move on, as the next stage has its own change detection
+                if outcome == 'failure':
+                    continue
+
+                if stage == 'raw':
+                    submit('bronze', name, run_bronze, s3_client, buckets, data_source, name, memory_budget, options)
+
+                elif stage == 'bronze':
+                    submit('silver', name, run_silver, s3_client, buckets, data_source, name, options)
+
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait = True)
+
+    return objects
+
+
+def log_pipeline_timeline(objects: dict) -> None:
+    """
+    Logs when each object's stages started and finished, so the overlap between layers can be seen.
+    """
+    for name, stages in sorted(objects.items()):
+        timeline = " | ".join(
+            f"{stage} {stages[stage]['start']:.1f}-{stages[stage].get('finish', 0):.1f} s {stages[stage].get('outcome', '')}"
+            for stage in PIPELINE_STAGES if stage in stages
+            )
+        logging.info(f"{name}: {timeline}")
+
+
+###############
+### CLIENTS ###
+###############
+
+# The layered modules' clients are created once per container and reused here
+client_ssm = raw.client_ssm
+client_s3 = raw.client_s3
+client_sns = raw.client_sns
+
+
+#############
+### START ###
+#############
+
+def lambda_handler(event, context):
+    """
+    Main handler for AWS Lambda service.
+    """
+
+    ###############
+    ### LOGGING ###
+    ###############
+
+    logging.basicConfig(
+        level = logging.INFO,
+        format = "%(asctime)s [%(levelname)s]: %(message)s",
+        datefmt = "%Y-%m-%d %H:%M:%S",
+        force = True
+        )
+
+
+    #################
+    ### VARIABLES ###
+    #################
+
+    # AWS Parameter Store Names
+    parametername_s3bucket_raw: str = '/s3/lakehouse/name/raw'
+    parametername_s3bucket_bronze: str = '/s3/lakehouse/name/bronze'
+    parametername_s3bucket_silver: str = '/s3/lakehouse/name/silver'
+    parametername_snstopic: str = '/sns/data/lakehouse/raw'
+    parametername_wordpressapi: str = '/wordpress/amazonwebshark/api/mysqlendpoints'
+
+    # Lambda name for messages
+    data_source: str = 'wordpress_api'
+    function_name: str = f'data_{data_source}_pipeline'
+
+    # Stage options, named and defaulted like the layered functions' own event keys and job arguments
+    options: dict = {
+        'raw_workers': max(1, int(event.get('raw_workers', 4))),
+        'bronze_workers': max(1, int(event.get('bronze_workers', 2))),
+        'silver_workers': max(1, int(event.get('silver_workers', 2))),
+        'api_call_timeout': 30,
+        'api_stream_to_s3': bool(event.get('api_stream_to_s3', False)),
+        'api_page_size': max(0, int(event.get('api_page_size', 0))),
+        'api_page_workers': max(1, int(event.get('api_page_workers', 4))),
+        'api_page_retries': max(0, int(event.get('api_page_retries', 2))),
+        'bronze_engine': event.get('bronze_engine', 'pandas'),
+        'bronze_memory_fraction': float(event.get('bronze_memory_fraction', 0.6)),
+        'silver_engine': event.get('silver_engine', 'pandas'),
+        'partitioned_objects': [name.strip() for name in event.get('partitioned_objects', 'statistics_pages').split(',') if name.strip()],
+        'force_full_rebuild': bool(event.get('force_full_rebuild', False)),
+        'full_refresh': bool(event.get('full_refresh', False)),
+        'lambda_memory_mb': int(getattr(context, 'memory_limit_in_mb', None) or 1024)
+        }
+
+    # Check the engines are ones the stages support, rather than letting them fall back to pandas
+    for engine_option in ('bronze_engine', 'silver_engine'):
+        if options[engine_option] not in PIPELINE_ENGINES:
+            message = f"{function_name}: {engine_option} must be one of {PIPELINE_ENGINES}, not {options[engine_option]!r}."
+            logging.warning(message)
+            raise ValueError(message)
+
+
+    ##################
+    ### PARAMETERS ###
+    ##################
+
+    # Get every parameter from Parameter Store in one batch
+    logging.info("Getting Parameter Store parameters...")
+    parameters = raw.get_parameters_from_ssm(client_ssm, [parametername_snstopic, parametername_wordpressapi,
+                                                          parametername_s3bucket_raw, parametername_s3bucket_bronze,
+                                                          parametername_s3bucket_silver])
+
+    # Get SNS topic
+    sns_topic = parameters[parametername_snstopic]
+
+    # Check an SNS topic has been returned.
+    if not sns_topic:
+        message = "No SNS topic returned."
+        logging.warning(message)
+        raise ValueError(message)
+
+    # Get the WordPress endpoints and convert the string to a list
+    api_endpoints_list = parameters[parametername_wordpressapi].split(",")
+
+    # Get S3 bucket names
+    buckets = {
+        'raw': parameters[parametername_s3bucket_raw],
+        'bronze': parameters[parametername_s3bucket_bronze],
+        'silver': parameters[parametername_s3bucket_silver]
+        }
+
+    # Check the API list and S3 buckets have been returned.
+    if not any(api_endpoints_list) or not all(buckets.values()):
+        message = f"{function_name}: No API endpoints or S3 buckets returned."
+        subject = f"{function_name}: Failed"
+
+        logging.warning(message)
+        raw.send_sns_message(client_sns, sns_topic, subject, message)
+        return
+
+
+    ###############
+    ### OBJECTS ###
+    ###############
+
+    logging.info(f"Pipelining {len(api_endpoints_list)} objects with {options['raw_workers']} raw, "
+                 f"{options['bronze_workers']} bronze and {options['silver_workers']} silver workers...")
+    import_engine_modules(options['bronze_engine'], options['silver_engine'])
+    objects = run_pipeline(client_s3, buckets, data_source, api_endpoints_list, options)
+    log_pipeline_timeline(objects)
+
+
+    ###############
+    ### SUMMARY ###
+    ###############
+
+    # An object fails if any stage it reached failed
+    object_count_failure = sum(
+        any(stage.get('outcome', 'failure') == 'failure' for stage in stages.values()) for stages in objects.values()
+        )
+    logging.info("WordPress API Pipeline process complete: " \
+                 f"{len(objects) - object_count_failure} Successful | {object_count_failure} Failed.")
+
+    # Emit this run's metrics as EMF records, from each layer's module
+    for module in (raw, bronze, silver):
+        module.METRICS.flush(function_name)
+
+    # Send SNS notification if any failures found
+    if object_count_failure > 0:
+        message = f"{function_name} ran with {object_count_failure} errors.  Please check logs."
+        subject = f"{function_name}: Ran With Failures"
+
+        logging.warning(message)
+        raw.send_sns_message(client_sns, sns_topic, subject, message)
+
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description = __doc__.split('\n')[1])
+    parser.add_argument('--raw-workers', type = int, default = 4)
+    parser.add_argument('--bronze-workers', type = int, default = 2)
+    parser.add_argument('--silver-workers', type = int, default = 2)
+    parser.add_argument('--bronze-engine', default = 'pandas', choices = ['pandas', 'arrow'])
+    parser.add_argument('--silver-engine', default = 'pandas', choices = ['pandas', 'arrow'])
+    parser.add_argument('--force-full-rebuild', action = 'store_true')
+    args = parser.parse_args()
+
+    lambda_handler({
+        'raw_workers': args.raw_workers,
+        'bronze_workers': args.bronze_workers,
+        'silver_workers': args.silver_workers,
+        'bronze_engine': args.bronze_engine,
+        'silver_engine': args.silver_engine,
+        'force_full_rebuild': args.force_full_rebuild
+        }, None)